@@ -0,0 +1,87 @@
+"""
+benchmarks > bench_colours.py
+
+Measures how quickly RGB colours (such as channel colours) are matched to the closest colour that
+the controller can show, and checks that the quantised lookup table gives the same result as an
+exact search.
+This runs outside of FL Studio, using the API stubs listed in requirements.txt, so it only times
+the script's own code.
+
+Run from the root of the repository:
+    python benchmarks/bench_colours.py
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Import in the same order as the device scripts to avoid circular import issues
+import config
+import internal
+import lightingconsts
+
+# Number of colours queried
+NUM_QUERIES = 20000
+
+# Number of different colours in the repeated query set (eg channel colours)
+NUM_REPEATED = 16
+
+
+def benchQueries(container, queries):
+    """Times nearest colour queries
+
+    Args:
+        container (ColourContainer): colours to search
+        queries (list of int): RGB colours to look up
+
+    Returns:
+        float: queries per second
+    """
+    start = time.perf_counter()
+    for rgb in queries:
+        container.getClosestInt(rgb)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def checkAccuracy(perceptual, queries):
+    """Checks that the quantised lookup table gives the same colour as an exact search
+
+    Args:
+        perceptual (bool): whether to use perceptual distance
+        queries (list of int): RGB colours to look up
+    """
+    exact = lightingconsts.ColourContainer(perceptual, use_table=False)
+    table = lightingconsts.ColourContainer(perceptual)
+    for rgb in queries:
+        assert exact.getClosestName(rgb) == table.getClosestName(rgb), \
+            "Lookup table gave the wrong colour for " + hex(rgb)
+
+
+def main():
+    random.seed(0)
+    unique = [random.randrange(1 << 24) for _ in range(NUM_QUERIES)]
+    repeated = [random.randrange(1 << 24) for _ in range(NUM_REPEATED)] * (NUM_QUERIES // NUM_REPEATED)
+
+    print("Nearest colour queries per second:")
+    for perceptual in [False, True]:
+        print(" Perceptual distance:" if perceptual else " RGB distance:")
+        tests = [
+            ("Exact search", lightingconsts.ColourContainer(perceptual, use_table=False), unique),
+            ("Lookup table (cold)", lightingconsts.ColourContainer(perceptual), unique),
+        ]
+        warm = lightingconsts.ColourContainer(perceptual)
+        benchQueries(warm, unique)
+        tests.append(("Lookup table (warm)", warm, unique))
+        tests.append(("Cached (" + str(NUM_REPEATED) + " colours)", lightingconsts.ColourContainer(perceptual), repeated))
+        for name, container, queries in tests:
+            print("  " + name.ljust(28) + str(round(benchQueries(container, queries))))
+        checkAccuracy(perceptual, unique)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+benchmarks > bench_events.py
+
+Measures how quickly incoming MIDI messages are parsed into ParsedEvent objects.
+This runs outside of FL Studio, using the API stubs listed in requirements.txt, so it only times
+the script's own code.
+
+Run from the root of the repository:
+    python benchmarks/bench_events.py
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import io
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Import in the same order as the device scripts to avoid circular import issues
+import config
+import internal
+import internal.flags
+import eventconsts
+import processorhelpers
+import eventprocessor
+
+# Number of times the event stream is parsed
+REPEATS = 200
+
+
+class FakeEvent:
+    """Stands in for FL Studio's MIDI event object
+    """
+    def __init__(self, status, data1, data2, sysex=None, pmeFlags=0):
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.sysex = sysex
+        self.pmeFlags = pmeFlags
+        self.handled = False
+
+
+def getEventStream():
+    """Returns a list of events resembling a busy performance: fader and knob sweeps,
+    pad hits, transport buttons and notes.
+
+    Returns:
+        list of FakeEvent: events to parse
+    """
+    stream = []
+    for value in range(128):
+        stream.append(FakeEvent(0xBF, 0x29 + value % 8, value))  # Faders
+        stream.append(FakeEvent(0xBF, 0x15 + value % 8, value))  # Knobs
+        stream.append(FakeEvent(0xB0, 0x29 + value % 8, value))  # Basic faders
+    for x in range(9):
+        for y in range(2):
+            stream.append(FakeEvent(0x9F, eventconsts.Pads[x][y], 127))
+            stream.append(FakeEvent(0x8F, eventconsts.Pads[x][y], 0))
+            stream.append(FakeEvent(0x99, eventconsts.BasicPads[x][y], 127))
+            stream.append(FakeEvent(0x89, eventconsts.BasicPads[x][y], 0))
+    for transport in eventconsts.TransportControls:
+        stream.append(FakeEvent(transport & 0xFF, transport >> 8, 127))
+        stream.append(FakeEvent(transport & 0xFF, transport >> 8, 0))
+    for note in range(36, 84):
+        stream.append(FakeEvent(0x90, note, 100))
+        stream.append(FakeEvent(0x80, note, 0))
+    return stream
+
+
+def benchParse(stream):
+    """Times construction of ParsedEvent objects
+
+    Args:
+        stream (list of FakeEvent): events to parse
+
+    Returns:
+        float: events parsed per second
+    """
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for event in stream:
+            processorhelpers.ParsedEvent(event)
+    return len(stream) * REPEATS / (time.perf_counter() - start)
+
+
+def benchConstruction():
+    """Microbenchmarks for constructing single events of different types
+
+    Returns:
+        list of tuple: (description, microseconds per operation)
+    """
+    fader = FakeEvent(0xBF, 0x29, 64, pmeFlags=internal.flags.PME.System | internal.flags.PME.System_Safe)
+    pad = FakeEvent(0x9F, 0x60, 127)
+    note = FakeEvent(0x90, 60, 100)
+    parsed = processorhelpers.ParsedEvent(fader)
+
+    tests = [
+        ("ParsedEvent(fader)", lambda: processorhelpers.ParsedEvent(fader)),
+        ("ParsedEvent(pad)", lambda: processorhelpers.ParsedEvent(pad)),
+        ("ParsedEvent(note)", lambda: processorhelpers.ParsedEvent(note)),
+        ("ParsedEvent.reset(fader)", lambda: parsed.reset(fader)),
+        ("pme_system_safe", lambda: parsed.pme_system_safe),
+    ]
+    number = 20000
+    return [(name, min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6) for name, func in tests]
+
+
+def benchPool(stream):
+    """Times parsing events using the event pool, as the device scripts do
+
+    Args:
+        stream (list of FakeEvent): events to parse
+
+    Returns:
+        float: events parsed per second
+    """
+    pool = processorhelpers.ParsedEventPool(internal.consts.EVENT_POOL_SIZE)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for event in stream:
+            pool.release(pool.acquire(event))
+    return len(stream) * REPEATS / (time.perf_counter() - start)
+
+
+def benchBatch(stream, extended):
+    """Times processing events through the full event pipeline using processBatch
+
+    Args:
+        stream (list of FakeEvent): events to process
+        extended (bool): whether to use the extended or basic pipeline
+
+    Returns:
+        float: events processed per second
+    """
+    events = [(e.status, e.data1, e.data2, e.sysex, e.pmeFlags) for e in stream] * (REPEATS // 10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = eventprocessor.processBatch(events, extended)
+    return summary.getEventsPerSecond()
+
+
+def benchEdit(stream):
+    """Times re-parsing events with ParsedEvent.edit, as remapping processors do
+
+    Args:
+        stream (list of FakeEvent): events to parse
+
+    Returns:
+        float: events edited per second
+    """
+    parsed = [processorhelpers.ParsedEvent(event) for event in stream]
+    raw = [processorhelpers.RawEvent(event.status, event.data1, event.data2) for event in stream]
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for command, event in zip(parsed, raw):
+            command.edit(event, "Benchmark")
+            command.actions.eventProcessors.clear()
+    return len(stream) * REPEATS / (time.perf_counter() - start)
+
+
+def processActions(command):
+    """Records actions on an event the way that a typical trip through the event processors does
+
+    Args:
+        command (ParsedEvent): event to record actions on
+    """
+    for name in ["Shift Menu Processor", "Primary Processor", "Note Processor", "Plugin Processor"]:
+        command.addProcessor(name)
+    command.act("Forward to basic script processor")
+    command.addProcessor("Mixer Processor")
+    command.handle("Set Insert 1 volume to 100%")
+    command.printOutput()
+
+
+def benchAllocations(stream, debug_modes):
+    """Measures the peak memory allocated while parsing an event and recording its actions
+
+    Args:
+        stream (list of FakeEvent): events to parse
+        debug_modes (list): value for config.CONSOLE_DEBUG_MODE
+
+    Returns:
+        float: mean peak bytes allocated per event
+    """
+    config.CONSOLE_DEBUG_MODE = debug_modes
+    pool = processorhelpers.ParsedEventPool(internal.consts.EVENT_POOL_SIZE)
+
+    # Warm up pool
+    for event in stream:
+        pool.release(pool.acquire(event))
+
+    total = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        for event in stream:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            command = pool.acquire(event)
+            processActions(command)
+            pool.release(command)
+            total += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+    config.CONSOLE_DEBUG_MODE = []
+
+    return total / len(stream)
+
+
+if __name__ == "__main__":
+    stream = getEventStream()
+    print("Parse:  " + str(round(benchParse(stream))) + " events/s")
+    print("Pooled: " + str(round(benchPool(stream))) + " events/s")
+    print("Edit:   " + str(round(benchEdit(stream))) + " events/s")
+    print("Batch (extended): " + str(round(benchBatch(stream, True))) + " events/s")
+    print("Batch (basic):    " + str(round(benchBatch(stream, False))) + " events/s")
+    for name, micros in benchConstruction():
+        print(internal.getTab(name, 2) + str(round(micros, 3)) + " us")
+    print("Bytes allocated per event (tracing off): " + str(round(benchAllocations(stream, []))))
+    print("Bytes allocated per event (tracing on):  " 
+          + str(round(benchAllocations(stream, [internal.consts.DEBUG.EVENT_ACTIONS]))))
@@ -0,0 +1,136 @@
+"""
+benchmarks > bench_script.py
+
+Measures how quickly the extended device script handles MIDI messages and idle calls when it is
+run against the simulated FL Studio API (see flsim), with different windows focused and with
+different amounts of time added to each API call, so that the cost of calling into FL Studio is
+included.
+
+Run from the root of the repository:
+    python benchmarks/bench_script.py
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import flsim
+
+sim = flsim.Simulator()
+sim.install()
+
+import midi
+import eventconsts
+import device_LaunchKey_extension as script
+import internal
+
+# Number of times the event stream is processed for each test
+REPEATS = 5
+
+# Number of events between idle calls
+EVENTS_PER_IDLE = 8
+
+# Time added to each API call (seconds)
+LATENCIES = [0.0, 5e-6, 20e-6]
+
+# Focused windows: (description, window, focused plugin (channel, slot))
+WINDOWS = [
+    ("Channel rack", midi.widChannelRack, None),
+    ("Mixer", midi.widMixer, None),
+    ("Playlist", midi.widPlaylist, None),
+    ("FPC", midi.widChannelRack, (4, -1)),
+]
+
+
+class FakeEvent:
+    """Stands in for FL Studio's MIDI event object
+    """
+    def __init__(self, status, data1, data2, pmeFlags=midi.PME_System | midi.PME_System_Safe):
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.sysex = None
+        self.pmeFlags = pmeFlags
+        self.handled = False
+
+
+def getEventStream():
+    """Returns a list of events resembling a busy performance: fader and knob sweeps, pad hits
+    and notes.
+
+    Returns:
+        list of tuple: (status, data1, data2) of each event
+    """
+    stream = []
+    for value in range(0, 128, 4):
+        stream.append((0xBF, 0x29 + value % 8, value))  # Faders
+        stream.append((0xBF, 0x15 + value % 8, value))  # Knobs
+    for x in range(8):
+        for y in range(2):
+            stream.append((0x9F, eventconsts.Pads[x][y], 127))
+            stream.append((0x8F, eventconsts.Pads[x][y], 0))
+    for note in range(48, 72):
+        stream.append((0x90, note, 100))
+        stream.append((0x80, note, 0))
+    return stream
+
+
+def focus(window, plugin):
+    """Focus a window in the simulated project
+
+    Args:
+        window (int): window index
+        plugin (tuple): focused plugin (channel, slot), or None
+    """
+    sim.project.focused_window = window
+    sim.project.focused_plugin = plugin
+
+
+def benchScript(stream):
+    """Times processing the event stream through the script, calling OnIdle regularly
+
+    Args:
+        stream (list of tuple): events to process
+
+    Returns:
+        tuple:
+            float: events processed per second
+            float: API calls per event
+            float: messages sent to the controller per event
+    """
+    sim.resetCounters()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPEATS):
+            for index, (status, data1, data2) in enumerate(stream):
+                script.OnMidiIn(FakeEvent(status, data1, data2))
+                if index % EVENTS_PER_IDLE == 0:
+                    script.OnIdle()
+    taken = time.perf_counter() - start
+    num_events = len(stream) * REPEATS
+    num_calls = sim.getCallCount() - sim.getCallCount(["device.midiOutMsg", "device.midiOutSysex", "device.dispatch"])
+    return (num_events / taken, num_calls / num_events,
+            len(sim.getTraffic(flsim.TRAFFIC_MIDI_OUT)) / num_events)
+
+
+if __name__ == "__main__":
+    with contextlib.redirect_stdout(io.StringIO()):
+        script.OnInit()
+        script.OnIdle()
+    stream = getEventStream()
+    for latency in LATENCIES:
+        sim.setLatency(latency)
+        print("API latency: " + str(round(latency * 1e6, 1)) + " us")
+        for name, window, plugin in WINDOWS:
+            focus(window, plugin)
+            rate, calls, sent = benchScript(stream)
+            print("  " + internal.getTab(name, 2) + str(round(rate)) + " events/s, "
+                  + str(round(calls, 1)) + " API calls/event, " + str(round(sent, 1)) + " messages sent/event")
+    with contextlib.redirect_stdout(io.StringIO()):
+        script.OnDeInit()
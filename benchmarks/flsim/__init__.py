@@ -0,0 +1,19 @@
+"""
+benchmarks > flsim
+
+In-process simulator of FL Studio's MIDI scripting API, so that the scripts can be imported and
+run without FL Studio (eg for benchmarks and replays). The API stubs listed in requirements.txt
+are used for anything that isn't simulated.
+
+Usage:
+    sim = flsim.Simulator(port=225)
+    sim.install()
+    import device_LaunchKey_extension
+    device_LaunchKey_extension.OnInit()
+    sim.getTraffic(flsim.TRAFFIC_MIDI_OUT)
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+from .fixtures import Fixtures, Channel, MixerTrack, Plugin, Pattern, getDefaultFixtures, NO_WINDOW
+from .simulator import Simulator, TRAFFIC_MIDI_OUT, TRAFFIC_SYSEX_OUT, TRAFFIC_DISPATCH, SIMULATED_MODULES, COPIED_MODULES
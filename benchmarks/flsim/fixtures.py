@@ -0,0 +1,187 @@
+"""
+benchmarks > flsim > fixtures.py
+
+Contains the objects that describe the state of the simulated FL Studio project: channels, mixer
+tracks, plugins, patterns and which window is focused.
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import midi
+
+# Value of FL Studio's API when nothing is focused
+NO_WINDOW = -1
+
+
+class Plugin:
+    """A plugin, either a generator (on a channel) or an effect (on a mixer track)
+    """
+    def __init__(self, name, params=None):
+        """Create a plugin
+
+        Args:
+            name (str): plugin name
+            params (list of str or tuple, optional): parameter names, or tuples of
+                (name, value) (values 0-1). Defaults to None (no parameters).
+        """
+        self.name = name
+        self.param_names = []
+        self.param_values = []
+        for param in params or []:
+            if isinstance(param, tuple):
+                self.param_names.append(param[0])
+                self.param_values.append(param[1])
+            else:
+                self.param_names.append(param)
+                self.param_values.append(0.0)
+
+
+class Channel:
+    """A channel in the channel rack
+    """
+    def __init__(self, name, colour=0x5F6B73, plugin=None, volume=0.78125, pan=0.0, target_track=0):
+        """Create a channel
+
+        Args:
+            name (str): channel name
+            colour (int, optional): RGB colour. Defaults to FL Studio's default channel colour.
+            plugin (Plugin, optional): generator plugin. Defaults to None (a sampler).
+            volume (float, optional): volume (0-1). Defaults to 0.78125.
+            pan (float, optional): pan (-1 to 1). Defaults to 0.0.
+            target_track (int, optional): mixer track that the channel is routed to. Defaults to 0.
+        """
+        self.name = name
+        self.colour = colour
+        self.plugin = plugin
+        self.volume = volume
+        self.pan = pan
+        self.pitch = 0.0
+        self.muted = False
+        self.solo = False
+        self.selected = False
+        self.target_track = target_track
+        # Step sequencer position -> whether the step is on
+        self.grid = dict()
+
+
+class MixerTrack:
+    """A track in the mixer
+    """
+    def __init__(self, name, colour=0x000000, volume=0.8, pan=0.0, effects=None):
+        """Create a mixer track
+
+        Args:
+            name (str): track name
+            colour (int, optional): RGB colour. Defaults to 0x000000.
+            volume (float, optional): volume (0-1). Defaults to 0.8.
+            pan (float, optional): pan (-1 to 1). Defaults to 0.0.
+            effects (list of Plugin, optional): plugins in each effect slot. Defaults to None.
+        """
+        self.name = name
+        self.colour = colour
+        self.volume = volume
+        self.pan = pan
+        self.muted = False
+        self.solo = False
+        self.armed = False
+        self.effects = effects or []
+
+
+class Pattern:
+    """A pattern
+    """
+    def __init__(self, name, colour=0x485156):
+        """Create a pattern
+
+        Args:
+            name (str): pattern name
+            colour (int, optional): RGB colour. Defaults to 0x485156.
+        """
+        self.name = name
+        self.colour = colour
+
+
+class Fixtures:
+    """State of the simulated FL Studio project
+    """
+    def __init__(self, channels=None, tracks=None, patterns=None):
+        """Create a project
+
+        Args:
+            channels (list of Channel, optional): channels. Defaults to None (no channels).
+            tracks (list of MixerTrack, optional): mixer tracks, starting with the master track.
+                Defaults to None (just the master track).
+            patterns (list of Pattern, optional): patterns. Defaults to None (one pattern).
+        """
+        self.channels = channels or []
+        self.tracks = tracks or [MixerTrack("Master")]
+        self.patterns = patterns or [Pattern("Pattern 1")]
+
+        self.selected_channel = 0
+        self.selected_track = 0
+        self.selected_pattern = 1
+        if len(self.channels):
+            self.channels[0].selected = True
+
+        # FL Studio window (eg midi.widMixer), or NO_WINDOW
+        self.focused_window = midi.widChannelRack
+        # Plugin window that is focused: (channel index, effect slot (-1 for generators)), or None
+        self.focused_plugin = None
+        # Other focused forms (eg "Script output")
+        self.focused_form = ""
+
+        self.fl_version = "20.9.2"
+        self.api_version = 19
+        self.snap_mode = 3
+
+        self.playing = False
+        self.recording = False
+        # 0 for pattern mode, 1 for song mode
+        self.loop_mode = 0
+        self.metronome = False
+        self.song_pos = 0.0
+
+        self.undo_count = 1
+        self.undo_pos = 1
+
+    def getPlugin(self, index, slot=-1):
+        """Returns a plugin
+
+        Args:
+            index (int): channel index (generators) or mixer track index (effects)
+            slot (int, optional): effect slot, or -1 for generators. Defaults to -1.
+
+        Returns:
+            Plugin: plugin, or None if there isn't one
+        """
+        if slot == -1:
+            if 0 <= index < len(self.channels):
+                return self.channels[index].plugin
+            return None
+        if 0 <= index < len(self.tracks) and 0 <= slot < len(self.tracks[index].effects):
+            return self.tracks[index].effects[slot]
+        return None
+
+
+def getDefaultFixtures():
+    """Returns a small project with a few channels (including some with plugins that the script has
+    processors for), mixer tracks and patterns
+
+    Returns:
+        Fixtures: project
+    """
+    channels = [
+        Channel("Kick", 0xC83232),
+        Channel("Clap", 0xE6A028),
+        Channel("Hat", 0x46A046),
+        Channel("Snare", 0x3C64C8),
+        Channel("FPC", 0x5F6B73, Plugin("FPC", ["Pad " + str(i + 1) for i in range(16)]), target_track=1),
+        Channel("FLEX", 0x8C50B4, Plugin("FLEX", [("Macro " + str(i + 1), 0.5) for i in range(8)]), target_track=2),
+        Channel("Vital", 0x50B4B4, Plugin("Vital", [("Macro " + str(i + 1), 0.0) for i in range(4)]
+                                            + [("Filter " + str(i + 1) + " Cutoff", 0.5) for i in range(2)]), target_track=3),
+        Channel("Slicex", 0xB4B450, Plugin("Slicex", ["Master level", "Pitch"]), target_track=4),
+    ]
+    tracks = [MixerTrack("Master")] + [MixerTrack("Insert " + str(i)) for i in range(1, 17)]
+    tracks[1].effects = [Plugin("Fruity Parametric EQ 2", ["Band " + str(i + 1) + " level" for i in range(7)])]
+    patterns = [Pattern("Pattern " + str(i + 1)) for i in range(4)]
+    return Fixtures(channels, tracks, patterns)
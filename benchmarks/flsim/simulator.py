@@ -0,0 +1,601 @@
+"""
+benchmarks > flsim > simulator.py
+
+Contains the simulator object, which creates stand-ins for FL Studio's API modules that work on a
+simulated project (see fixtures.py).
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import sys
+import time
+import types
+import importlib
+
+from .fixtures import Fixtures, getDefaultFixtures, NO_WINDOW
+
+# FL Studio API modules that are simulated
+SIMULATED_MODULES = ["device", "ui", "channels", "mixer", "plugins", "transport", "general",
+                     "patterns", "playlist", "arrangement"]
+
+# FL Studio API modules that are copied from the API stubs without changes (constants and helpers)
+COPIED_MODULES = ["midi", "utils", "launchMapPages"]
+
+# Kinds of traffic recorded
+TRAFFIC_MIDI_OUT = "midiOutMsg"
+TRAFFIC_SYSEX_OUT = "midiOutSysex"
+TRAFFIC_DISPATCH = "dispatch"
+
+
+def loadStub(name):
+    """Returns the API stub module for an FL Studio module (from requirements.txt)
+
+    Args:
+        name (str): module name
+
+    Returns:
+        module: stub module
+    """
+    module = sys.modules.get(name)
+    if module is not None and hasattr(module, "__stub__"):
+        return module.__stub__
+    return importlib.import_module(name)
+
+
+class ApiModule:
+    """Base class for the implementations of simulated modules. Public methods are added to the
+    module as functions with the same names. Functions that aren't implemented come from the API
+    stubs, and return default values.
+    """
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.project = simulator.project
+
+
+class DeviceModule(ApiModule):
+
+    def getPortNumber(self):
+        return self.simulator.port
+
+    def getName(self):
+        return self.simulator.device_name
+
+    def midiOutMsg(self, message, *args):
+        self.simulator.record(TRAFFIC_MIDI_OUT, message)
+
+    def midiOutSysex(self, data):
+        self.simulator.record(TRAFFIC_SYSEX_OUT, bytes(data))
+
+    def dispatch(self, index, message, sysex=None):
+        self.simulator.record(TRAFFIC_DISPATCH, message)
+        if self.simulator.dispatch_handler is not None:
+            self.simulator.dispatch_handler(message)
+
+    def dispatchReceiverCount(self):
+        return 1
+
+    def isAssigned(self):
+        return True
+
+
+class UiModule(ApiModule):
+
+    def getVersion(self, mode=0):
+        return self.project.fl_version
+
+    def getFocused(self, index):
+        return self.project.focused_plugin is None and self.project.focused_window == index
+
+    def getFocusedFormCaption(self):
+        if self.project.focused_form != "":
+            return self.project.focused_form
+        return self.getFocusedPluginName()
+
+    def getFocusedPluginName(self):
+        if self.project.focused_plugin is None:
+            return ""
+        plugin = self.project.getPlugin(*self.project.focused_plugin)
+        return "" if plugin is None else plugin.name
+
+    def showWindow(self, index):
+        self.project.focused_window = index
+        self.project.focused_plugin = None
+        self.project.focused_form = ""
+
+    def hideWindow(self, index):
+        if self.project.focused_window == index:
+            self.project.focused_window = NO_WINDOW
+
+    def isInPopupMenu(self):
+        return False
+
+    def getSnapMode(self):
+        return self.project.snap_mode
+
+    def snapMode(self, value):
+        self.project.snap_mode += value
+
+    def setHintMsg(self, message):
+        self.simulator.hint_msg = message
+
+    def getHintMsg(self):
+        return self.simulator.hint_msg
+
+
+class ChannelsModule(ApiModule):
+
+    def getChannel(self, index):
+        return self.project.channels[index]
+
+    def channelCount(self, *args):
+        return len(self.project.channels)
+
+    def channelNumber(self, *args):
+        return self.project.selected_channel
+
+    def selectedChannel(self, canBeNone=0, offset=0, indexGlobal=0):
+        if not len(self.project.channels):
+            return -1
+        return self.project.selected_channel
+
+    def selectOneChannel(self, index):
+        for channel in self.project.channels:
+            channel.selected = False
+        self.project.channels[index].selected = True
+        self.project.selected_channel = index
+
+    def selectChannel(self, index, value=-1):
+        channel = self.project.channels[index]
+        channel.selected = not channel.selected if value == -1 else bool(value)
+
+    def isChannelSelected(self, index):
+        return self.project.channels[index].selected
+
+    def getChannelName(self, index):
+        return self.project.channels[index].name
+
+    def setChannelName(self, index, name):
+        self.project.channels[index].name = name
+
+    def getChannelColor(self, index):
+        return self.project.channels[index].colour
+
+    def setChannelColor(self, index, colour):
+        self.project.channels[index].colour = colour
+
+    def getChannelVolume(self, index, mode=0):
+        return self.project.channels[index].volume
+
+    def setChannelVolume(self, index, volume, pickupMode=0):
+        self.project.channels[index].volume = volume
+
+    def getChannelPan(self, index):
+        return self.project.channels[index].pan
+
+    def setChannelPan(self, index, pan, pickupMode=0):
+        self.project.channels[index].pan = pan
+
+    def getChannelPitch(self, index, mode=0):
+        return self.project.channels[index].pitch
+
+    def setChannelPitch(self, index, value, mode=0, pickupMode=0):
+        self.project.channels[index].pitch = value
+
+    def isChannelMuted(self, index):
+        return self.project.channels[index].muted
+
+    def muteChannel(self, index):
+        channel = self.project.channels[index]
+        channel.muted = not channel.muted
+
+    def isChannelSolo(self, index):
+        return self.project.channels[index].solo
+
+    def soloChannel(self, index):
+        channel = self.project.channels[index]
+        channel.solo = not channel.solo
+
+    def getTargetFxTrack(self, index):
+        return self.project.channels[index].target_track
+
+    def getGridBit(self, index, position):
+        return int(self.project.channels[index].grid.get(position, False))
+
+    def setGridBit(self, index, position, value):
+        self.project.channels[index].grid[position] = bool(value)
+
+    def midiNoteOn(self, index, note, velocity, *args):
+        self.simulator.notes.append((index, note, velocity))
+
+
+class MixerModule(ApiModule):
+
+    def trackCount(self):
+        return len(self.project.tracks)
+
+    def trackNumber(self):
+        return self.project.selected_track
+
+    def setTrackNumber(self, index, flags=0):
+        self.project.selected_track = index
+
+    def getTrackName(self, index, *args):
+        return self.project.tracks[index].name
+
+    def setTrackName(self, index, name):
+        self.project.tracks[index].name = name
+
+    def getTrackColor(self, index):
+        return self.project.tracks[index].colour
+
+    def setTrackColor(self, index, colour):
+        self.project.tracks[index].colour = colour
+
+    def getTrackVolume(self, index, mode=0):
+        return self.project.tracks[index].volume
+
+    def setTrackVolume(self, index, volume, pickupMode=0):
+        self.project.tracks[index].volume = volume
+
+    def getTrackPan(self, index):
+        return self.project.tracks[index].pan
+
+    def setTrackPan(self, index, pan, pickupMode=0):
+        self.project.tracks[index].pan = pan
+
+    def isTrackMuted(self, index):
+        return self.project.tracks[index].muted
+
+    def muteTrack(self, index, value=-1):
+        track = self.project.tracks[index]
+        track.muted = not track.muted if value == -1 else bool(value)
+
+    def isTrackSolo(self, index):
+        return self.project.tracks[index].solo
+
+    def soloTrack(self, index, value=-1, mode=-1):
+        track = self.project.tracks[index]
+        track.solo = not track.solo if value == -1 else bool(value)
+
+    def isTrackArmed(self, index):
+        return self.project.tracks[index].armed
+
+    def armTrack(self, index):
+        track = self.project.tracks[index]
+        track.armed = not track.armed
+
+    def getTrackPeaks(self, index, mode):
+        return 0.0
+
+
+class PluginsModule(ApiModule):
+
+    def getPlugin(self, index, slot):
+        plugin = self.project.getPlugin(index, slot)
+        if plugin is None:
+            raise TypeError("Operation unsafe at current time")
+        return plugin
+
+    def isValid(self, index, slot=-1):
+        return self.project.getPlugin(index, slot) is not None
+
+    def getPluginName(self, index, slot=-1, userName=0):
+        return self.getPlugin(index, slot).name
+
+    def getParamCount(self, index, slot=-1):
+        return len(self.getPlugin(index, slot).param_names)
+
+    def getParamName(self, param, index, slot=-1):
+        return self.getPlugin(index, slot).param_names[param]
+
+    def getParamValue(self, param, index, slot=-1):
+        return self.getPlugin(index, slot).param_values[param]
+
+    def setParamValue(self, value, param, index, slot=-1):
+        self.getPlugin(index, slot).param_values[param] = value
+
+    def getParamValueString(self, param, index, slot=-1):
+        return str(round(self.getParamValue(param, index, slot) * 100)) + "%"
+
+
+class TransportModule(ApiModule):
+
+    def isPlaying(self):
+        return self.project.playing
+
+    def start(self):
+        self.project.playing = not self.project.playing
+
+    def stop(self):
+        self.project.playing = False
+        self.project.song_pos = 0.0
+
+    def isRecording(self):
+        return self.project.recording
+
+    def record(self):
+        self.project.recording = not self.project.recording
+
+    def getLoopMode(self):
+        return self.project.loop_mode
+
+    def setLoopMode(self):
+        self.project.loop_mode = 1 - self.project.loop_mode
+
+    def getSongPos(self, mode=-1):
+        return self.project.song_pos
+
+    def setSongPos(self, position, mode=-1):
+        self.project.song_pos = position
+
+    def globalTransport(self, command, value, pmeflags=-1, flags=-1):
+        self.simulator.transport_commands.append((command, value))
+        return 1
+
+
+class GeneralModule(ApiModule):
+
+    def getVersion(self):
+        return self.project.api_version
+
+    def getUseMetronome(self):
+        return self.project.metronome
+
+    def getUndoHistoryCount(self):
+        return self.project.undo_count
+
+    def getUndoHistoryLast(self):
+        return self.project.undo_pos
+
+    def undoUp(self):
+        self.project.undo_pos = max(0, self.project.undo_pos - 1)
+
+    def undoDown(self):
+        self.project.undo_pos = min(self.project.undo_count, self.project.undo_pos + 1)
+
+    def saveUndo(self, undoName, flags, update=True):
+        self.project.undo_count += 1
+        self.project.undo_pos = self.project.undo_count
+
+
+class PatternsModule(ApiModule):
+
+    def patternCount(self):
+        return len(self.project.patterns)
+
+    def patternNumber(self):
+        return self.project.selected_pattern
+
+    def jumpToPattern(self, index):
+        self.project.selected_pattern = index
+
+    def getPatternName(self, index):
+        return self.project.patterns[index - 1].name
+
+    def getPatternColor(self, index):
+        return self.project.patterns[index - 1].colour
+
+    def setPatternColor(self, index, colour):
+        self.project.patterns[index - 1].colour = colour
+
+
+class PlaylistModule(ApiModule):
+    pass
+
+
+class ArrangementModule(ApiModule):
+
+    def getMarkerName(self, index):
+        return ""
+
+
+# Implementation of each simulated module
+IMPLEMENTATIONS = {
+    "device": DeviceModule,
+    "ui": UiModule,
+    "channels": ChannelsModule,
+    "mixer": MixerModule,
+    "plugins": PluginsModule,
+    "transport": TransportModule,
+    "general": GeneralModule,
+    "patterns": PatternsModule,
+    "playlist": PlaylistModule,
+    "arrangement": ArrangementModule,
+}
+
+
+class Simulator:
+    """
+    Simulator
+
+    Creates stand-ins for FL Studio's API modules, which read and change a simulated project
+    (see fixtures.Fixtures). Every API call is counted, and can be made to take extra time so that
+    the cost of calling FL Studio can be included when measuring the script.
+
+    MIDI messages sent to the controller and dispatched to other scripts are recorded in
+    self.traffic as (time, kind, message) tuples.
+    """
+    def __init__(self, port=0, fixtures=None, clock=time.perf_counter):
+        """Create a simulator
+
+        Args:
+            port (int, optional): MIDI port number reported to the script. Defaults to 0.
+            fixtures (Fixtures, optional): simulated project. Defaults to getDefaultFixtures().
+            clock (function, optional): returns the time that traffic is recorded at. Defaults to
+                time.perf_counter.
+        """
+        self.port = port
+        self.project = getDefaultFixtures() if fixtures is None else fixtures
+        self.clock = clock
+        self.device_name = "LaunchKey"
+
+        # Called with the message when the script dispatches to another script
+        self.dispatch_handler = None
+
+        # Function name ("module.function") -> extra time taken by each call
+        self.latency = dict()
+
+        self.traffic = []
+        self.calls = dict()
+        self.notes = []
+        self.transport_commands = []
+        self.hint_msg = ""
+
+        self.modules = dict()
+        for name in SIMULATED_MODULES:
+            self.modules[name] = self.createModule(name, IMPLEMENTATIONS[name](self))
+        for name in COPIED_MODULES:
+            self.modules[name] = self.copyModule(name)
+
+        self.previous_modules = None
+
+    def createModule(self, name, implementation):
+        """Create a simulated module
+
+        Args:
+            name (str): module name
+            implementation (ApiModule): functions that are simulated
+
+        Returns:
+            module: simulated module
+        """
+        stub = loadStub(name)
+        module = types.ModuleType(name)
+        module.__stub__ = stub
+        module.__simulator__ = self
+        for attribute in dir(stub):
+            if attribute.startswith("_"):
+                continue
+            value = getattr(stub, attribute)
+            if isinstance(value, types.FunctionType):
+                value = self.wrap(name + "." + attribute, value)
+            setattr(module, attribute, value)
+        for attribute in dir(implementation):
+            if attribute.startswith("_") or not hasattr(stub, attribute):
+                continue
+            setattr(module, attribute, self.wrap(name + "." + attribute, getattr(implementation, attribute)))
+        return module
+
+    def copyModule(self, name):
+        """Create a copy of an API stub module
+
+        Args:
+            name (str): module name
+
+        Returns:
+            module: copy of module
+        """
+        stub = loadStub(name)
+        module = types.ModuleType(name)
+        module.__dict__.update({key: value for key, value in stub.__dict__.items() if not key.startswith("__")})
+        module.__stub__ = stub
+        module.__simulator__ = self
+        return module
+
+    def wrap(self, name, function):
+        """Wrap an API function so that calls to it are counted and delayed
+
+        Args:
+            name (str): function name ("module.function")
+            function (function): function to wrap
+
+        Returns:
+            function: wrapped function
+        """
+        calls = self.calls
+        latency = self.latency
+        clock = time.perf_counter
+        calls[name] = 0
+
+        def call(*args, **kwargs):
+            calls[name] += 1
+            delay = latency.get(name)
+            if delay:
+                # Sleeping isn't accurate enough for short delays
+                end = clock() + delay
+                while clock() < end:
+                    pass
+            return function(*args, **kwargs)
+
+        call.__name__ = function.__name__
+        call.__doc__ = function.__doc__
+        return call
+
+    def setLatency(self, seconds, functions=None):
+        """Set the extra time taken by API calls
+
+        Args:
+            seconds (float): time taken by each call
+            functions (list of str, optional): functions ("mixer.setTrackVolume") or modules
+                ("mixer") to set the latency of. Defaults to None (all simulated functions).
+        """
+        for name in self.calls:
+            if functions is None or name in functions or name.split(".")[0] in functions:
+                if seconds:
+                    self.latency[name] = seconds
+                else:
+                    self.latency.pop(name, None)
+
+    def record(self, kind, message):
+        """Record MIDI traffic
+
+        Args:
+            kind (str): kind of traffic (eg TRAFFIC_MIDI_OUT)
+            message (int or bytes): message
+        """
+        self.traffic.append((self.clock(), kind, message))
+
+    def getTraffic(self, kind=None):
+        """Returns recorded MIDI traffic
+
+        Args:
+            kind (str, optional): kind of traffic to return. Defaults to None (all traffic).
+
+        Returns:
+            list of tuple: (time, kind, message)
+        """
+        if kind is None:
+            return list(self.traffic)
+        return [record for record in self.traffic if record[1] == kind]
+
+    def getCallCount(self, functions=None):
+        """Returns the number of API calls made
+
+        Args:
+            functions (list of str, optional): functions or modules to count. Defaults to None
+                (all functions).
+
+        Returns:
+            int: number of calls
+        """
+        return sum(count for name, count in self.calls.items()
+                   if functions is None or name in functions or name.split(".")[0] in functions)
+
+    def resetCounters(self):
+        """Clear recorded traffic and call counts
+        """
+        del self.traffic[:]
+        del self.notes[:]
+        del self.transport_commands[:]
+        for name in self.calls:
+            self.calls[name] = 0
+
+    def install(self):
+        """Replace FL Studio's API modules in sys.modules with the simulated modules, so that they
+        are used by scripts imported afterwards
+        """
+        if self.previous_modules is None:
+            self.previous_modules = {name: sys.modules.get(name) for name in self.modules}
+        sys.modules.update(self.modules)
+
+    def uninstall(self):
+        """Restore the modules that were replaced by install()
+        """
+        if self.previous_modules is None:
+            return
+        for name, module in self.previous_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self.previous_modules = None
@@ -0,0 +1,601 @@
+"""
+benchmarks > replay.py
+
+Replays MIDI journals recorded by the script (see internal/journal.py) through both device
+scripts, so that crashes and performance problems can be reproduced away from FL Studio.
+
+Each script is loaded separately (as it would be in FL Studio), with its own simulated FL Studio
+API (see flsim), so that:
+ - Messages sent to the controller are recorded
+ - Messages dispatched to the other script are delivered to its OnMidiIn
+ - The scripts see their own port numbers and sensible FL Studio state
+
+Messages recorded as received from the controller are passed to the OnMidiIn function of the
+script that received them. OnIdle is called for both scripts at regular intervals of recording
+time, and OnUpdateBeatIndicator can be called at a given tempo. Events are replayed either as fast
+as possible (the default), where the scripts see a virtual clock that follows the recording so
+that the results are the same every time, or in real time.
+
+Afterwards, messages sent to the controller are compared with the ones in the journals, and the
+throughput and performance snapshot of each script are printed.
+
+Run from the root of the repository:
+    python benchmarks/replay.py midi_journal_220.bin midi_journal_225.bin
+Use --help for options.
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import os
+import sys
+import time
+import math
+import types
+import bisect
+import difflib
+import argparse
+import importlib
+
+from flsim import Simulator, Fixtures, Channel, NO_WINDOW, TRAFFIC_MIDI_OUT, TRAFFIC_SYSEX_OUT
+
+REPO_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, REPO_DIR)
+
+# FL Studio API modules (from the stubs), which are imported again for each script
+FL_MODULES = ["midi", "utils", "device", "ui", "general", "channels", "mixer", "plugins", "transport",
+              "patterns", "playlist", "arrangement", "launchMapPages"]
+
+# Modules that only use the clock to measure performance, which see the real clock when replaying
+# as fast as possible
+TIMING_MODULES = ["internal.performance", "eventprocessor"]
+
+# Device scripts
+SCRIPT_BASIC = "device_LaunchKey"
+SCRIPT_EXTENDED = "device_LaunchKey_extension"
+
+# Kinds of journal record (same as internal/journal.py)
+JOURNAL_IN = 0
+JOURNAL_OUT = 1
+JOURNAL_OUT_BUFFER = 2
+JOURNAL_INTERNAL = 3
+
+# Kinds of record compared with the recording
+COMPARED_KINDS = [JOURNAL_OUT, JOURNAL_OUT_BUFFER, JOURNAL_INTERNAL]
+
+# Channel used by messages between the scripts (same as internal.consts.INTERNAL_CHANNEL_STATUS)
+INTERNAL_CHANNEL = 0xE
+
+# Time between idle calls (seconds of recording time)
+DEFAULT_IDLE_INTERVAL = 0.02
+
+# Maximum number of differences printed
+MAX_DIFFS_SHOWN = 10
+
+
+class VirtualClock:
+    """Clock shown to the scripts when replaying as fast as possible. Time only moves forward when
+    the replay reaches the next event, so timing-dependent behaviour (eg rate limits) is the same
+    every time.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.module = types.ModuleType("time")
+        self.module.__dict__.update(time.__dict__)
+        self.module.perf_counter = self.get
+        self.module.monotonic = self.get
+        self.module.time = self.get
+        self.module.sleep = self.sleep
+
+    def get(self):
+        """Returns the current time
+
+        Returns:
+            float: time (seconds)
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """Move the clock forward
+
+        Args:
+            seconds (float): time to move forward by
+        """
+        self.now += seconds
+
+
+class ReplayEvent:
+    """Stands in for FL Studio's MIDI event object
+    """
+    def __init__(self, status, data1, data2, pmeFlags):
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.sysex = None
+        self.pmeFlags = pmeFlags
+        self.handled = False
+
+
+class ScriptInstance:
+    """One of the device scripts, loaded with its own copies of its modules and of the FL Studio
+    API
+    """
+    def __init__(self, replay, name, port, clock):
+        """Load a device script
+
+        Args:
+            replay (Replay): replay that the script belongs to
+            name (str): module name of the device script
+            port (int): MIDI port number
+            clock (VirtualClock): clock shown to the script, or None to use the real clock
+        """
+        self.replay = replay
+        self.name = name
+        self.num_events = 0
+        self.callback_time = 0.0
+
+        self.simulator = Simulator(port, getReplayFixtures(), clock=lambda: self.replay.time)
+        self.simulator.dispatch_handler = lambda message: self.replay.dispatch(self, message)
+
+        purgeModules()
+        real_time = sys.modules["time"]
+        if clock is not None:
+            sys.modules["time"] = clock.module
+        self.simulator.install()
+        try:
+            self.script = importlib.import_module(name)
+            self.modules = {key: module for key, module in sys.modules.items() if isScriptModule(module)}
+        finally:
+            sys.modules["time"] = real_time
+            self.simulator.uninstall()
+
+        # Performance is measured with the real clock
+        for module in TIMING_MODULES:
+            self.modules[module].time = real_time
+
+        self.config = self.modules["config"]
+        midi = self.simulator.modules["midi"]
+        self.pme_flags = midi.PME_System | midi.PME_System_Safe
+
+    @property
+    def port(self):
+        return self.simulator.port
+
+    @port.setter
+    def port(self, port):
+        self.simulator.port = port
+
+    @property
+    def outbound(self):
+        """(time, kind, status, data1, data2) of messages sent by the script
+        """
+        outbound = []
+        for timestamp, kind, message in self.simulator.getTraffic():
+            if kind == TRAFFIC_SYSEX_OUT:
+                kind = JOURNAL_OUT_BUFFER
+                message = 0xF0 + ((len(message) & 0xFF) << 8) + (((len(message) >> 8) & 0xFF) << 16)
+            else:
+                kind = JOURNAL_OUT if kind == TRAFFIC_MIDI_OUT else JOURNAL_INTERNAL
+            outbound.append((timestamp, kind, message & 0xFF, (message >> 8) & 0xFF, (message >> 16) & 0xFF))
+        return outbound
+
+    def call(self, function, *args):
+        """Call one of the script's callbacks, and time it
+
+        Args:
+            function (str): name of callback (eg "OnIdle")
+            *args: arguments
+        """
+        start = time.perf_counter()
+        getattr(self.script, function)(*args)
+        self.callback_time += time.perf_counter() - start
+
+    def midiIn(self, status, data1, data2):
+        """Pass a MIDI message to the script
+
+        Args:
+            status (int): status byte
+            data1 (int): data 1
+            data2 (int): data 2
+        """
+        self.num_events += 1
+        self.call("OnMidiIn", ReplayEvent(status, data1, data2, self.pme_flags))
+
+    def resetPerformance(self):
+        """Clear performance statistics (eg after initialisation)
+        """
+        self.modules["internal.performance"].resetAll()
+        self.callback_time = 0.0
+
+    def getError(self):
+        """Returns whether the script is in an error state
+
+        Returns:
+            bool: whether the script crashed
+        """
+        return self.modules["internal"].errors.getError()
+
+
+def getReplayFixtures():
+    """Returns the simulated project that scripts are replayed with. Recordings don't include the
+    state of FL Studio, so this is an empty project with no windows focused.
+
+    Returns:
+        Fixtures: project
+    """
+    fixtures = Fixtures([Channel("Sampler")])
+    fixtures.focused_window = NO_WINDOW
+    fixtures.fl_version = "20.9.0"
+    return fixtures
+
+
+def isScriptModule(module):
+    """Returns whether a module belongs to the repository or the FL Studio API
+
+    Args:
+        module (module): module
+
+    Returns:
+        bool
+    """
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return False
+    path = os.path.normpath(path)
+    if path.startswith(REPO_DIR + os.sep) and not path.startswith(os.path.join(REPO_DIR, "benchmarks")):
+        return True
+    return module.__name__.split(".")[0] in FL_MODULES
+
+
+def purgeModules():
+    """Remove modules of the repository and FL Studio API from sys.modules, so that they are
+    imported again for the next script
+    """
+    for key, module in list(sys.modules.items()):
+        if module is not None and isScriptModule(module):
+            del sys.modules[key]
+
+
+def loadRecording(filenames):
+    """Load MIDI journals and merge them in order of time
+
+    Args:
+        filenames (list of str): journal files (one per port)
+
+    Returns:
+        list of tuple: (time, kind, port, status, data1, data2), with times starting at 0
+    """
+    purgeModules()
+    journal = importlib.import_module("internal.journal")
+    records = []
+    for filename in filenames:
+        file_records = journal.loadJournal(filename)
+        
+        # Messages sent before the script knew its port number are recorded with port 0
+        ports = [record[2] for record in file_records if record[2] != 0]
+        if len(ports):
+            port = max(set(ports), key=ports.count)
+            file_records = [record[:2] + (port,) + record[3:] if record[2] == 0 else record for record in file_records]
+        records.extend(file_records)
+    purgeModules()
+
+    records.sort(key=lambda record: record[0])
+    if len(records):
+        start = records[0][0]
+        records = [(record[0] - start,) + record[1:] for record in records]
+    return records
+
+
+def findDispatched(recording):
+    """Find the messages in a recording that one script received from the other. These are sent
+    again by the replay, so aren't replayed from the recording.
+
+    Args:
+        recording (list of tuple): records from loadRecording()
+
+    Returns:
+        set of int: indexes of records received from the other script
+    """
+    ports = set(record[2] for record in recording)
+    # (port, message) -> times that the message was sent to the port
+    sent = dict()
+    for timestamp, kind, port, status, data1, data2 in recording:
+        if kind == JOURNAL_INTERNAL:
+            for receiver in ports:
+                if receiver != port:
+                    sent.setdefault((receiver, status, data1, data2), []).append(timestamp)
+
+    # Messages are recorded as sent before they are received, but records at the same time
+    # (from different journals) may be in either order
+    # (port, message) -> number of messages received
+    received = dict()
+    dispatched = set()
+    for index, (timestamp, kind, port, status, data1, data2) in enumerate(recording):
+        if kind != JOURNAL_IN:
+            continue
+        key = (port, status, data1, data2)
+        num_received = received.get(key, 0)
+        if bisect.bisect_right(sent.get(key, []), timestamp) > num_received:
+            received[key] = num_received + 1
+            dispatched.add(index)
+        elif status & 0xF == INTERNAL_CHANNEL:
+            # The journal of the other script is missing, or started after this was sent
+            dispatched.add(index)
+    return dispatched
+
+
+class Replay:
+    """Replays a recording through both device scripts
+    """
+    def __init__(self, recording, realtime=False, idle_interval=DEFAULT_IDLE_INTERVAL, bpm=None, seed=0):
+        """Load both device scripts and prepare to replay
+
+        Args:
+            recording (list of tuple): records from loadRecording()
+            realtime (bool, optional): whether to replay in real time. Defaults to False.
+            idle_interval (float, optional): time between OnIdle calls. Defaults to
+                DEFAULT_IDLE_INTERVAL.
+            bpm (float, optional): tempo to call OnUpdateBeatIndicator at, or None to not call it.
+                Defaults to None.
+            seed (int, optional): seed for random number generators used by the scripts. Defaults
+                to 0.
+        """
+        self.recording = recording
+        self.realtime = realtime
+        self.idle_interval = idle_interval
+        self.bpm = bpm
+        self.time = 0.0
+        # Messages dispatched between scripts, delivered once the current callback returns
+        self.pending = []
+        self.num_skipped = 0
+
+        self.clock = None if realtime else VirtualClock()
+        self.basic = ScriptInstance(self, SCRIPT_BASIC, 0, self.clock)
+        self.extended = ScriptInstance(self, SCRIPT_EXTENDED, 0, self.clock)
+        self.basic.port = self.basic.config.DEVICE_PORT_BASIC
+        self.extended.port = self.extended.config.DEVICE_PORT_EXTENDED
+        self.scripts = [self.basic, self.extended]
+
+        for script in self.scripts:
+            if not realtime:
+                # Frame skipping depends on how fast the computer is, so would change the results
+                script.config.LIGHTS_TARGET_FPS = 0
+                script.config.LIGHTS_FRAME_BUDGET = math.inf
+            for module in script.modules.values():
+                rng = getattr(module, "rng", None)
+                if rng is not None and hasattr(rng, "seed"):
+                    rng.seed(seed)
+
+    def getScript(self, port):
+        """Returns the script using a port
+
+        Args:
+            port (int): port number
+
+        Returns:
+            ScriptInstance: script, or None if no script uses the port
+        """
+        for script in self.scripts:
+            if script.port == port:
+                return script
+        return None
+
+    def dispatch(self, sender, message):
+        """Queue a message to be sent from one script to the other
+
+        Args:
+            sender (ScriptInstance): script sending the message
+            message (int): MIDI message
+        """
+        receiver = self.extended if sender is self.basic else self.basic
+        self.pending.append((receiver, message))
+
+    def deliver(self):
+        """Deliver messages sent between scripts
+        """
+        while len(self.pending):
+            receiver, message = self.pending.pop(0)
+            receiver.midiIn(message & 0xFF, (message >> 8) & 0xFF, (message >> 16) & 0xFF)
+
+    def call(self, script, function, *args):
+        """Call a callback of a script, then deliver any messages it sent to the other script
+
+        Args:
+            script (ScriptInstance): script
+            function (str): name of callback
+            *args: arguments
+        """
+        script.call(function, *args)
+        self.deliver()
+
+    def setTime(self, now, wall_start):
+        """Move to a time in the recording
+
+        Args:
+            now (float): time in the recording
+            wall_start (float): real time that the replay started
+        """
+        self.time = now
+        if self.realtime:
+            delay = wall_start + now - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            self.clock.now = now
+
+    def run(self):
+        """Replay the recording
+
+        Returns:
+            float: real time taken (seconds)
+        """
+        for script in self.scripts:
+            self.call(script, "OnInit")
+        for script in self.scripts:
+            script.resetPerformance()
+
+        next_idle = 0.0
+        beat_interval = None if self.bpm is None else 60 / self.bpm / 2
+        next_beat = 0.0
+        beat_count = 0
+
+        dispatched = findDispatched(self.recording)
+
+        wall_start = time.perf_counter()
+        for index, (timestamp, kind, port, status, data1, data2) in enumerate(self.recording + [(None, None, None, None, None, None)]):
+            # Idle and beat callbacks that happen before the event
+            while True:
+                upcoming = [next_idle]
+                if beat_interval is not None:
+                    upcoming.append(next_beat)
+                now = min(upcoming)
+                if timestamp is not None and now > timestamp:
+                    break
+                if timestamp is None and now > self.time:
+                    break
+                self.setTime(now, wall_start)
+                if now == next_idle:
+                    for script in self.scripts:
+                        self.call(script, "OnIdle")
+                    next_idle += self.idle_interval
+                else:
+                    # 1 at the start of a bar, 2 on other beats, 0 between beats
+                    value = 0 if beat_count % 2 else (1 if beat_count % 8 == 0 else 2)
+                    for script in self.scripts:
+                        self.call(script, "OnUpdateBeatIndicator", value)
+                    beat_count += 1
+                    next_beat += beat_interval
+            if timestamp is None:
+                break
+
+            if kind != JOURNAL_IN:
+                continue
+            script = self.getScript(port)
+            # Messages from the other script are sent again by the replay, and SysEx contents
+            # aren't recorded
+            if script is None or status == 0xF0 or index in dispatched:
+                self.num_skipped += 1
+                continue
+            self.setTime(timestamp, wall_start)
+            script.midiIn(status, data1, data2)
+            self.deliver()
+
+        # Let anything waiting for idle finish
+        for script in self.scripts:
+            self.call(script, "OnIdle")
+
+        return time.perf_counter() - wall_start
+
+
+def compareOutbound(recording, script):
+    """Compare the messages sent by a script with the ones recorded. Only messages sent after the
+    first recorded event are compared, since the start of the journal may have been overwritten.
+
+    Args:
+        recording (list of tuple): records from loadRecording()
+        script (ScriptInstance): script
+
+    Returns:
+        tuple:
+            int: number of messages recorded
+            int: number of messages sent by the replay
+            list of str: differences
+    """
+    first_in = next((record[0] for record in recording if record[1] == JOURNAL_IN), 0.0)
+    expected = [record[1:2] + record[3:] for record in recording
+                if record[2] == script.port and record[1] in COMPARED_KINDS and record[0] >= first_in]
+    actual = [record[1:] for record in script.outbound if record[0] >= first_in]
+
+    differences = []
+    matcher = difflib.SequenceMatcher(None, expected, actual, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        differences.append(tag + ": recorded " + formatMessages(expected[i1:i2]) + ", replayed " + formatMessages(actual[j1:j2]))
+    return len(expected), len(actual), differences
+
+
+def formatMessages(messages):
+    """Returns a short description of a list of messages
+
+    Args:
+        messages (list of tuple): (kind, status, data1, data2)
+
+    Returns:
+        str: description
+    """
+    if not len(messages):
+        return "nothing"
+    kinds = ["In", "Out", "Out (buffer)", "Internal"]
+    out = ", ".join(kinds[kind] + " " + "{:02X} {:02X} {:02X}".format(status, data1, data2) for kind, status, data1, data2 in messages[:3])
+    if len(messages) > 3:
+        out += " (+" + str(len(messages) - 3) + " more)"
+    return out
+
+
+def printReport(replay, wall_time):
+    """Print throughput, differences from the recording and performance of each script
+
+    Args:
+        replay (Replay): replay that has been run
+        wall_time (float): real time taken
+    """
+    num_events = sum(script.num_events for script in replay.scripts)
+    print("Replayed " + str(num_events) + " events (" + str(replay.num_skipped) + " records skipped) in "
+          + str(round(wall_time, 3)) + " s")
+    if wall_time > 0:
+        print("Throughput: " + str(round(num_events / wall_time)) + " events/s")
+
+    for script in replay.scripts:
+        print()
+        print(script.name + " (port " + str(script.port) + ")")
+        print("  Events: " + str(script.num_events) + ", time in callbacks: "
+              + str(round(script.callback_time * 1000, 3)) + " ms")
+        if script.getError():
+            print("  Script crashed during replay")
+
+        recorded, replayed, differences = compareOutbound(replay.recording, script)
+        print("  Outbound messages: " + str(recorded) + " recorded, " + str(replayed) + " replayed, "
+              + str(len(differences)) + " differences")
+        for difference in differences[:MAX_DIFFS_SHOWN]:
+            print("   - " + difference)
+        if len(differences) > MAX_DIFFS_SHOWN:
+            print("   - ...")
+
+        print(script.modules["internal.performance"].getSnapshotString())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay MIDI journals through both device scripts")
+    parser.add_argument("journals", nargs="+", help="journal files (eg midi_journal_220.bin midi_journal_225.bin)")
+    parser.add_argument("--realtime", action="store_true", help="replay in real time rather than as fast as possible")
+    parser.add_argument("--idle-interval", type=float, default=DEFAULT_IDLE_INTERVAL, help="seconds between OnIdle calls")
+    parser.add_argument("--bpm", type=float, default=None, help="call OnUpdateBeatIndicator at this tempo")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random number generators")
+    parser.add_argument("--quiet", action="store_true", help="hide output printed by the scripts")
+    parser.add_argument("--save-journals", metavar="DIRECTORY", default=None,
+                        help="save the journals of the replayed scripts, so that they can be replayed again")
+    args = parser.parse_args()
+
+    recording = loadRecording(args.journals)
+
+    stdout = sys.stdout
+    if args.quiet:
+        sys.stdout = open(os.devnull, "w")
+    try:
+        replay = Replay(recording, args.realtime, args.idle_interval, args.bpm, args.seed)
+        wall_time = replay.run()
+    finally:
+        if args.quiet:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    printReport(replay, wall_time)
+
+    if args.save_journals is not None:
+        for script in replay.scripts:
+            journal = script.modules["internal.journal"].journal
+            print("Saved " + journal.dump(os.path.join(os.path.abspath(args.save_journals), "midi_journal_" + str(script.port) + ".bin")))
+
+
+if __name__ == "__main__":
+    main()
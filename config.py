@@ -55,6 +55,19 @@ START_IN_INCONTROL_PADS = True
 ENABLE_SNAPPING = True # Change to False to prevent faders and knobs from snapping to default values
 SNAP_RANGE = 0.05 # Will snap if within this disatnce of snap value
 
+# If enabled, fader and knob movements are processed at most once per idle tick (or once the 
+# latency below has passed), using only the latest value of each control. This reduces the load
+# when moving controls quickly, but controls that aren't used by the script won't be passed on to
+# FL Studio (eg for linking to parameters), so it is disabled by default.
+COALESCE_CONTROLS = False
+# Longest time (in seconds) that a control change is held back for when coalescing
+COALESCE_LATENCY = 0.02
+
+# If enabled, changes to volumes, pans and plugin parameters are sent to FL Studio on idle, rather
+# than as soon as the control is moved. If a parameter changes more than once between idle ticks,
+# only the latest value is sent.
+DEFER_HOST_WRITES = True
+
 # Plugin options
 #-----------------------
 
@@ -73,11 +86,24 @@ DRUM_PADS_FULL_VELOCITY = False
 IDLE_LIGHTS_ENABLED = True
 # Time to wait before entering idle light show = 1156 * number of minutes
 IDLE_WAIT_TIME = 1156 * 5
+# Minimum time (in seconds) between messages telling the other script to reset its idle time.
+# Events within this time of the last message won't send another one
+IDLE_RESET_MESSAGE_INTERVAL = 0.5
+
+# Maximum number of lighting frames drawn per second. Use 0 to draw a frame every idle tick
+LIGHTS_TARGET_FPS = 0
+# If drawing a frame takes longer than this (in seconds), following frames will be skipped to 
+# leave time for processing events. Only used if LIGHTS_TARGET_FPS isn't 0
+LIGHTS_FRAME_BUDGET = 0.01
 
 # Controls the frequency at which the script executes a full redraw (to fix dud lights)
 LIGHTS_FULL_REDRAW_FREQUENCY = 5
 # If enabled, animations will be disabled
 LIGHTS_REDUCE_MOTION = False
+# If enabled, colours (eg of channels) are matched to the closest colour the controller can show 
+# using a distance that is closer to how colours are perceived, rather than straight-line RGB 
+# distance
+LIGHTS_PERCEPTUAL_COLOURS = False
 
 
 #-------------------------------
@@ -92,3 +118,16 @@ CONSOLE_DEBUG_MODE = []
 
 # Whether script should stop entirely when it encounters an error.
 DEBUG_HARD_CRASHING = False
+
+# If enabled, debug messages are stored and printed on idle, rather than while events are being 
+# processed, since printing to the Script output window is slow. Repeated messages are combined.
+CONSOLE_BUFFER_OUTPUT = True
+# Maximum number of messages printed each idle tick
+CONSOLE_LINES_PER_IDLE = 50
+# Maximum number of messages waiting to be printed
+CONSOLE_BUFFER_SIZE = 2000
+# What to do with new messages when the buffer is full:
+#  - "drop oldest": forget the oldest message waiting to be printed
+#  - "drop newest": forget the new message
+#  - "print": print all waiting messages immediately (this may cause lag)
+CONSOLE_OVERFLOW_POLICY = "drop oldest"
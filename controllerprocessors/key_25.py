@@ -11,6 +11,9 @@ import internal
 import internal.consts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_FADER]
+
 def process(command):
     command.actions.addProcessor("25-key Processor")
     # Change fader automatically
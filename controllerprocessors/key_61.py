@@ -10,6 +10,9 @@ import eventconsts
 import internal
 import internal.consts
 
+# Types of events this processor acts on
+EVENT_TYPES = []
+
 def process(command):
     
     pass
@@ -9,25 +9,38 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 import eventconsts
 import internal
 import internal.consts
+import processorhelpers
 
 import controllerprocessors.key_25 as k25
 import controllerprocessors.key_49 as k49
 import controllerprocessors.key_61 as k61
 
-def process(command):
-    """Process event based on number of keys in device
+def getDeviceProcessors():
+    """Returns the processor for the number of keys in device
 
-    Args:
-        command (ParsedEvent): Event to process
+    Returns:
+        list: processor modules
     """
     if internal.state.DEVICE_TYPE == internal.consts.DEVICE_KEYS_25:
-        k25.process(command)
+        return [k25]
     
     if internal.state.DEVICE_TYPE == internal.consts.DEVICE_KEYS_49:
-        k49.process(command)
+        return [k49]
         
     if internal.state.DEVICE_TYPE == internal.consts.DEVICE_KEYS_61:
-        k61.process(command)
+        return [k61]
+    
+    return []
+
+routes = processorhelpers.ProcessorRoutes(getDeviceProcessors)
+
+def process(command):
+    """Process event based on number of keys in device
+
+    Args:
+        command (ParsedEvent): Event to process
+    """
+    routes.process(command)
 
 def onInit():
     """Initialise keys
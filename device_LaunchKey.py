@@ -62,15 +62,16 @@ class TGeneric():
 
 
     def OnDeInit(self):
+        internal.console.flushAll()
         print('Deinitialisation complete')
 
     def OnMidiIn(self, event):
         event.handled = False
         internal.performance.eventClock.start()
-        
+        internal.journal.recordIn(event)
         
         # Process the event into ParsedEvent format
-        command = processorhelpers.ParsedEvent(event)
+        command = processorhelpers.eventPool.acquire(event)
         
         # Print event before processing
         internal.printCommand(command)
@@ -91,15 +92,24 @@ class TGeneric():
 
         # Print output
         internal.printCommandOutput(command)
+        processorhelpers.eventPool.release(command)
     
     def OnIdle(self):
         internal.idleProcessor()
+        eventprocessor.processCoalesced(False)
+        internal.hostWrites.flush()
         
         if internal.shifts["MAIN"].query():
             internal.state.idleShift()
+        
+        internal.console.flush()
     
     def OnUpdateBeatIndicator(self, beat):
         eventprocessor.beatChange(beat)
+    
+    def OnRefresh(self, flags):
+        # Names of tracks, channels or plugins may have changed
+        internal.names.clear()
         
 
 
@@ -119,3 +129,6 @@ def OnIdle():
     
 def OnUpdateBeatIndicator(beat):
     Generic.OnUpdateBeatIndicator(beat)
+
+def OnRefresh(flags):
+    Generic.OnRefresh(flags)
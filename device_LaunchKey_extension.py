@@ -81,6 +81,7 @@ class TGeneric():
         try:
             # Return the device into Basic Mode
             internal.extendedMode.setVal(False)
+            internal.console.flushAll()
             print('Deinitialisation complete')
             print(internal.getLineBreak())
             print(internal.getLineBreak())
@@ -93,11 +94,12 @@ class TGeneric():
     def OnMidiIn(self, event):
         event.handled = False
         internal.performance.eventClock.start()
+        internal.journal.recordIn(event)
         # Update active window (ui.onRefresh() isnt working properly)
         internal.ActiveWindow = ui.getFocusedFormCaption()
 
         # Process the event into ParsedEvent format
-        command = processorhelpers.ParsedEvent(event)
+        command = processorhelpers.eventPool.acquire(event)
 
         # Print event before processing
         internal.printCommand(command)
@@ -105,6 +107,7 @@ class TGeneric():
         # Check for shift button releases (return early)
         if event.handled:
             internal.printCommandOutput(command)
+            processorhelpers.eventPool.release(command)
             return
 
         # Process command
@@ -120,13 +123,19 @@ class TGeneric():
 
         # Print output of command
         internal.printCommandOutput(command)
+        processorhelpers.eventPool.release(command)
         event.handled = True
     
     def OnIdle(self):
         internal.idleProcessor()
-        eventprocessor.redraw()
+        eventprocessor.processCoalesced(True)
+        internal.hostWrites.flush()
+        if internal.performance.frames.startFrame():
+            eventprocessor.redraw()
+            internal.performance.frames.endFrame()
         # Notify standard script that an idle event has occurred
         internal.messages.sendCompleteInternalMidiMessage(internal.consts.MESSAGE_IDLE_NOTIFICATION, "Idle notification")
+        internal.console.flush()
 
     def OnRefresh(self, flags):
         internal.refreshProcessor()
@@ -34,6 +34,26 @@ TYPE_BASIC_EVENT = 21
 TYPE_SYSEX_EVENT = 30
 TYPE_INTERNAL_EVENT = 31
 
+# Names of event types, used when summarising events
+TYPE_NAMES = {
+    TYPE_UNRECOGNISED: "Unrecognised",
+    TYPE_SYSTEM_MSG: "System",
+    TYPE_INCONTROL: "InControl",
+    TYPE_TRANSPORT: "Transport",
+    TYPE_KNOB: "Knob",
+    TYPE_FADER: "Fader",
+    TYPE_FADER_BUTTON: "Fader Button",
+    TYPE_PAD: "Pad",
+    TYPE_BASIC_KNOB: "Knob (Basic)",
+    TYPE_BASIC_FADER: "Fader (Basic)",
+    TYPE_BASIC_FADER_BUTTON: "Fader Button (Basic)",
+    TYPE_BASIC_PAD: "Pad (Basic)",
+    TYPE_NOTE: "Note",
+    TYPE_BASIC_EVENT: "Basic Event",
+    TYPE_SYSEX_EVENT: "Sysex",
+    TYPE_INTERNAL_EVENT: "Internal event"
+}
+
 
 NOTE_ON = 0x9 # Shortened as data1 also contains note channel
 NOTE_OFF = 0x8
@@ -18,6 +18,7 @@ import internal.consts
 import config
 import lighting
 import lightingconsts
+import processorhelpers
 
 import otherprocessors.processdefault as processdefault
 import otherprocessors.processfirst as processfirst
@@ -57,23 +58,37 @@ def processExtended(command):
                 command.handle("End Idle Light Show", True)
             internal.window.resetIdleTick()
 
+        # Hold back fader and knob changes to be processed together
+        if processorhelpers.controlCoalescer.defer(command):
+            if processorhelpers.controlCoalescer.isDue():
+                processCoalesced(True)
+            return
+
+        # Time taken by each stage is recorded in internal.performance
+        stage_time = time.perf_counter()
+
         # Process key mappings
         controllerprocessors.process(command)
+        stage_time = internal.performance.controllerClock.lap(stage_time)
         
         # Process shifts
         internal.shifts.processShift(command)
+        stage_time = internal.performance.shiftClock.lap(stage_time)
         if command.ignored: return
         
         # Call primary processor
         processfirst.process(command)
+        stage_time = internal.performance.firstClock.lap(stage_time)
         if command.ignored: return
         
         # Process through shift processors
         internal.shifts.process(command)
+        stage_time = internal.performance.shiftProcessClock.lap(stage_time)
         if command.ignored: return
         
         # Note Processors
         noteprocessors.process(command)
+        stage_time = internal.performance.noteClock.lap(stage_time)
         if command.ignored: return
 
         # Only call plugin and window processors if it is safe to do so | Disabled because of errors
@@ -82,15 +97,18 @@ def processExtended(command):
             # Shouldn't be called in extended mode
             # Attempt to process event using custom processors for plugins
             pluginprocessors.process(command)
+            stage_time = internal.performance.pluginClock.lap(stage_time)
 
             #if command.ignored: return
 
             # Process content from windows
             windowprocessors.process(command)
+            stage_time = internal.performance.windowClock.lap(stage_time)
 
         # If command hasn't been handled by any above uses, use the default controls
         if command.handled is False:
             processdefault.process(command)
+            internal.performance.defaultClock.lap(stage_time)
 
     except Exception as e:
         internal.errors.triggerError(e)
@@ -101,27 +119,40 @@ def processBasic(command):
     Args:
         command (ParsedEvent): a parsed MIDI event
     """
-    # Send event to reset other controller
-    internal.sendCompleteInternalMidiMessage(internal.consts.MESSAGE_RESET_INTERNAL_CONTROLLER)
+    # Send event to reset other controller (if it hasn't been reset recently)
+    internal.messenger.sendIdleReset()
 
     try:
         if command.recieved_internal:
             processReceived(command)
             return
         
+        # Hold back fader and knob changes to be processed together
+        if processorhelpers.controlCoalescer.defer(command):
+            if processorhelpers.controlCoalescer.isDue():
+                processCoalesced(False)
+            return
+        
+        # Time taken by each stage is recorded in internal.performance
+        stage_time = time.perf_counter()
+        
         # Process key mappings
         controllerprocessors.process(command)
+        stage_time = internal.performance.controllerClock.lap(stage_time)
         
         # Call primary processor
         processfirst_basic.process(command)
+        stage_time = internal.performance.firstClock.lap(stage_time)
         if command.ignored: return
         
         # Process through shift processors
         internal.shifts.process(command)
+        stage_time = internal.performance.shiftProcessClock.lap(stage_time)
         if command.ignored: return
 
         # Send to note processors
         noteprocessors.process(command)
+        stage_time = internal.performance.noteClock.lap(stage_time)
         
         if command.type == eventconsts.TYPE_PAD:
             command.handle("Post-note-processor pad catch", True)
@@ -137,6 +168,7 @@ def processBasic(command):
 
             # Attempt to process event using custom processors for plugins
             pluginprocessors.process(command)
+            internal.performance.pluginClock.lap(stage_time)
 
         if command.ignored: return
 
@@ -144,6 +176,55 @@ def processBasic(command):
         internal.errors.triggerError(e)
 
 
+def processBatch(events, extended):
+    """Processes a sequence of events through the same pipeline as OnMidiIn, without printing
+    information about each event. Used to replay captured sessions for load testing.
+
+    Args:
+        events (iterable): tuples of (status, data1, data2, sysex, pmeFlags)
+        extended (bool): whether to process events as the extended script (processExtended) or the
+            basic script (processBasic)
+
+    Returns:
+        BatchSummary: timing and aggregated actions for the batch
+    """
+    summary = processorhelpers.BatchSummary()
+    event = processorhelpers.BatchEvent()
+    process = processExtended if extended else processBasic
+    
+    start_time = time.perf_counter()
+    for status, data1, data2, sysex, pmeFlags in events:
+        event.set(status, data1, data2, sysex, pmeFlags)
+        command = processorhelpers.eventPool.acquire(event)
+        
+        # Events handled while parsing (eg shift releases) skip the processors, as in OnMidiIn
+        if not event.handled:
+            process(command)
+        
+        summary.addEvent(command)
+        command.actions.clear()
+        processorhelpers.eventPool.release(command)
+    
+    # Apply control changes that were held back
+    processCoalesced(extended)
+    internal.hostWrites.flush()
+    
+    summary.total_time = time.perf_counter() - start_time
+    
+    summary.print()
+    return summary
+
+
+def processCoalesced(extended):
+    """Processes fader and knob changes that were held back to be processed together (see 
+    processorhelpers.ControlCoalescer). Called on idle.
+
+    Args:
+        extended (bool): whether this is the extended script
+    """
+    processorhelpers.controlCoalescer.flush(processExtended if extended else processBasic)
+
+
 def processReceived(command):
     """Processes events recieved internally (from other script)
 
@@ -226,11 +307,14 @@ def activeEnd():
 def redraw():
     """Creates LightMap object and forwards it to various redraw functions to gather data about next lighting redraw.
     """
-    lights = lighting.LightMap()
+    internal.performance.redrawClock.start()
+    lights = lighting.frame
+    lights.reset()
 
     if internal.errors.getError():
         internal.errors.redrawError(lights)
         lighting.state.setFromMap(lights)
+        internal.performance.redrawClock.stop()
         return
 
     for _ in range(1):
@@ -255,7 +339,7 @@ def redraw():
             if lights.isSolid(): break
 
             # Get UI from primary processor
-            processfirst.redraw(lights)
+            processorhelpers.redrawCache.redraw(processfirst, lights)
             
             noteprocessors.redraw(lights)
             
@@ -282,6 +366,7 @@ def redraw():
 
     # Call pads refresh function
     lighting.state.setFromMap(lights)
+    internal.performance.redrawClock.stop()
 
 def beatChange(beat):
     pluginprocessors.beatChange(beat)
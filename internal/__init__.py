@@ -11,11 +11,13 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 
 
 from .state import sharedInit, extendedMode, errors, getPortExtended
-from .messages import sendInternalMidiMessage, sendCompleteInternalMidiMessage, sendMidiMessage, sendCompleteMidiMessage, toMidiMessage
-from .logging import debugLog, getLineBreak, printCommand, printCommandOutput, getTab
+from .messages import sendInternalMidiMessage, sendCompleteInternalMidiMessage, sendMidiMessage, sendCompleteMidiMessage, toMidiMessage, messenger
+from .logging import debugLog, log, logger, console, getLineBreak, printCommand, printCommandOutput, getTab
 from .windowstate import window
 from .shiftstate import shifts
 from .misc import idleProcessor, beat, refreshProcessor, processSysEx
 from .notemanager import noteMode, notesDown
 from .snap import snap
 from .performance import PerformanceMontor
+from .hostapi import hostWrites, names
+from .journal import journal
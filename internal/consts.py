@@ -60,6 +60,9 @@ EVENT_NO_HANDLE = 0
 EVENT_HANDLE = 1
 EVENT_IGNORE = 2
 
+# Number of unused ParsedEvent objects kept for reuse
+EVENT_POOL_SIZE = 4
+
 #---------------------------------
 # Window constants
 #---------------------------------
@@ -108,6 +111,31 @@ class DEBUG:
     SHIFT_EVENTS = "Shift events"
     IMPORTS = "Import messages"
 
+# Bit used for each debug level in the mask of enabled levels (see logging.Logger)
+DEBUG_BITS = {level: 1 << bit for bit, level in enumerate([
+    DEBUG.ERROR,
+    DEBUG.PROCESSOR_PERFORMANCE,
+    DEBUG.LIGHTING_RESET,
+    DEBUG.LIGHTING_MESSAGE,
+    DEBUG.DISPATCH_EVENT,
+    DEBUG.IDLE_PERFORMANCE,
+    DEBUG.ANIMATION_IDLE_TIMERS,
+    DEBUG.EVENT_DATA,
+    DEBUG.PRINT_INTERNAL_EVENTS,
+    DEBUG.EVENT_ACTIONS,
+    DEBUG.WINDOW_CHANGES,
+    DEBUG.WARNING_DEPRECIATED_FEATURE,
+    DEBUG.DEVICE_TYPE,
+    DEBUG.NOTE_MODE,
+    DEBUG.SHIFT_EVENTS,
+    DEBUG.IMPORTS
+])}
+
+# Overflow policies for the console buffer (see config.CONSOLE_OVERFLOW_POLICY)
+CONSOLE_OVERFLOW_DROP_OLDEST = "drop oldest"
+CONSOLE_OVERFLOW_DROP_NEWEST = "drop newest"
+CONSOLE_OVERFLOW_PRINT = "print"
+
 FORCE_DEBUG_MODES_LIST = [DEBUG.ERROR, DEBUG.EVENT_DATA, DEBUG.EVENT_ACTIONS, DEBUG.WINDOW_CHANGES, DEBUG.WARNING_DEPRECIATED_FEATURE, DEBUG.NOTE_MODE, DEBUG.IMPORTS]
 
 #---------------------------------
@@ -155,3 +183,18 @@ INTERNAL_CHANNEL_STATUS = 0xE
 
 
 LOG_TAB_LENGTH = 16
+
+# Number of times a performance monitor is stopped between printing summaries
+PERFORMANCE_REPORT_INTERVAL = 100
+
+# File that performance snapshots are exported to (relative to the script directory)
+PERFORMANCE_EXPORT_FILE = "performance.csv"
+
+# Number of MIDI messages stored in the MIDI journal (see journal.py)
+JOURNAL_SIZE = 4096
+# File that the MIDI journal is saved to (relative to the script directory). Formatted with the
+# port number, so that both scripts can save their journals
+JOURNAL_DUMP_FILE = "midi_journal_{}.bin"
+# Start of MIDI journal files, and version of the format
+JOURNAL_MAGIC = b"LKMJ"
+JOURNAL_VERSION = 1
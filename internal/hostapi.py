@@ -0,0 +1,227 @@
+"""
+internal > hostapi.py
+
+Contains objects that reduce the number of calls made to FL Studio's API while processing events:
+ - A queue of writes (eg setting mixer volumes), which are applied on idle
+ - A cache of names (eg of mixer tracks), used when creating hint messages
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import time
+
+import mixer
+import channels
+import plugins
+
+import config
+from . import consts
+from .performance import hostWriteClock
+from .logging import log, getTab
+
+class HostWriteQueue:
+    """
+    HostWriteQueue
+
+    Holds back writes to FL Studio so that they are applied on idle rather than while events are
+    processed. Writes are keyed by their target and parameter, so that only the latest value is
+    written if a parameter is set more than once before the queue is flushed. Time between a write
+    being queued and applied is recorded in internal.performance.hostWriteClock.
+
+    Writes are applied immediately if config.DEFER_HOST_WRITES is disabled.
+    """
+    def __init__(self):
+        # Key -> (function, args, time queued)
+        self.pending = dict()
+        self.resetCounters()
+
+    def resetCounters(self):
+        """Clear the counts of writes queued and applied
+        """
+        self.num_queued = 0
+        self.num_written = 0
+        self.max_depth = 0
+
+    def write(self, key, function, *args):
+        """Queue a write to FL Studio
+
+        Args:
+            key (tuple): target and parameter being written (eg ("mixer volume", track)). Writes
+                with the same key replace each other.
+            function (function): FL Studio API function to call
+            *args: arguments to call the function with
+        """
+        if not config.DEFER_HOST_WRITES:
+            function(*args)
+            return
+
+        self.num_queued += 1
+        old = self.pending.get(key)
+        if old is None:
+            self.pending[key] = (function, args, time.perf_counter())
+            if len(self.pending) > self.max_depth:
+                self.max_depth = len(self.pending)
+        else:
+            # Keep the time that the parameter was first queued, so that latency isn't hidden
+            self.pending[key] = (function, args, old[2])
+
+    def getPending(self, key):
+        """Returns the arguments of a queued write, so that values can be read back before the
+        queue is flushed
+
+        Args:
+            key (tuple): target and parameter
+
+        Returns:
+            tuple: arguments of the write, or None if no write is queued
+        """
+        write = self.pending.get(key)
+        if write is None:
+            return None
+        return write[1]
+
+    def getDepth(self):
+        """Returns the number of writes in the queue
+
+        Returns:
+            int: queue depth
+        """
+        return len(self.pending)
+
+    def flush(self):
+        """Apply all queued writes. Called on idle.
+
+        If a write fails (eg because its target was deleted), the remaining writes are still
+        applied, then the script is put into its error state with the first error.
+        """
+        if not len(self.pending):
+            return
+
+        pending = self.pending
+        self.pending = dict()
+        now = time.perf_counter()
+        error = None
+        num_written = 0
+        for function, args, queue_time in pending.values():
+            try:
+                function(*args)
+            except Exception as e:
+                log(consts.DEBUG.ERROR, "Host write failed: {}{}: {}", function.__name__, args, e)
+                if error is None:
+                    error = e
+                continue
+            hostWriteClock.record(now - queue_time)
+            num_written += 1
+        self.num_written += num_written
+        log(consts.DEBUG.IDLE_PERFORMANCE, getTab("Host writes:", 2) + "{}", num_written)
+        
+        if error is not None:
+            errors.triggerError(error)
+
+    def getString(self):
+        """Returns a summary of writes queued and applied
+
+        Returns:
+            str: summary
+        """
+        return "Host writes: " + str(self.num_queued) + " queued, " + str(self.num_written) \
+            + " written (max queue depth " + str(self.max_depth) + ")"
+
+
+class NameCache:
+    """
+    NameCache
+
+    Stores names of mixer tracks, channels, plugins and parameters, so that they aren't requested
+    from FL Studio every time a hint message is created. The cache is cleared when FL Studio
+    refreshes the script (eg after something is renamed).
+    """
+    def __init__(self):
+        self.names = dict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def clear(self):
+        """Forget all stored names
+        """
+        self.names.clear()
+
+    def get(self, key, function, *args):
+        """Returns a name, requesting it from FL Studio if it isn't stored
+
+        Args:
+            key (tuple): what is being named
+            function (function): FL Studio API function that gets the name
+            *args: arguments to call the function with
+
+        Returns:
+            str: name
+        """
+        name = self.names.get(key)
+        if name is None:
+            name = function(*args)
+            self.names[key] = name
+            self.num_misses += 1
+        else:
+            self.num_hits += 1
+        return name
+
+    def getTrackName(self, track):
+        """Returns the name of a mixer track
+
+        Args:
+            track (int): mixer track index
+
+        Returns:
+            str: name
+        """
+        return self.get(("track", track), mixer.getTrackName, track)
+
+    def getChannelName(self, channel):
+        """Returns the name of a channel
+
+        Args:
+            channel (int): channel index
+
+        Returns:
+            str: name
+        """
+        return self.get(("channel", channel), channels.getChannelName, channel)
+
+    def getPluginName(self, index, slot):
+        """Returns the name of a plugin
+
+        Args:
+            index (int): plugin index (as for plugins.getPluginName)
+            slot (int): effect slot index, or -1 for generators
+
+        Returns:
+            str: name
+        """
+        return self.get(("plugin", index, slot), plugins.getPluginName, index, slot)
+
+    def getParamName(self, param_index, index, slot):
+        """Returns the name of a plugin parameter
+
+        Args:
+            param_index (int): parameter index
+            index (int): plugin index (as for plugins.getParamName)
+            slot (int): effect slot index, or -1 for generators
+
+        Returns:
+            str: name
+        """
+        return self.get(("param", param_index, index, slot), plugins.getParamName, param_index, index, slot)
+
+    def getString(self):
+        """Returns a summary of cache usage
+
+        Returns:
+            str: summary
+        """
+        return "Name cache: " + str(self.num_hits) + " hits, " + str(self.num_misses) + " misses"
+
+hostWrites = HostWriteQueue()
+names = NameCache()
+
+from .state import errors
@@ -0,0 +1,209 @@
+"""
+internal > journal.py
+
+Contains a fixed-size record of recent MIDI messages sent and received by the script, which is
+saved to a file when the script crashes, so that what happened before the crash can be looked at
+(and replayed).
+
+Each record is a timestamp and a packed message. Messages are packed into 64 bit ints:
+ - Bits 0-7: status byte (0xF0 for SysEx and MIDI buffers)
+ - Bits 8-15: data 1 (for SysEx and buffers, the low byte of the length)
+ - Bits 16-23: data 2 (for SysEx and buffers, the high byte of the length)
+ - Bits 24-31: MIDI port number of the script
+ - Bits 32-39: kind of record (see JOURNAL_* constants)
+
+Dump files contain:
+ - Magic bytes (consts.JOURNAL_MAGIC)
+ - Version and byte order (0 for little endian, 1 for big endian), one byte each, then two bytes
+   of padding
+ - Number of records (64 bit unsigned int)
+ - Timestamps of each record, in seconds from time.perf_counter() (64 bit floats). Both scripts
+   use the same clock, so their journals can be merged
+ - Packed messages of each record (64 bit unsigned ints)
+
+Records are in order, oldest first.
+
+Author: Miguel Guthridge [hdsq@outlook.com.au]
+"""
+
+import sys
+import time
+import array
+
+from . import consts
+from .performance import getScriptPath
+
+# Kinds of record
+JOURNAL_IN = 0 # Received from the device (or other script)
+JOURNAL_OUT = 1 # Sent to the device
+JOURNAL_OUT_BUFFER = 2 # Block of data sent to the device
+JOURNAL_INTERNAL = 3 # Sent to the other script
+
+JOURNAL_KIND_NAMES = ["In", "Out", "Out (buffer)", "Internal"]
+
+class MidiJournal:
+    """
+    MidiJournal
+
+    Ring buffer of recent MIDI messages. Recording a message only stores a timestamp and a packed
+    int in preallocated arrays, so the journal is always enabled.
+    """
+    def __init__(self, size=consts.JOURNAL_SIZE):
+        self.size = size
+        self.times = array.array('d', [0.0]) * size
+        self.records = array.array('Q', [0]) * size
+        # Port number of the script, stored in each record
+        self.port = 0
+        self.clear()
+
+    def clear(self):
+        """Forget all records
+        """
+        # Index of the next record to write, and number of records stored
+        self.head = 0
+        self.count = 0
+
+    def setPort(self, port):
+        """Set the port number stored in records
+
+        Args:
+            port (int): MIDI port number of this script
+        """
+        self.port = port & 0xFF
+
+    def record(self, kind, message):
+        """Add a record, replacing the oldest one if the journal is full
+
+        Args:
+            kind (int): kind of record (eg JOURNAL_IN)
+            message (int): MIDI message, in completed form (status + (data1 << 8) + (data2 << 16))
+        """
+        head = self.head
+        self.times[head] = time.perf_counter()
+        self.records[head] = (message & 0xFFFFFF) | (self.port << 24) | (kind << 32)
+        head += 1
+        self.head = 0 if head == self.size else head
+        if self.count < self.size:
+            self.count += 1
+
+    def recordIn(self, event):
+        """Record a MIDI event received from FL Studio
+
+        Args:
+            event (FlMidiMsg): event
+        """
+        if event.sysex is None:
+            self.record(JOURNAL_IN, event.status + (event.data1 << 8) + (event.data2 << 16))
+        else:
+            self.recordBuffer(JOURNAL_IN, len(event.sysex))
+
+    def recordBuffer(self, kind, length):
+        """Record a block of data (eg SysEx)
+
+        Args:
+            kind (int): kind of record (eg JOURNAL_OUT_BUFFER)
+            length (int): number of bytes
+        """
+        self.record(kind, 0xF0 + ((length & 0xFF) << 8) + (((length >> 8) & 0xFF) << 16))
+
+    def getOrdered(self):
+        """Returns the timestamps and packed messages of all records, oldest first
+
+        Returns:
+            array of float: timestamps
+            array of int: packed messages
+        """
+        start = (self.head - self.count) % self.size
+        end = start + self.count
+        if end <= self.size:
+            return self.times[start:end], self.records[start:end]
+        end -= self.size
+        return self.times[start:] + self.times[:end], self.records[start:] + self.records[:end]
+
+    def dump(self, filename=None):
+        """Write the journal to a binary file (see module docstring for the format)
+
+        Args:
+            filename (str, optional): File to write to. Relative paths are relative to the script
+                directory. Defaults to consts.JOURNAL_DUMP_FILE, including the port number.
+
+        Returns:
+            str: path of file written
+        """
+        if filename is None:
+            filename = consts.JOURNAL_DUMP_FILE.format(self.port)
+        filename = getScriptPath(filename)
+
+        times, records = self.getOrdered()
+        header = consts.JOURNAL_MAGIC + bytes([consts.JOURNAL_VERSION, 0 if sys.byteorder == "little" else 1, 0, 0])
+        with open(filename, "wb") as f:
+            f.write(header)
+            f.write(array.array('Q', [len(records)]).tobytes())
+            f.write(times.tobytes())
+            f.write(records.tobytes())
+        return filename
+
+    def getString(self):
+        """Returns a summary of the journal
+
+        Returns:
+            str: summary
+        """
+        return "MIDI journal: " + str(self.count) + "/" + str(self.size) + " records"
+
+
+def unpackRecord(record):
+    """Split a packed journal record into its parts
+
+    Args:
+        record (int): packed message
+
+    Returns:
+        tuple: kind, port, status, data1, data2
+    """
+    return (record >> 32) & 0xFF, (record >> 24) & 0xFF, record & 0xFF, (record >> 8) & 0xFF, (record >> 16) & 0xFF
+
+
+def loadJournal(filename):
+    """Read a journal dump file
+
+    Args:
+        filename (str): path of file
+
+    Raises:
+        ValueError: the file isn't a journal dump, or is from a newer version of the script
+
+    Returns:
+        list of tuple: (timestamp, kind, port, status, data1, data2) for each record, oldest first
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    magic_len = len(consts.JOURNAL_MAGIC)
+    if data[:magic_len] != consts.JOURNAL_MAGIC:
+        raise ValueError("Not a MIDI journal file: " + filename)
+    version = data[magic_len]
+    if version > consts.JOURNAL_VERSION:
+        raise ValueError("Unsupported MIDI journal version: " + str(version))
+    swap = data[magic_len + 1] != (0 if sys.byteorder == "little" else 1)
+
+    offset = magic_len + 4
+    count = array.array('Q')
+    count.frombytes(data[offset:offset + 8])
+    times = array.array('d')
+    records = array.array('Q')
+    if swap:
+        count.byteswap()
+    count = count[0]
+    offset += 8
+    times.frombytes(data[offset:offset + 8 * count])
+    offset += 8 * count
+    records.frombytes(data[offset:offset + 8 * count])
+    if swap:
+        times.byteswap()
+        records.byteswap()
+
+    return [(timestamp,) + unpackRecord(record) for timestamp, record in zip(times, records)]
+
+
+journal = MidiJournal()
@@ -28,28 +28,299 @@ def getTab(string, multiplier = 1, length = consts.LOG_TAB_LENGTH):
     Returns:
         str: the original string with spaces appended to it to equal a tab
     """
-    string += " "
-    toAdd = (length * multiplier) - len(string) % (length * multiplier)
+    width = length * multiplier
+    # Always add at least one space
+    return string + " " * (width + 1 - (len(string) + 1) % width)
 
-    for x in range(toAdd):
-        string += " "
-    return string
+
+class Logger:
+    """
+    Logger
+
+    Prints debug messages for the debug levels enabled in config.CONSOLE_DEBUG_MODE. Enabled levels
+    are stored as a bitmask (see consts.DEBUG_BITS), so checking whether a level is enabled is a
+    single dictionary lookup and bitwise and. Messages are given as a template and arguments (or a
+    function that returns the message), and are only formatted if they will be printed. Messages
+    that aren't printed are counted for each level.
+
+    Errors are always printed.
+    """
+    def __init__(self):
+        # List of enabled levels that the mask was built from, and its length, so that changes to
+        # config.CONSOLE_DEBUG_MODE are noticed
+        self.levels = None
+        self.num_levels = 0
+        self.mask = 0
+        # Level -> number of messages not printed
+        self.suppressed = dict()
+
+    def refresh(self):
+        """Rebuild the mask of enabled levels if config.CONSOLE_DEBUG_MODE has changed
+        """
+        levels = config.CONSOLE_DEBUG_MODE
+        if levels is self.levels and len(levels) == self.num_levels:
+            return
+        self.levels = levels
+        self.num_levels = len(levels)
+        self.mask = getDebugMask(levels) | consts.DEBUG_BITS[consts.DEBUG.ERROR]
+
+    def isEnabled(self, level):
+        """Returns whether messages of a debug level will be printed
+
+        Args:
+            level (str): debug level (from consts.DEBUG)
+
+        Returns:
+            bool: whether the level is enabled
+        """
+        self.refresh()
+        return bool(self.mask & consts.DEBUG_BITS.get(level, 0))
+
+    def log(self, level, template, *args):
+        """Print a message if its debug level is enabled. Otherwise, count it as suppressed.
+
+        Args:
+            level (str): debug level (from consts.DEBUG)
+            template (str | function): message, which is formatted with args using str.format()
+                if any are given. If a function is given, it is called with args and should return
+                the message. Other objects (such as processorhelpers.EventDescription) are 
+                converted using str().
+            *args: values to format into the message
+        
+        Returns:
+            bool: whether the message was printed
+        """
+        if not self.isEnabled(level):
+            self.suppressed[level] = self.suppressed.get(level, 0) + 1
+            return False
+        
+        if callable(template):
+            message = template(*args)
+        elif len(args):
+            message = template.format(*args)
+        else:
+            message = str(template)
+        
+        # If there is no message, don't print anything
+        if len(message):
+            console.write(message)
+        return True
+
+    def getSuppressed(self, level=None):
+        """Returns the number of messages that weren't printed
+
+        Args:
+            level (str, optional): debug level to count. Defaults to None (all levels).
+
+        Returns:
+            int: number of messages
+        """
+        if level is None:
+            return sum(self.suppressed.values())
+        return self.suppressed.get(level, 0)
+
+    def resetCounters(self):
+        """Clear the counts of suppressed messages
+        """
+        self.suppressed.clear()
+
+    def getString(self):
+        """Returns a summary of suppressed messages
+
+        Returns:
+            str: summary
+        """
+        out = "Logging: " + str(self.getSuppressed()) + " messages suppressed"
+        for level, count in self.suppressed.items():
+            out += "\n" + getTab(" - " + level + ":", 2) + str(count)
+        return out
+
+
+class ConsoleSink:
+    """
+    ConsoleSink
+
+    Stores lines of output so that they are printed to FL Studio's Script output window on idle,
+    rather than while events are being processed. At most config.CONSOLE_LINES_PER_IDLE lines are
+    printed each time the sink is flushed, and a line that is written more than once in a row is
+    only stored once, with a count of repeats.
+
+    If more than config.CONSOLE_BUFFER_SIZE lines are waiting, config.CONSOLE_OVERFLOW_POLICY
+    decides whether to drop lines or print everything immediately. The number of dropped lines is
+    printed in their place.
+
+    Lines are printed immediately if config.CONSOLE_BUFFER_OUTPUT is disabled.
+    """
+    def __init__(self):
+        # Lines waiting to be printed, and the number of times each was written
+        self.lines = []
+        self.repeats = []
+        # Number of lines dropped since the last notice was printed
+        self.num_dropped = 0
+        self.resetCounters()
+
+    def resetCounters(self):
+        """Clear the counts of lines written, combined and dropped
+        """
+        self.num_written = 0
+        self.num_collapsed = 0
+        self.total_dropped = 0
+        self.max_depth = 0
+
+    def write(self, line):
+        """Add a line to be printed
+
+        Args:
+            line (str): line (or lines) of output
+        """
+        if not config.CONSOLE_BUFFER_OUTPUT:
+            print(line)
+            return
+        
+        self.num_written += 1
+        lines = self.lines
+        
+        # Combine repeated lines (but not blank lines, which are used for spacing)
+        if len(lines) and len(line) and lines[-1] == line:
+            self.repeats[-1] += 1
+            self.num_collapsed += 1
+            return
+        
+        if len(lines) >= config.CONSOLE_BUFFER_SIZE:
+            policy = config.CONSOLE_OVERFLOW_POLICY
+            if policy == consts.CONSOLE_OVERFLOW_DROP_NEWEST:
+                self.drop(1)
+                return
+            elif policy == consts.CONSOLE_OVERFLOW_PRINT:
+                self.flushAll()
+            else:
+                del lines[0]
+                del self.repeats[0]
+                self.drop(1)
+        
+        lines.append(line)
+        self.repeats.append(1)
+        if len(lines) > self.max_depth:
+            self.max_depth = len(lines)
+
+    def drop(self, num):
+        """Record that lines were dropped
+
+        Args:
+            num (int): number of lines
+        """
+        self.num_dropped += num
+        self.total_dropped += num
+
+    def takeDroppedNotice(self):
+        """Returns a line saying how many lines were dropped since this was last called
+
+        Returns:
+            str: notice
+        """
+        notice = "[" + str(self.num_dropped) + " lines of output dropped]"
+        self.num_dropped = 0
+        return notice
+
+    def flush(self, limit=None):
+        """Print waiting lines. Called on idle.
+
+        Args:
+            limit (int, optional): maximum number of lines to print. Defaults to 
+                config.CONSOLE_LINES_PER_IDLE.
+        """
+        if limit is None:
+            limit = config.CONSOLE_LINES_PER_IDLE
+        
+        lines = self.lines
+        repeats = self.repeats
+        num = min(limit, len(lines))
+        
+        # The notice of dropped lines is printed in the same place as the lines that were dropped
+        out = []
+        if self.num_dropped and config.CONSOLE_OVERFLOW_POLICY != consts.CONSOLE_OVERFLOW_DROP_NEWEST:
+            # Old lines were dropped before all of the lines that are waiting
+            out.append(self.takeDroppedNotice())
+        
+        for i in range(num):
+            if repeats[i] > 1:
+                out.append(lines[i] + " [x" + str(repeats[i]) + "]")
+            else:
+                out.append(lines[i])
+        del lines[:num]
+        del repeats[:num]
+        
+        # New lines were dropped after all of the lines that were waiting
+        if self.num_dropped and not len(lines):
+            out.append(self.takeDroppedNotice())
+        
+        if len(out):
+            print("\n".join(out))
+
+    def flushAll(self):
+        """Print all waiting lines (eg before the script is closed, or when it crashes)
+        """
+        self.flush(len(self.lines))
+
+    def getDepth(self):
+        """Returns the number of lines waiting to be printed
+
+        Returns:
+            int: number of lines
+        """
+        return len(self.lines)
+
+    def getString(self):
+        """Returns a summary of lines written
+
+        Returns:
+            str: summary
+        """
+        return "Console: " + str(self.num_written) + " lines written, " + str(self.num_collapsed) \
+            + " repeats combined, " + str(self.total_dropped) + " dropped (max waiting " \
+            + str(self.max_depth) + ")"
+
+
+def getDebugMask(levels):
+    """Returns the bitmask of a list of debug levels
+
+    Args:
+        levels (list of str): debug levels (from consts.DEBUG)
+
+    Returns:
+        int: bitmask (see consts.DEBUG_BITS)
+    """
+    mask = 0
+    for level in levels:
+        mask |= consts.DEBUG_BITS.get(level, 0)
+    return mask
+
+
+def log(level, template, *args):
+    """Print a message for debugging, but only if the debug mode includes the debug type specified.
+    The message is only formatted if it will be printed (see Logger.log()).
+
+    Args:
+        level (str): debug level (from consts.DEBUG)
+        template (str | function): message template, or function that returns the message
+        *args: values to format into the message
+
+    Returns:
+        bool: whether the message was printed
+    """
+    return logger.log(level, template, *args)
 
 
 def debugLog(message, level = 0):
     """Print a message for debugging, but only if the debug mode includes the debug type specified
 
     Args:
-        message (str): what to log
+        message (str): what to log. Objects that are expensive to format (such as 
+            processorhelpers.EventDescription) can be passed instead of a string, and are only
+            converted to a string if the message will be printed.
         level (int, optional): the message type. Should be in the form of consts.DEBUG_SOME_MODE. Defaults to 0.
     """
-    
-    # If there is no message, return straight away
-    if len(message) == 0:
-        return
-    
-    if level in config.CONSOLE_DEBUG_MODE or level == consts.DEBUG.ERROR:
-        print(message)
+    logger.log(level, message)
 
 
 def printCommand(command):
@@ -72,4 +343,7 @@ def printCommandOutput(command):
     debugLog(getLineBreak(), consts.DEBUG.EVENT_DATA)
     debugLog("", consts.DEBUG.EVENT_DATA)
 
+logger = Logger()
+console = ConsoleSink()
+
 import config
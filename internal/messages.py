@@ -6,12 +6,15 @@ This module contains functions to help sending messages to the device, and to ot
 Author: Miguel Guthridge [hdsq@outlook.com.au]
 """
 
+import time
+
 import device
 
 import config
 from . import consts
 
-from .logging import debugLog, getLineBreak
+from .logging import debugLog, log, getLineBreak, console
+from .journal import journal, JOURNAL_OUT, JOURNAL_OUT_BUFFER, JOURNAL_INTERNAL
 
 def sendMidiMessage(status, data1, data2):
     """Sends a MIDI message to the controller
@@ -47,9 +50,12 @@ def sendCompleteMidiMessage(message, str_event_out = ""):
         str_event_out (str, optional): What to print about the message. Defaults to "".
     """
     try:
-        debugLog("Dispatched external MIDI message " + str_event_out + " (" + str(message) + ")", consts.DEBUG.DISPATCH_EVENT)
+        log(consts.DEBUG.DISPATCH_EVENT, "Dispatched external MIDI message {} ({})", str_event_out, message)
         device.midiOutMsg(message)
+        journal.record(JOURNAL_OUT, message)
     except TypeError as e:
+        # Print after any output that is waiting
+        console.flushAll()
         print(getLineBreak())
         print('\n'.join([
             "An error occurred when attempting to communicate with the device.",
@@ -67,9 +73,13 @@ def sendCompleteInternalMidiMessage(message, str_event_out = ""):
         str_event_out (str, optional): What to print about the message. Defaults to "".
     """
     try:
-        debugLog("Dispatched internal MIDI message: " + str_event_out + " (" + str(message) + ")", consts.DEBUG.DISPATCH_EVENT)
+        log(consts.DEBUG.DISPATCH_EVENT, "Dispatched internal MIDI message: {} ({})", str_event_out, message)
+        # Recorded first, since the other script receives the message before dispatch() returns
+        journal.record(JOURNAL_INTERNAL, message)
         device.dispatch(0, message)
     except TypeError as e:
+        # Print after any output that is waiting
+        console.flushAll()
         print(getLineBreak())
         print('\n'.join([
             "An error occurred when attempting to communicate with the other script port.",
@@ -98,7 +108,10 @@ def sendUniversalDeviceEnquiry():
     """
     try:
         device.midiOutSysex(consts.DEVICE_ENQUIRY_MESSAGE)
+        journal.recordBuffer(JOURNAL_OUT_BUFFER, len(consts.DEVICE_ENQUIRY_MESSAGE))
     except TypeError as e:
+        # Print after any output that is waiting
+        console.flushAll()
         print(getLineBreak())
         print('\n'.join([
             "An error occurred when attempting to communicate with the device.",
@@ -106,3 +119,92 @@ def sendUniversalDeviceEnquiry():
             "then reload the script and try again."
             ]))
         raise e
+
+
+class InternalMessenger:
+    """
+    InternalMessenger
+
+    Sends messages to the other running script, skipping messages that wouldn't change anything:
+     - Idle tick resets are sent at most once every config.IDLE_RESET_MESSAGE_INTERVAL seconds,
+       since the other script only needs to know that the device is still in use
+     - State messages (eg shift down/up) are only sent if the state has changed since it was last
+       sent
+
+    Counts of messages sent and skipped are kept to show how much traffic is saved.
+    """
+    def __init__(self):
+        self.reset()
+        self.resetCounters()
+
+    def reset(self):
+        """Forget which messages have been sent, so that the next messages are always sent. Called 
+        when either script restarts, since the other script's state is unknown.
+        """
+        self.last_idle_reset = None
+        # (status + data1) -> last message sent
+        self.states = dict()
+
+    def resetCounters(self):
+        """Clear the counts of messages sent and skipped
+        """
+        self.num_sent = 0
+        self.num_idle_resets_saved = 0
+        self.num_states_saved = 0
+
+    def sendIdleReset(self):
+        """Tell the other script to reset its idle tick, unless it was told recently
+
+        Returns:
+            bool: whether the message was sent
+        """
+        now = time.perf_counter()
+        if self.last_idle_reset is not None and now - self.last_idle_reset < config.IDLE_RESET_MESSAGE_INTERVAL:
+            self.num_idle_resets_saved += 1
+            return False
+        self.last_idle_reset = now
+        self.num_sent += 1
+        sendCompleteInternalMidiMessage(consts.MESSAGE_RESET_INTERNAL_CONTROLLER, "Reset idle tick")
+        return True
+
+    def sendState(self, message, str_event_out=""):
+        """Send a state message to the other script, unless the same state was the last one sent.
+        Messages with the same status and data1 bytes are treated as setting the same state, with
+        data2 as its value.
+
+        Args:
+            message (int): MIDI message
+            str_event_out (str, optional): What to print about the message. Defaults to "".
+
+        Returns:
+            bool: whether the message was sent
+        """
+        key = message & 0xFFFF
+        if self.states.get(key) == message:
+            self.num_states_saved += 1
+            log(consts.DEBUG.DISPATCH_EVENT, "Skipped internal MIDI message: {} ({})", str_event_out, message)
+            return False
+        self.states[key] = message
+        self.num_sent += 1
+        sendCompleteInternalMidiMessage(message, str_event_out)
+        return True
+
+    def getSaved(self):
+        """Returns the number of messages that weren't sent
+
+        Returns:
+            int: number of messages saved
+        """
+        return self.num_idle_resets_saved + self.num_states_saved
+
+    def getString(self):
+        """Returns a summary of messages sent and skipped
+
+        Returns:
+            str: summary
+        """
+        return "Internal messages: " + str(self.num_sent) + " sent, " \
+            + str(self.getSaved()) + " saved (" + str(self.num_idle_resets_saved) + " idle resets, " \
+            + str(self.num_states_saved) + " states)"
+
+messenger = InternalMessenger()
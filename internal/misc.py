@@ -14,17 +14,20 @@ import lightingconsts
 from . import consts
 import eventconsts
 
-from .performance import idleClock
-from .logging import getLineBreak, debugLog, getTab
+from .performance import idleClock, flushAll
+from .logging import getLineBreak, debugLog, log, getTab, console
 from . import state
 from .snap import snap
+from .hostapi import names
 
 import controllerprocessors
+import processorhelpers
 
 def refreshProcessor():
     """Called on refresh
     """
     snap.refresh()
+    names.clear()
 
 def idleProcessor():
     """Called on idle
@@ -35,19 +38,25 @@ def idleProcessor():
     # Increment animation tick
     window.incrementTicks()
 
-    debugLog(getTab("Animation Tick:", 2) + str(window.getAnimationTick()), consts.DEBUG.ANIMATION_IDLE_TIMERS)
-    debugLog(getTab("Idle Tick:", 2) + str(window.getIdleTick()), consts.DEBUG.ANIMATION_IDLE_TIMERS)
+    log(consts.DEBUG.ANIMATION_IDLE_TIMERS, getTab("Animation Tick:", 2) + "{}", window.getAnimationTick())
+    log(consts.DEBUG.ANIMATION_IDLE_TIMERS, getTab("Idle Tick:", 2) + "{}", window.getIdleTick())
     debugLog("", consts.DEBUG.ANIMATION_IDLE_TIMERS)
 
     try:
         # Update active window
         window.update()
+        
+        # Fire long presses of controls that are still held
+        processorhelpers.gestures.tick()
     except Exception as e:
         state.errors.triggerError(e)
 
     # Stop performance timer
     idleClock.stop()
 
+    # Record stage times of events processed since the last idle
+    flushAll()
+
 
 class BeatMgr:
     """Manages beat numbers and lighting redraws for this
@@ -102,19 +111,22 @@ def processSysEx(event):
             state.DEVICE_TYPE = consts.DEVICE_KEYS_61
         else:
             state.DEVICE_TYPE = consts.DEVICE_UNRECOGNISED
-            print("If you're seeing this, create an issue on GitHub. ")
-            print("Make sure to tell me your device info, and include a copy of the Syxex Event below.")
-            print("Link to GitHub Page: " + consts.SCRIPT_URL)
+            console.write("If you're seeing this, create an issue on GitHub. ")
+            console.write("Make sure to tell me your device info, and include a copy of the Syxex Event below.")
+            console.write("Link to GitHub Page: " + consts.SCRIPT_URL)
 
         controllerprocessors.onInit()
         
     else:
         state.DEVICE_TYPE = consts.DEVICE_UNRECOGNISED
-        print("ERROR - DEVICE NOT RECOGNISED")
-        
+        console.write("ERROR - DEVICE NOT RECOGNISED")
+    
+    # Rebuild event lookup table for new device type
+    processorhelpers.eventTable.build()
+    processorhelpers.invalidateRoutes()
 
     getLineBreak()
     getLineBreak()
-    print("")
+    console.write("")
 
 from .windowstate import window
@@ -8,8 +8,9 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 
 from . import consts
 import channels
+import processorhelpers
 
-from internal.logging import debugLog
+from internal.logging import log
 
 class NoteModeState:
     """Manages state of current note mode
@@ -30,9 +31,12 @@ class NoteModeState:
         Args:
             newState (str): New note mode
         """
-        debugLog("Set note mode state to " + newState, consts.DEBUG.NOTE_MODE)
+        log(consts.DEBUG.NOTE_MODE, "Set note mode state to {}", newState)
         # Add some checks to ensure not setting into a bad state
         self.current_state = newState
+        
+        # Note processor has changed
+        processorhelpers.invalidateRoutes()
 
 noteMode = NoteModeState()
 
@@ -7,33 +7,67 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 """
 
 import time
+import math
+import array
 
 from . import consts
 import config
 
-from .logging import getLineBreak
+from .logging import getLineBreak, getTab, logger, console
+
+# Histogram buckets split each doubling of time (octave) into 4 equal parts. Bucket numbers are
+# found from the exponent and mantissa of times (math.frexp), without needing any logarithms.
+# Binary exponent of the shortest time recorded (about 1 microsecond)
+BUCKET_MIN_EXPONENT = -19
+# Number of buckets (the first and last buckets also hold any shorter or longer times)
+NUM_BUCKETS = 25 * 4
+
+# Upper bound of each bucket
+BUCKET_BOUNDS = [2 ** (BUCKET_MIN_EXPONENT + i // 4) * (5 + i % 4) / 8 for i in range(NUM_BUCKETS)]
+
+# Added to bucket numbers calculated from exponents and mantissas so that the first bucket is 0
+BUCKET_OFFSET = -4 * BUCKET_MIN_EXPONENT - 4
+
+# Percentiles included in snapshots
+PERCENTILES = [50, 95, 99]
+
+# Maximum number of lap times stored before they are added to the histogram
+MAX_PENDING = 1024
 
 class PerformanceMontor:
     """
     PerformanceMonitor
-    
-    This object tracks performance times for certain actions to complete.
+
+    This object tracks performance times for certain actions to complete. Times are recorded in a
+    histogram with fixed buckets, so that percentiles can be found without storing every time.
+    Lap times are stored and only added to the histogram when flush() is called (on idle), to 
+    keep timing overhead low while events are being processed.
     """
     def __init__(self, monitor_name, debug_level):
 
         self.name = monitor_name
         self.debug_level = debug_level
 
-        self.total_time = 0
         self.startTime = -1
         self.endTime = -1
+        self.reset()
+
+        monitors.append(self)
+
+    def reset(self):
+        """Clear all recorded times
+        """
+        self.total_time = 0
+        self.max_time = 0
         self.num_events = 0
-    
+        self.buckets = array.array('L', [0]) * NUM_BUCKETS
+        self.pending = array.array('d')
+
     def start(self):
         """Start monitoring performance
         """
         self.startTime = time.perf_counter()
-    
+
     def stop(self):
         """Stop monitoring performance
 
@@ -42,16 +76,61 @@ class PerformanceMontor:
         """
         self.endTime = time.perf_counter()
         process_time = self.endTime - self.startTime
+        self.record(process_time)
+
+        # Print a summary every so often, rather than every time
+        if logger.isEnabled(self.debug_level) and self.num_events % consts.PERFORMANCE_REPORT_INTERVAL == 0:
+            console.write(self.getString())
+        return process_time
+
+    def lap(self, start_time):
+        """Record the time taken since start_time. Used to time stages of a process without
+        calling start() and stop() for each of them.
+
+        Args:
+            start_time (float): time that the stage started (from time.perf_counter())
+
+        Returns:
+            float: current time, which can be used as the start time of the next stage
+        """
+        now = time.perf_counter()
+        self.pending.append(now - start_time)
+        if len(self.pending) >= MAX_PENDING:
+            self.flush()
+        return now
+
+    def flush(self):
+        """Add stored lap times to the histogram
+        """
+        if not len(self.pending):
+            return
+        
+        # Same as getBucket(), inlined since this is called for every lap
+        buckets = self.buckets
+        frexp = math.frexp
+        last = NUM_BUCKETS - 1
+        for process_time in self.pending:
+            mantissa, exponent = frexp(process_time)
+            index = 4 * exponent + int(mantissa * 8) + BUCKET_OFFSET
+            buckets[0 if index < 0 else (index if index < last else last)] += 1
+        
+        self.total_time += sum(self.pending)
+        self.max_time = max(self.max_time, max(self.pending))
+        self.num_events += len(self.pending)
+        del self.pending[:]
+
+    def record(self, process_time):
+        """Add a processing time to the histogram
+
+        Args:
+            process_time (float): time taken (seconds)
+        """
         self.total_time += process_time
         self.num_events += 1
-        if self.debug_level in config.CONSOLE_DEBUG_MODE:
-            print(getLineBreak())
-            print(self.name)
-            print("Processed in:", round(process_time, 4), "seconds")
-            print("Average processing time:", round(self.total() / self.num_events, 4), "seconds")
-            print(getLineBreak())
-        return process_time
-    
+        if process_time > self.max_time:
+            self.max_time = process_time
+        self.buckets[getBucket(process_time)] += 1
+
     def total(self):
         """Get total processing time
 
@@ -60,6 +139,261 @@ class PerformanceMontor:
         """
         return self.total_time
 
+    def mean(self):
+        """Get mean processing time
+
+        Returns:
+            float: mean processing time
+        """
+        if self.num_events == 0:
+            return 0
+        return self.total_time / self.num_events
+
+    def percentile(self, percent):
+        """Get a percentile of processing times. This is the upper bound of the histogram bucket
+        containing the percentile, so is accurate to within one bucket.
+
+        Args:
+            percent (float): percentile to find (0-100)
+
+        Returns:
+            float: processing time
+        """
+        self.flush()
+        if self.num_events == 0:
+            return 0
+
+        target = self.num_events * percent / 100
+        count = 0
+        for i in range(NUM_BUCKETS):
+            count += self.buckets[i]
+            if count >= target:
+                return min(BUCKET_BOUNDS[i], self.max_time)
+        return self.max_time
+
+    def getSnapshot(self):
+        """Returns a summary of recorded times
+
+        Returns:
+            dict: number of events, mean, percentiles (eg "p95") and max time
+        """
+        self.flush()
+        snapshot = {
+            "count": self.num_events,
+            "mean": self.mean()
+        }
+        for percent in PERCENTILES:
+            snapshot["p" + str(percent)] = self.percentile(percent)
+        snapshot["max"] = self.max_time
+        return snapshot
+
+    def getString(self):
+        """Returns a one-line summary of recorded times
+
+        Returns:
+            str: summary, with times in milliseconds
+        """
+        out = getTab(self.name + ":", 2)
+        for key, value in self.getSnapshot().items():
+            if key == "count":
+                out += getTab("n " + str(value))
+            else:
+                out += getTab(key + " " + str(round(value * 1000, 3)))
+        return out
+
+class FrameScheduler:
+    """
+    FrameScheduler
+
+    Decides which idle ticks lighting frames are drawn on, so that the frame rate doesn't depend on
+    how often FL Studio calls OnIdle, and so that redraws don't crowd out event processing:
+     - Frames are drawn at most config.LIGHTS_TARGET_FPS times per second
+     - If a frame takes longer than config.LIGHTS_FRAME_BUDGET, following frames are skipped until
+       the extra time has been made up (each skipped frame makes up one budget)
+    If config.LIGHTS_TARGET_FPS is 0, a frame is drawn on every idle tick.
+    """
+    def __init__(self):
+        self.next_frame = None
+        self.frame_start = 0.0
+        self.debt = 0.0
+        self.reset()
+
+    def reset(self):
+        """Clear frame counts
+        """
+        self.num_frames = 0
+        self.num_skipped_rate = 0
+        self.num_skipped_load = 0
+
+    def startFrame(self):
+        """Called on idle. Returns whether a frame should be drawn, and if so starts timing it.
+
+        Returns:
+            bool: whether to draw a frame (if so, call endFrame() once it is drawn)
+        """
+        now = time.perf_counter()
+        
+        if config.LIGHTS_TARGET_FPS > 0:
+            period = 1 / config.LIGHTS_TARGET_FPS
+            if self.next_frame is not None and now < self.next_frame:
+                self.num_skipped_rate += 1
+                return False
+            # Frames are scheduled at even intervals, unless they have fallen behind
+            if self.next_frame is None or now - self.next_frame > period:
+                self.next_frame = now + period
+            else:
+                self.next_frame += period
+
+            if self.debt > 0:
+                self.debt -= config.LIGHTS_FRAME_BUDGET
+                self.num_skipped_load += 1
+                return False
+        
+        if self.num_frames:
+            frameIntervalClock.record(now - self.frame_start)
+        self.frame_start = now
+        return True
+
+    def endFrame(self):
+        """Called once a frame has been drawn
+        """
+        frame_time = time.perf_counter() - self.frame_start
+        frameClock.record(frame_time)
+        self.num_frames += 1
+        if config.LIGHTS_TARGET_FPS > 0 and frame_time > config.LIGHTS_FRAME_BUDGET:
+            self.debt += frame_time - config.LIGHTS_FRAME_BUDGET
+
+    def getString(self):
+        """Returns a summary of frames drawn and skipped
+
+        Returns:
+            str: summary
+        """
+        return "Frames: " + str(self.num_frames) + " drawn, " + str(self.num_skipped_rate) \
+            + " skipped (frame rate), " + str(self.num_skipped_load) + " skipped (load)"
+
+def getBucket(process_time):
+    """Returns the histogram bucket for a time
+
+    Args:
+        process_time (float): time (seconds)
+
+    Returns:
+        int: bucket number
+    """
+    mantissa, exponent = math.frexp(process_time)
+    index = 4 * exponent + int(mantissa * 8) + BUCKET_OFFSET
+    if index < 0:
+        return 0
+    if index >= NUM_BUCKETS:
+        return NUM_BUCKETS - 1
+    return index
+
+# List of all performance monitors
+monitors = []
+
+def getSnapshot():
+    """Returns a summary of times recorded by all performance monitors
+
+    Returns:
+        dict: name of monitor -> summary (see PerformanceMontor.getSnapshot())
+    """
+    return {monitor.name: monitor.getSnapshot() for monitor in monitors}
+
+def getSnapshotString():
+    """Returns a table of times recorded by all performance monitors
+
+    Returns:
+        str: performance summary
+    """
+    out = getLineBreak() + "\n"
+    out += "Performance (times in ms):\n"
+    for monitor in monitors:
+        out += monitor.getString() + "\n"
+    out += frames.getString() + "\n"
+    out += getLineBreak()
+    return out
+
+def printSnapshot():
+    """Print times recorded by all performance monitors (through the console, so that it appears
+    after output that is waiting to be printed)
+    """
+    console.write(getSnapshotString())
+
+def exportSnapshot(filename=consts.PERFORMANCE_EXPORT_FILE):
+    """Write times recorded by all performance monitors to a file, as comma-separated values
+
+    Args:
+        filename (str, optional): File to write to. Relative paths are relative to the script
+            directory. Defaults to consts.PERFORMANCE_EXPORT_FILE.
+
+    Returns:
+        str: path of file written
+    """
+    filename = getScriptPath(filename)
+
+    keys = ["count", "mean"] + ["p" + str(percent) for percent in PERCENTILES] + ["max"]
+    with open(filename, "w") as f:
+        f.write("stage," + ",".join(keys) + "\n")
+        for name, snapshot in getSnapshot().items():
+            f.write(name + "," + ",".join(str(snapshot[key]) for key in keys) + "\n")
+    return filename
+
+def flushAll():
+    """Add stored lap times to the histograms of all performance monitors. Called on idle.
+    """
+    for monitor in monitors:
+        monitor.flush()
+
+def resetAll():
+    """Clear times recorded by all performance monitors
+    """
+    for monitor in monitors:
+        monitor.reset()
+    frames.reset()
+
+def getScriptPath(filename):
+    """Returns the path of a file, treating relative paths as relative to the script directory
+
+    Args:
+        filename (str): file name or path
+
+    Returns:
+        str: path
+    """
+    if filename.startswith("/") or filename.startswith("\\") or ":" in filename:
+        return filename
+    return getScriptDirectory() + filename
+
+def getScriptDirectory():
+    """Returns the directory containing the script files
+
+    Returns:
+        str: path, ending with a separator
+    """
+    # This file is in the internal folder
+    path = __file__.replace("\\", "/")
+    return path[:path.rfind("/", 0, path.rfind("/")) + 1]
+
 # Create instances of performance counters
 eventClock = PerformanceMontor("Event Processor", consts.DEBUG.PROCESSOR_PERFORMANCE)
 idleClock = PerformanceMontor("Idle Processor", consts.DEBUG.IDLE_PERFORMANCE)
+
+# Stages of event processing (see eventprocessor.py)
+controllerClock = PerformanceMontor("Controller stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+shiftClock = PerformanceMontor("Shift stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+firstClock = PerformanceMontor("First stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+shiftProcessClock = PerformanceMontor("Shift menu stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+noteClock = PerformanceMontor("Note stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+pluginClock = PerformanceMontor("Plugin stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+windowClock = PerformanceMontor("Window stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+defaultClock = PerformanceMontor("Default stage", consts.DEBUG.PROCESSOR_PERFORMANCE)
+redrawClock = PerformanceMontor("Redraw", consts.DEBUG.IDLE_PERFORMANCE)
+
+# Lighting frames (see FrameScheduler)
+frameClock = PerformanceMontor("Frame time", consts.DEBUG.IDLE_PERFORMANCE)
+frameIntervalClock = PerformanceMontor("Frame interval", consts.DEBUG.IDLE_PERFORMANCE)
+frames = FrameScheduler()
+
+# Time between writes to FL Studio being queued and applied (see hostapi.py)
+hostWriteClock = PerformanceMontor("Host write latency", consts.DEBUG.IDLE_PERFORMANCE)
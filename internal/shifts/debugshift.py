@@ -17,7 +17,13 @@ import eventconsts
 from .. import consts
 import lightingconsts
 from lighting import triggerIdleLightshow
+import processorhelpers
 from ..state import extendedMode, enterDebugMode
+from .. import performance
+from ..messages import messenger
+from ..hostapi import hostWrites, names
+from ..logging import logger, console
+from ..journal import journal
 
 # Ticks until menu is drawn/handled
 ENABLE_AFTER = 10
@@ -69,6 +75,30 @@ class DebugShift(ShiftState):
                         self.use()
                         command.handle("Trigger lightshow")
 
+                    elif command.note == eventconsts.Pads[3][0]:
+                        performance.printSnapshot()
+                        console.write(messenger.getString())
+                        console.write(processorhelpers.controlCoalescer.getString())
+                        console.write(hostWrites.getString())
+                        console.write(names.getString())
+                        console.write(processorhelpers.redrawCache.getString())
+                        console.write(lightingconsts.colours.getString())
+                        console.write(logger.getString())
+                        console.write(console.getString())
+                        console.write(journal.getString())
+                        self.use()
+                        command.handle("Print performance snapshot")
+
+                    elif command.note == eventconsts.Pads[4][0]:
+                        filename = performance.exportSnapshot()
+                        self.use()
+                        command.handle("Export performance snapshot to " + filename)
+
+                    elif command.note == eventconsts.Pads[5][0]:
+                        filename = journal.dump()
+                        self.use()
+                        command.handle("Save MIDI journal to " + filename)
+
                     else:
                         command.handle("Shift menu catch others")
 
@@ -100,6 +130,13 @@ class DebugShift(ShiftState):
             # Light show
             lights.setPadColour(2, 0, lightingconsts.colours["GREEN"])
 
+            # Performance snapshot (print, export to file)
+            lights.setPadColour(3, 0, lightingconsts.colours["LIGHT BLUE"])
+            lights.setPadColour(4, 0, lightingconsts.colours["BLUE"])
+
+            # Save MIDI journal
+            lights.setPadColour(5, 0, lightingconsts.colours["PURPLE"])
+
             lights.solidifyAll()
 
     def onPress(self):
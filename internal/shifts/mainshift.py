@@ -18,7 +18,7 @@ import lightingconsts
 from ..snap import snap
 from ..windowstate import window
 from ..state import extendedMode, pitchBend, getPortExtended
-from ..messages import sendCompleteInternalMidiMessage, debugLog
+from ..messages import sendCompleteInternalMidiMessage, messenger, debugLog
 
 
 class MainShift(ShiftState):
@@ -217,7 +217,7 @@ class MainShift(ShiftState):
         if getPortExtended():
             extendedMode.setVal(True, eventconsts.INCONTROL_PADS)
             extendedMode.setVal(True, eventconsts.INCONTROL_FADERS)
-            sendCompleteInternalMidiMessage(consts.MESSAGE_SHIFT_DOWN)
+            messenger.sendState(consts.MESSAGE_SHIFT_DOWN, "Shift down")
         
     def onLift(self):
         """When shift button lifted
@@ -225,6 +225,6 @@ class MainShift(ShiftState):
         if getPortExtended():
             extendedMode.revert(eventconsts.INCONTROL_PADS)
             extendedMode.revert(eventconsts.INCONTROL_FADERS)
-            sendCompleteInternalMidiMessage(consts.MESSAGE_SHIFT_UP)
+            messenger.sendState(consts.MESSAGE_SHIFT_UP, "Shift up")
             
             
\ No newline at end of file
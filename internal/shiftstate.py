@@ -8,7 +8,7 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 """
 
 import config
-from .messages import debugLog
+from .logging import log
 from . import consts
 from .windowstate import window
 
@@ -56,18 +56,18 @@ class ShiftState:
                 if command.is_double_click and self.enable_sustain and config.ENABLE_SUSTAINED_SHIFT:
                     self.is_sustained = True
                     command.act("Enter sustained shift")
-                    debugLog("Enter sustained shift: " + self.name, consts.DEBUG.SHIFT_EVENTS)
+                    log(consts.DEBUG.SHIFT_EVENTS, "Enter sustained shift: {}", self.name)
                     return 1
                 else:
                     if self.is_sustained:
                         self.is_sustained = False
-                        debugLog("Exit sustained shift: " + self.name, consts.DEBUG.SHIFT_EVENTS)
+                        log(consts.DEBUG.SHIFT_EVENTS, "Exit sustained shift: {}", self.name)
                         self.onLift()
                         window.resetAnimationTick()
                         command.handle("Exit sustained shift")
                     else:
                         self.onLift()
-                        debugLog("Exit shift menu " + self.name, consts.DEBUG.SHIFT_EVENTS)
+                        log(consts.DEBUG.SHIFT_EVENTS, "Exit shift menu {}", self.name)
                         if self.is_used:
                             command.handle("Exit shift menu")
                             window.resetAnimationTick()
@@ -84,7 +84,7 @@ class ShiftState:
             if not self.is_sustained:
                 window.resetAnimationTick()
                 self.onPress()
-                debugLog("Enter shift menu " + self.name,consts.DEBUG.SHIFT_EVENTS)
+                log(consts.DEBUG.SHIFT_EVENTS, "Enter shift menu {}", self.name)
                 command.act("Enter shift menu")
                 
                 
@@ -99,12 +99,12 @@ class ShiftState:
         self.onUse()
         if self.is_down:
             self.is_used = True
-            debugLog("Use shift: " + self.name, consts.DEBUG.SHIFT_EVENTS)
+            log(consts.DEBUG.SHIFT_EVENTS, "Use shift: {}", self.name)
             return True
         elif self.is_sustained:
-            debugLog("Use sustained shift: " + self.name, consts.DEBUG.SHIFT_EVENTS)
+            log(consts.DEBUG.SHIFT_EVENTS, "Use sustained shift: {}", self.name)
             if config.AUTOCANCEL_SUSTAINED_SHIFT:
-                debugLog("Exit sustained shift: " + self.name, consts.DEBUG.SHIFT_EVENTS)
+                log(consts.DEBUG.SHIFT_EVENTS, "Exit sustained shift: {}", self.name)
                 self.is_sustained = False
                 self.onLift()
             else:
@@ -159,6 +159,12 @@ class ShiftState:
         """Called when the shift button is used
         """
         pass
+    
+    def onLongPress(self):
+        """Called when the shift button has been held down for a long press, while it is still 
+        held
+        """
+        pass
         
 class ShiftsMgr:
     """Manages multiple shift menus
@@ -213,6 +219,19 @@ class ShiftsMgr:
                     # Ignore it
                     continue
     
+    def processLongPress(self, id_val):
+        """Called when a control has been held down for a long press (see 
+        processorhelpers.GestureTracker). Passed to the active shift menu if it is its button.
+
+        Args:
+            id_val (int): Event ID of the control
+        """
+        if self.current_down != "":
+            menu = self.menus[self.current_down]
+            if menu.id_listen == id_val and menu.is_down:
+                log(consts.DEBUG.SHIFT_EVENTS, "Long press shift: {}", menu.name)
+                menu.onLongPress()
+    
     def setDown(self, name, value):
         
         if name in self.menus:
@@ -272,3 +291,7 @@ from .shifts.recordshift import RecordShift
 shifts.addShift(MainShift, "MAIN")
 shifts.addShift(DebugShift, "DEBUG")
 shifts.addShift(RecordShift, "RECORD")
+
+# Shift menus react to their buttons being held
+import processorhelpers
+processorhelpers.gestures.addLongPressListener(shifts.processLongPress)
@@ -12,7 +12,7 @@ import device
 import ui
 import general
 
-from .logging import getLineBreak, debugLog
+from .logging import getLineBreak, debugLog, console
 from .notemanager import noteMode
 
 import config
@@ -126,11 +126,15 @@ def sharedInit():
 
     # Refresh snap mode
     snap.refresh()
+    
+    lightingconsts.colours.setPerceptual(config.LIGHTS_PERCEPTUAL_COLOURS)
 
     PORT = device.getPortNumber()
+    journal.setPort(PORT)
 
     sendUniversalDeviceEnquiry()
     
+    messenger.reset()
     sendCompleteInternalMidiMessage(consts.MESSAGE_RESTART_DEVICE)
 
     print(getLineBreak())
@@ -426,7 +430,7 @@ class ErrorState:
                 pass
 
         # Print error message
-        self.printError(False, e)
+        self.printError(False, e, self.dumpJournal())
 
         if config.DEBUG_HARD_CRASHING:
             raise e
@@ -451,7 +455,7 @@ class ErrorState:
             except:
                 pass
             
-        self.printError(True)
+        self.printError(True, journal_file=self.dumpJournal())
 
     def getError(self):
         """Gets whether the script is in an error state
@@ -476,35 +480,55 @@ class ErrorState:
             lights.setPadColour(8, 1, lightingconsts.colours["GREEN"])
         lights.solidifyAll()
 
-    def printError(self, fromOther, error:Exception=None):
+    def dumpJournal(self):
+        """Save recent MIDI messages to a file, so that what happened before an error can be
+        looked into
+
+        Returns:
+            str: path of file, or None if it couldn't be saved
+        """
+        try:
+            return journal.dump()
+        except Exception:
+            return None
+
+    def printError(self, fromOther, error:Exception=None, journal_file=None):
         """Print an error message
 
         Args:
             fromOther (bool): whether the error occurred on the other script
             error (str, optional): The error message. Defaults to "".
+            journal_file (str, optional): File that recent MIDI messages were saved to. Defaults
+                to None.
         """
-        print("")
-        print("")
-        print(getLineBreak())
-        print(getLineBreak())
-        print("Unfortunately, an error occurred, and the script has crashed.")
+        lines = [
+            "",
+            "",
+            getLineBreak(),
+            getLineBreak(),
+            "Unfortunately, an error occurred, and the script has crashed."
+        ]
         if config.DEBUG_HARD_CRASHING:
             if fromOther:
-                print("Please refer to the other script output for the error info and instructions to report the error, ", end="")
+                lines.append("Please refer to the other script output for the error info and instructions to report the error, "
+                             + "then restart both scripts by clicking `Reload script` in the Script output window.")
             else:
-                print("Please save a copy of this output to a text file, and create an issue on the project's GitHub page:")
-                print("          " + consts.SCRIPT_URL)
-            print("then restart both scripts by clicking `Reload script` in the Script output window.")
+                lines.append("Please save a copy of this output to a text file, and create an issue on the project's GitHub page:")
+                lines.append("          " + consts.SCRIPT_URL)
+                lines.append("then restart both scripts by clicking `Reload script` in the Script output window.")
         else:
-            print("Please restart the script by pressing the green pad, or restart the script with debugging enabled ", end="")
-            print("by pressing the orange pad. If possible, try to recreate the issue with debugging enabled.")
+            lines.append("Please restart the script by pressing the green pad, or restart the script with debugging enabled "
+                         + "by pressing the orange pad. If possible, try to recreate the issue with debugging enabled.")
         if error is not None:
-            print(getLineBreak())
-            print("Error code: " + str(type(error)) + " ", error.args)
-        print(getLineBreak())
-        print(getLineBreak())
-        print("")
-        print("")
+            lines.append(getLineBreak())
+            lines.append("Error code: " + str(type(error)) + "  " + str(error.args))
+        if journal_file is not None:
+            lines.append("Recent MIDI messages were saved to: " + journal_file)
+        lines.extend([getLineBreak(), getLineBreak(), "", ""])
+        
+        # Print straight away (after any output that is waiting), since the script may stop
+        console.write("\n".join(lines))
+        console.flushAll()
 
     def recoverError(self, enter_debug, received=False):
         """Dismiss an error, and set the device back into its normal state
@@ -533,9 +557,9 @@ class ErrorState:
         
         #config.DEBUG_HARD_CRASHING = True
             
-        print(getLineBreak())
-        print("Error dismissed")
-        print(getLineBreak())
+        console.write(getLineBreak())
+        console.write("Error dismissed")
+        console.write(getLineBreak())
     
     def eventProcessError(self, command):
         """Handles extended mode events when in an error state
@@ -559,6 +583,7 @@ def enterDebugMode():
 def restartDevice():
     """Reset a bunch of components from the script
     """
+    messenger.reset()
     noteMode.setState(consts.NOTE_STATE_NORMAL)
     
     setDefaultExtended()
@@ -569,7 +594,8 @@ def restartDevice():
         else:
             errors.recoverError(False, True)
 
-from .messages import sendUniversalDeviceEnquiry, sendCompleteInternalMidiMessage, sendMidiMessage
+from .messages import sendUniversalDeviceEnquiry, sendCompleteInternalMidiMessage, sendMidiMessage, messenger
+from .journal import journal
 
 from .windowstate import window
 
@@ -16,8 +16,10 @@ import eventprocessor
 
 import windowprocessors
 import pluginprocessors
+import processorhelpers
 
-from .logging import debugLog, getLineBreak
+from .logging import debugLog, log, getLineBreak
+from .hostapi import names
 
 
 class WindowMgr:
@@ -40,6 +42,7 @@ class WindowMgr:
         """
         debugLog("Reset animation timer", consts.DEBUG.LIGHTING_RESET)
         self.animation_tick_number = 0
+        processorhelpers.redrawCache.invalidate()
 
     
     def resetIdleTick(self):
@@ -159,9 +162,10 @@ class WindowMgr:
             # Set active window
             self.active_fl_window = new_fl_window
             self.plugin_focused =  False
+            windowprocessors.updateActive()
 
-            debugLog("Active Window: " + getFlWindowString(self.active_fl_window), consts.DEBUG.WINDOW_CHANGES)
-            debugLog("[Background: " + self.active_plugin + "]", consts.DEBUG.WINDOW_CHANGES)
+            log(consts.DEBUG.WINDOW_CHANGES, lambda: "Active Window: " + getFlWindowString(self.active_fl_window))
+            log(consts.DEBUG.WINDOW_CHANGES, "[Background: {}]", self.active_plugin)
             debugLog(getLineBreak())
 
             # Start new window
@@ -208,9 +212,13 @@ class WindowMgr:
                 self.plugin_focused = True
                 self.active_plugin = new_plugin
                 self.active_plugin_index = channels.selectedChannel()
+                pluginprocessors.updateActive()
+                
+                # Parameter names may belong to a plugin that has been replaced
+                names.clear()
 
-                debugLog("Active Window: " + self.active_plugin, consts.DEBUG.WINDOW_CHANGES)
-                debugLog("[Background: " + getFlWindowString(self.active_fl_window) + "]", consts.DEBUG.WINDOW_CHANGES)
+                log(consts.DEBUG.WINDOW_CHANGES, "Active Window: {}", self.active_plugin)
+                log(consts.DEBUG.WINDOW_CHANGES, lambda: "[Background: " + getFlWindowString(self.active_fl_window) + "]")
                 debugLog(getLineBreak(), consts.DEBUG.WINDOW_CHANGES)
 
                 # Start new plugin
@@ -246,6 +254,7 @@ class WindowMgr:
         """
         self.active_plugin = self.previous_plugin
         self.previous_plugin = ""
+        pluginprocessors.updateActive()
     
     def getPluginName(self):
         """Returns the name of the currently active plugin
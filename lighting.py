@@ -16,6 +16,7 @@ IDLE_ANIMATION_TRAIL_INFREQUENCY = 37
 IDLE_ANIMATION_TRAIL_Y_OFFSET = 13
 
 import time
+import array
 
 import internal
 import eventconsts
@@ -26,12 +27,41 @@ import config
 import lightingconsts
 
 
+# Number of pads (including round pads), and number of pads excluding the round pads. Pad (x, y)
+# is stored at index x * 2 + y of frame buffers
+NUM_PADS = 9 * 2
+NUM_SQUARE_PADS = 8 * 2
+
+# Used to clear frame buffers without allocating anything
+BLANK_FRAME = bytes(NUM_PADS)
+SOLID_FRAME = bytes([1]) * NUM_SQUARE_PADS
+BLANK_COLOURS = array.array('b', BLANK_FRAME)
+
+# Kinds of message stored for each pad in the lighting encoder (see Lights.buildEncoder())
+ENCODER_OFF = 0
+ENCODER_ON = 1
+ENCODER_PULSE = 2
+ENCODER_FLASH = 3
+ENCODER_KINDS = 4
+
 class LightMap:
     """This object is sent through event processors to gather colours for UI redraws.
+    
+    Colours, states and frozen flags are stored in flat buffers (one byte per pad, with pad (x, y)
+    at index x * 2 + y), which are cleared in place so that redraws don't allocate anything.
     """
     def __init__(self):
         """Create instance
         """
+        # 0 = unfrozen, 1 = frozen
+        self.frozen = bytearray(NUM_PADS)
+
+        # 0 = off, 1-127 = colour (signed since -1 is used for transparent)
+        self.colours = array.array('b', BLANK_FRAME)
+
+        # 0 = off, 1-127 = flash with that colour, negative = lightingconsts.MODE_...
+        self.states = array.array('b', BLANK_FRAME)
+        
         self.reset()
     
       
@@ -41,44 +71,9 @@ class LightMap:
         # indicates whether entire map is solidified
         self.is_solid = False
         
-        # 0 = unfrozen, 1 = frozen
-        self.FrozenMap = [
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0]
-            ]
-
-        # 0 = off, 1-127 = colour
-        self.PadColours = [
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0]
-            ]
-
-        # 0 = off, 1 = on, 2 = pulse, negative = flash
-        self.PadStates = [
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0]
-            ]
+        self.frozen[:] = BLANK_FRAME
+        self.colours[:] = BLANK_COLOURS
+        self.states[:] = BLANK_COLOURS
 
 
     def setPadColour(self, x, y, colour, state = lightingconsts.MODE_DEFAULT, override = False):
@@ -99,11 +94,12 @@ class LightMap:
         Returns:
             bool: Whether the assignment was successful.
         """
-        if self.FrozenMap[x][y] == 0 or override: # If pad available to map
-            self.PadColours[x][y] = colour
-            self.PadStates[x][y] = state
+        index = x * 2 + y
+        if self.frozen[index] == 0 or override: # If pad available to map
+            self.colours[index] = colour
+            self.states[index] = state
             if colour != -1:
-                self.solidifyPad(x, y)
+                self.frozen[index] = 1
             return True
         else: return False
     
@@ -121,10 +117,9 @@ class LightMap:
                 - 3 = automatic
             override (bool, optional): Whether to override the current pad option. Defaults to False.
         """
-        for x in range(len(self.FrozenMap) - 1): # Don't modify round pads
-            for y in range(len(self.FrozenMap[x])):
-                if self.FrozenMap[x][y] == 0 or override:
-                    self.setPadColour(x, y, map[x][y], state, override)
+        for x in range(8): # Don't modify round pads
+            for y in range(2):
+                self.setPadColour(x, y, map[x][y], state, override)
         return
 
 
@@ -135,8 +130,7 @@ class LightMap:
             x (int): X coordinate
             y (int): Y coordinate
         """
-        if self.FrozenMap[x][y] == 0: # If pad available to map
-            self.FrozenMap[x][y] = 1
+        self.frozen[x * 2 + y] = 1
     
     
     def solidifyRow(self, y):
@@ -145,8 +139,8 @@ class LightMap:
         Args:
             y (int): Y coordinate
         """
-        for x in range(len(self.FrozenMap) - 1): # Don't solidify round pads
-            if self.FrozenMap[x][y] == 0: self.FrozenMap[x][y] = 1
+        for index in range(y, NUM_SQUARE_PADS, 2): # Don't solidify round pads
+            self.frozen[index] = 1
     
     
     def solidifyColumn(self, x):
@@ -155,8 +149,8 @@ class LightMap:
         Args:
             x (int): X coordinate
         """
-        for y in range(len(self.FrozenMap)):
-            if self.FrozenMap[x][y] == 0: self.FrozenMap[x][y] = 1
+        self.frozen[x * 2] = 1
+        self.frozen[x * 2 + 1] = 1
 
     # Prevents all pads from being overwritten
     def solidifyAll(self):
@@ -164,9 +158,7 @@ class LightMap:
         if you don't want other processors to possibly draw behind your UI.
         """
         self.is_solid = True
-        for x in range(len(self.FrozenMap) - 1): # Don't solidify round pads
-            for y in range(len(self.FrozenMap[x])):
-                self.solidifyPad(x, y)
+        self.frozen[:NUM_SQUARE_PADS] = SOLID_FRAME
 
     def isSolid(self):
         """Returns whether map has been solidified
@@ -183,31 +175,22 @@ class Lights:
     def __init__(self):
         """Create instance.
         """
-        # 0 = off, 1-127 = colour
-        self.PadColours = [
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0]
-            ]
-
-        # 0 = off, 1 = on, 2 = pulse, negative = flash
-        self.PadStates = [
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0],
-            [0, 0]
-            ]
+        # Current colours and states of pads, stored in the same way as in LightMap
+        self.colours = array.array('b', BLANK_FRAME)
+        self.states = array.array('b', BLANK_FRAME)
+        
+        # Outbound MIDI messages for the current frame (signed, since colours can be -1)
+        self.messages = array.array('l')
+        
+        # Number of lighting messages sent
+        self.num_messages = 0
+        
+        self.frames_since_full_redraw = 0
+        
+        # Packed MIDI messages for each pad (see buildEncoder()), and the InControl mode they were
+        # built for
+        self.encoder = None
+        self.encoder_incontrol = None
 
 
     def reset(self):
@@ -216,7 +199,8 @@ class Lights:
         internal.sendMidiMessage(0xBF, 0x00, 0x00)
         internal.debugLog("Sent lighting reset signal", internal.consts.DEBUG.LIGHTING_RESET)
         internal.window.resetAnimationTick()
-        self.__init__()
+        self.colours[:] = BLANK_COLOURS
+        self.states[:] = BLANK_COLOURS
 
 
     def setPadColour(self, x, y, colour, state = lightingconsts.MODE_DEFAULT, override = False):
@@ -230,11 +214,7 @@ class Lights:
             override (bool, optional): Whether the event should be sent regardless of the 
                 current state of that pad. Defaults to False.
         """
-        if internal.window.getAbsoluteTick() % config.LIGHTS_FULL_REDRAW_FREQUENCY == 0:
-            full_redraw = True
-        else:
-            full_redraw = False
-            
+        full_redraw = internal.window.getAbsoluteTick() % config.LIGHTS_FULL_REDRAW_FREQUENCY == 0
         
         # Handle light offs
         if colour == 0 and state == lightingconsts.MODE_DEFAULT:
@@ -247,76 +227,263 @@ class Lights:
         if state == lightingconsts.MODE_OFF:
             colour = 0
 
+        index = x * 2 + y
+        
         # Check if pad is already in that state - don't bother with event if so
-        if self.PadColours[x][y] == colour and self.PadStates[x][y] == state and not override and not full_redraw:
+        if self.colours[index] == colour and self.states[index] == state and not override and not full_redraw:
             return
 
         # Set state variables
-        self.PadColours[x][y] = colour
-        self.PadStates[x][y] = state
+        self.colours[index] = colour
+        self.states[index] = state
 
-        status_a = 0x9
-        status_b = 0xF
+        self.buildEncoder(internal.extendedMode.query(eventconsts.INCONTROL_PADS))
+        self.encodePad(index, colour, state)
+        self.sendMessages()
+    
+    
+    def buildEncoder(self, incontrol):
+        """Build the table of MIDI messages used to set the colours of pads. Each pad has 
+        ENCODER_KINDS entries, holding the packed status and note of messages that turn it off, turn
+        it on (also the first message when flashing), make it pulse, and make it flash (second 
+        message), so that messages can be created without working out status bytes or note numbers
+        for every pad update. Only rebuilt when the InControl mode for pads changes.
 
-        if state == lightingconsts.MODE_OFF:
-            status_a = 0x8
+        Args:
+            incontrol (bool): Whether InControl is enabled for pads
+        """
+        if incontrol == self.encoder_incontrol:
+            return
+        
+        encoder = []
+        for index in range(NUM_PADS):
+            x = index >> 1
+            y = index & 1
+            extended_note, basic_note = processorhelpers.padMap.getNotes(x, y)
+            note = extended_note if incontrol else basic_note
+            
+            # Round pads in basic mode
+            if x == 8 and not incontrol:
+                status_on = status_off = 0xB
+            else:
+                status_on = 0x9
+                status_off = 0x8
+            
+            encoder.append((status_off << 4) + 0xF + (note << 8)) # Off
+            encoder.append((status_on << 4) + 0xF + (note << 8)) # On
+            encoder.append((status_on << 4) + 0x2 + (note << 8)) # Pulse
+            encoder.append((status_on << 4) + 0x1 + (note << 8)) # Flash
+        
+        self.encoder = encoder
+        self.encoder_incontrol = incontrol
+        internal.log(internal.consts.DEBUG.LIGHTING_MESSAGE, "Rebuilt lighting encoder (InControl {})", 
+                     "Enabled" if incontrol else "Disabled")
+    
+    
+    def encodePad(self, index, colour, state):
+        """Add the MIDI messages that set the colour of a pad to the outbound message buffer. This 
+        doesn't update the stored state. The encoder should be built for the current InControl
+        mode first (see buildEncoder()).
 
+        Args:
+            index (int): Pad index (x * 2 + y)
+            colour (int): Colour option
+            state (int): Light mode (not lightingconsts.MODE_DEFAULT)
+        """
+        base = index * ENCODER_KINDS
+        
+        if state == lightingconsts.MODE_OFF:
+            self.messages.append(self.encoder[base + ENCODER_OFF] + (colour << 16))
         elif state == lightingconsts.MODE_PULSE:
-            status_b = 0x2
-
-        elif state > 0:
-            status_b = 0xF
-
-        # Round pads in basic mode
-        if x == 8 and not internal.extendedMode.query(eventconsts.INCONTROL_PADS):
-            status_a = 0xB
-
-        # Calculate Status
-        status = (status_a << 4) + status_b
-
-        if internal.extendedMode.query(eventconsts.INCONTROL_PADS): 
-            internal.sendMidiMessage(status, eventconsts.Pads[x][y], colour)
-            internal.debugLog("Sent lighting command [" + str(x) + ", " + str(y) + "] (InControl Enabled)", internal.consts.DEBUG.LIGHTING_MESSAGE)
-            
-        else: 
-            internal.sendMidiMessage(status, processorhelpers.convertPadMapping(eventconsts.Pads[x][y]), colour)
-            internal.debugLog("Sent lighting command [" + str(x) + ", " + str(y) + "] (InControl Disabled)", internal.consts.DEBUG.LIGHTING_MESSAGE)
+            self.messages.append(self.encoder[base + ENCODER_PULSE] + (colour << 16))
+        else:
+            self.messages.append(self.encoder[base + ENCODER_ON] + (colour << 16))
+            if state > 0: # Send extra event to trigger flashing
+                self.messages.append(self.encoder[base + ENCODER_FLASH] + (state << 16))
+        
+        internal.log(internal.consts.DEBUG.LIGHTING_MESSAGE, "Sent lighting command [{}, {}] (InControl {})", 
+                     index >> 1, index & 1, "Enabled" if self.encoder_incontrol else "Disabled")
+    
+    
+    def sendMessages(self):
+        """Send the outbound message buffer to the controller as individual messages, in order, 
+        then clear it. The LaunchKey's firmware has no SysEx message for setting pad lights, so 
+        there is no faster way to send a frame.
+        """
+        messages = self.messages
+        if not len(messages):
+            return
+        
+        for message in messages:
+            internal.sendCompleteMidiMessage(message)
         
-        if state > 0: # Send extra event to trigger flashing
-            status_b = 0x1
-            status = (status_a << 4) + status_b
-
-            if internal.extendedMode.query(eventconsts.INCONTROL_PADS): 
-                
-                internal.sendMidiMessage(status, eventconsts.Pads[x][y], state)
-                internal.debugLog("Sent light flash command [" + str(x) + ", " + str(y) + "] (InControl Enabled)", internal.consts.DEBUG.LIGHTING_MESSAGE)
-                
-            else: 
-                internal.sendMidiMessage(status, processorhelpers.convertPadMapping(eventconsts.Pads[x][y]), state)
-                internal.debugLog("Sent light flash command [" + str(x) + ", " + str(y) + "] (InControl Disabled)", internal.consts.DEBUG.LIGHTING_MESSAGE)
+        self.num_messages += len(messages)
+        del messages[:]
     
     
     def setFromMap(self, map):
-        """Set light colours from LightMap object
+        """Set light colours from LightMap object. Only pads that have changed are sent, unless a
+        full redraw is due.
 
         Args:
             map (LightMap): What to set the lights to
         """
         map.solidifyAll()
-        for x in range(len(self.PadColours)):
-            for y in range(len(self.PadColours[x])):
-                self.setPadColour(x, y, map.PadColours[x][y], map.PadStates[x][y])
+        
+        # If frames are being skipped (see internal.performance.FrameScheduler), make sure that full
+        # redraws still happen regularly
+        self.frames_since_full_redraw += 1
+        full_redraw = internal.window.getAbsoluteTick() % config.LIGHTS_FULL_REDRAW_FREQUENCY == 0 \
+            or self.frames_since_full_redraw >= config.LIGHTS_FULL_REDRAW_FREQUENCY
+        if full_redraw:
+            self.frames_since_full_redraw = 0
+        self.buildEncoder(internal.extendedMode.query(eventconsts.INCONTROL_PADS))
+        
+        colours = self.colours
+        states = self.states
+        map_colours = map.colours
+        map_states = map.states
+        
+        for index in range(NUM_PADS):
+            colour = map_colours[index]
+            state = map_states[index]
+            
+            # Same as in setPadColour()
+            if colour == 0 and state == lightingconsts.MODE_DEFAULT:
+                state = lightingconsts.MODE_OFF
+            elif state == lightingconsts.MODE_DEFAULT:
+                state = lightingconsts.MODE_ON
+            if state == lightingconsts.MODE_OFF:
+                colour = 0
+            
+            if colours[index] == colour and states[index] == state and not full_redraw:
+                continue
+            
+            colours[index] = colour
+            states[index] = state
+            self.encodePad(index, colour, state)
+        
+        self.sendMessages()
         return
     
     def redraw(self):
         """Resends all lighting options from current state.
         """
-        for x in range(len(self.PadColours)):
-            for y in range(len(self.PadColours[x])):
-                self.setPadColour(x, y, self.PadColours[x][y], override=True)
+        for index in range(NUM_PADS):
+            self.setPadColour(index >> 1, index & 1, self.colours[index], override=True)
 
 state = Lights()
 
+# Reused for each redraw (see eventprocessor.redraw())
+frame = LightMap()
+
+class Animation:
+    """A lighting animation, compiled into a table of frames (one bytes object per tick, with one 
+    colour per pad, stored in the same order as LightMap) so that playing it back only requires
+    looking up the frame for the current tick.
+    
+    Animations are defined by a function that returns the colour of a pad at a tick, or None to
+    leave the pad unchanged. Animations that repeat only need to be compiled for one period.
+    """
+
+    # Stored in frames for pads that aren't drawn
+    TRANSPARENT = 0xFF
+
+    def __init__(self, num_frames, function, state=lightingconsts.MODE_DEFAULT, loop=True, solidify=False):
+        """Compile an animation
+
+        Args:
+            num_frames (int): Number of frames (for looping animations, the period of the 
+                animation in ticks)
+            function (function): called with (tick, x, y), returns colour of pad, or None for
+                pads that aren't drawn
+            state (int, optional): Light mode to draw pads with. Defaults to 
+                lightingconsts.MODE_DEFAULT.
+            loop (bool, optional): Whether the animation repeats. If not, nothing is drawn after
+                the last frame. Defaults to True.
+            solidify (bool, optional): Whether to solidify the LightMap after drawing a frame. 
+                Defaults to False.
+        """
+        self.state = state
+        self.loop = loop
+        self.solidify = solidify
+        self.frames = [
+            bytes(
+                self.TRANSPARENT if colour is None else colour 
+                for colour in (function(tick, index >> 1, index & 1) for index in range(NUM_PADS))
+            )
+            for tick in range(num_frames)
+        ]
+
+    def getFrame(self, tick):
+        """Returns the frame for a tick
+
+        Args:
+            tick (int): animation tick
+
+        Returns:
+            bytes: colour of each pad, or None if the animation has finished
+        """
+        if self.loop:
+            return self.frames[tick % len(self.frames)]
+        if 0 <= tick < len(self.frames):
+            return self.frames[tick]
+        return None
+
+    def draw(self, lights, tick, mask=None):
+        """Draw the frame for a tick
+
+        Args:
+            lights (LightMap): LightMap object to draw to
+            tick (int): animation tick
+            mask (Animation, optional): Animation whose frames are 0 for pads that should be turned
+                off at that tick (eg trails). Defaults to None.
+
+        Returns:
+            bool: whether anything was drawn
+        """
+        frame = self.getFrame(tick)
+        if frame is None:
+            return False
+        mask_frame = None if mask is None else mask.getFrame(tick)
+        
+        for index in range(NUM_PADS):
+            colour = frame[index]
+            if colour == self.TRANSPARENT:
+                continue
+            if mask_frame is not None and mask_frame[index] == 0:
+                colour = lightingconsts.colours["OFF"]
+            lights.setPadColour(index >> 1, index & 1, colour, self.state)
+        
+        if self.solidify:
+            lights.solidifyAll()
+        return True
+
+
+def compileInitLightShow(palette):
+    """Compile the initialisation animation, where colours from the palette sweep across the pads
+
+    Args:
+        palette (list): colours in the animation
+
+    Returns:
+        Animation: compiled animation
+    """
+    def getColour(tick, x, y):
+        # Round pads aren't drawn
+        if x == 8:
+            return None
+        # The top row is one tick behind the bottom row
+        group = x if y == 1 else x + 1
+        if group <= tick < len(palette) + group:
+            return palette[tick - group]
+        return None
+    
+    return Animation(len(palette) + 9, getColour, loop=False, solidify=True)
+
+# Palette -> compiled initialisation animation
+initAnimations = dict()
+
 def initLightShow(lights):
     if internal.state.SHARED_INIT_STATE == internal.consts.INIT_OK:
         rainbowColours = lightingconsts.PALLETE_NORMAL
@@ -327,55 +494,43 @@ def initLightShow(lights):
     else:
         rainbowColours = lightingconsts.PALLETE_INIT_FAIL
 
-    x = internal.window.getAnimationTick()
+    animation = initAnimations.get(id(rainbowColours))
+    if animation is None:
+        animation = compileInitLightShow(rainbowColours)
+        initAnimations[id(rainbowColours)] = animation
 
-    if x > len(rainbowColours) + 8: return
+    animation.draw(lights, internal.window.getAnimationTick())
 
-    # Group 1
-    if (x >= 0) and (x < len(rainbowColours)):
-        lights.setPadColour(0, 1, rainbowColours[x])
-    
-    # Group 2
-    if (x >= 1) and (x < len(rainbowColours) + 1):
-        lights.setPadColour(1, 1, rainbowColours[x - 1])
-        lights.setPadColour(0, 0, rainbowColours[x - 1])
-    
-    # Group 3
-    if (x >= 2) and (x < len(rainbowColours) + 2):
-        lights.setPadColour(2, 1, rainbowColours[x - 2])
-        lights.setPadColour(1, 0, rainbowColours[x - 2])
-    
-    # Group 4
-    if (x >= 3) and (x < len(rainbowColours) + 3):
-        lights.setPadColour(3, 1, rainbowColours[x - 3])
-        lights.setPadColour(2, 0, rainbowColours[x - 3])
-    
-    # Group 5
-    if (x >= 4) and (x < len(rainbowColours) + 4):
-        lights.setPadColour(4, 1, rainbowColours[x - 4])
-        lights.setPadColour(3, 0, rainbowColours[x - 4])
-    
 
-    # Group 6
-    if (x >= 5) and (x < len(rainbowColours) + 5):
-        lights.setPadColour(5, 1, rainbowColours[x - 5])
-        lights.setPadColour(4, 0, rainbowColours[x - 5])
+def compileIdleLightShow():
+    """Compile the idle light show animations, from the IDLE_ANIMATION_... constants
+
+    Returns:
+        tuple: (colours, trails) animations. trails is None if trails are disabled.
+    """
+    if IDLE_ANIMATION_DO_TRAILS:
+        animation_speed = IDLE_ANIMATION_SPEED * IDLE_ANIMATION_TRAIL_SPEED_MODIFIER
+    else:
+        animation_speed = IDLE_ANIMATION_SPEED
     
-    # Group 7
-    if (x >= 6) and (x < len(rainbowColours) + 6):
-        lights.setPadColour(6, 1, rainbowColours[x - 6])
-        lights.setPadColour(5, 0, rainbowColours[x - 6])
+    def getColour(tick, x, y):
+        colour = ((tick // animation_speed) + x - y) // IDLE_ANIMATION_STRETCH % 128
+        # Set off to on
+        if colour == 0:
+            colour = 1
+        return colour
     
-    # Group 8
-    if (x >= 7) and (x < len(rainbowColours) + 7):
-        lights.setPadColour(7, 1, rainbowColours[x - 7])
-        lights.setPadColour(6, 0, rainbowColours[x - 7])
+    def getTrail(tick, x, y):
+        return int(((tick // IDLE_ANIMATION_TRAIL_SPEED) + x + IDLE_ANIMATION_TRAIL_Y_OFFSET*y) 
+                   % IDLE_ANIMATION_TRAIL_INFREQUENCY < IDLE_ANIMATION_TRAIL_LENGTH)
     
-    # Group 9
-    if (x >= 8) and (x < len(rainbowColours) + 8):
-        lights.setPadColour(7, 0, rainbowColours[x - 8])
+    colours = Animation(animation_speed * IDLE_ANIMATION_STRETCH * 128, getColour, lightingconsts.MODE_ON)
+    if not IDLE_ANIMATION_DO_TRAILS:
+        return colours, None
+    trails = Animation(IDLE_ANIMATION_TRAIL_SPEED * IDLE_ANIMATION_TRAIL_INFREQUENCY, getTrail)
+    return colours, trails
 
-    lights.solidifyAll()
+idleColours, idleTrails = compileIdleLightShow()
 
 def idleLightshow(lights):
     """EVEN PRETTIER!!!!!!!!!!
@@ -385,27 +540,7 @@ def idleLightshow(lights):
     """
     if internal.window.getIdleTick() > config.IDLE_WAIT_TIME and config.IDLE_LIGHTS_ENABLED:
         tick_num = internal.window.getIdleTick() - int(config.IDLE_WAIT_TIME) + IDLE_ANIMATION_TRAIL_LENGTH * IDLE_ANIMATION_TRAIL_SPEED
-
-        for x in range(9):
-            for y in range(2):
-                # Generate colours
-                if IDLE_ANIMATION_DO_TRAILS:
-                    animation_speed = IDLE_ANIMATION_SPEED * IDLE_ANIMATION_TRAIL_SPEED_MODIFIER
-                else:
-                    animation_speed = IDLE_ANIMATION_SPEED
-                colour = ((tick_num // animation_speed) + x - y) // IDLE_ANIMATION_STRETCH % 128
-
-                light_mode = lightingconsts.MODE_ON
-
-                # Set off to on
-                if colour == 0:
-                    colour = 1
-
-                if IDLE_ANIMATION_DO_TRAILS:
-                    if not (((tick_num // IDLE_ANIMATION_TRAIL_SPEED) + x + IDLE_ANIMATION_TRAIL_Y_OFFSET*y) % IDLE_ANIMATION_TRAIL_INFREQUENCY < IDLE_ANIMATION_TRAIL_LENGTH):
-                        colour = lightingconsts.colours["OFF"]
-
-                lights.setPadColour(x, y, colour, light_mode)
+        idleColours.draw(lights, tick_num, idleTrails)
 
 def idleLightshowActive():
     """Whether the idle lightshow is currently active
@@ -13,14 +13,69 @@ MODE_ON = -1
 MODE_PULSE = -2
 MODE_DEFAULT = -3 # Guesses based on colour
 
+# Number of bits per channel used to quantise RGB colours for the nearest colour lookup table
+COLOUR_QUANTISE_BITS = 5
+# Maximum number of RGB colours stored in the nearest colour cache
+COLOUR_CACHE_SIZE = 256
+
+# Values in the nearest colour lookup table for cells that haven't been searched yet, and for
+# cells that need an exact search
+COLOUR_TABLE_EMPTY = 0xFF
+COLOUR_TABLE_MIXED = 0xFE
+
 class ColourContainer:
     """Object that basic colours are stored in. Will have functionality to search by name or RGB value.
+    
+    Nearest colour searches use a lookup table indexed by quantised RGB values (filled in as 
+    colours are requested), and recently requested RGB values are stored in a least-recently-used
+    cache. A table cell only stores a colour if it is the closest colour to every corner of the
+    cell, which makes it the closest colour to every RGB value in the cell, as the set of values
+    closest to a colour is convex. Other cells fall back to an exact search.
     """
     
     int_colours = dict()
     
     rgb_colours = dict()
     
+    def __init__(self, perceptual=False, use_table=True):
+        """Create instance of ColourContainer
+
+        Args:
+            perceptual (bool, optional): Whether to compare colours using a distance weighted to 
+                match human perception, rather than straight-line distance in RGB space. Defaults
+                to False.
+            use_table (bool, optional): Whether to use the quantised lookup table. If not, the
+                nearest colour is found exactly. Defaults to True.
+        """
+        self.perceptual = perceptual
+        self.use_table = use_table
+        self.num_hits = 0
+        self.num_misses = 0
+        self.clearCache()
+    
+    def clearCache(self):
+        """Clear stored results of nearest colour searches. Called when colours or search options
+        change.
+        """
+        # Index in lookup table -> index in names, COLOUR_TABLE_EMPTY if not yet found, or
+        # COLOUR_TABLE_MIXED if the cell contains values closest to different colours
+        self.table = bytearray([COLOUR_TABLE_EMPTY]) * (1 << (3 * COLOUR_QUANTISE_BITS))
+        # RGB -> name, in order of use
+        self.cache = dict()
+        # Names and RGB values of colours, in order of searching
+        self.names = list(self.rgb_colours.keys())
+        self.rgb_values = [splitRgb(rgb) for rgb in self.rgb_colours.values()]
+    
+    def setPerceptual(self, perceptual):
+        """Set whether to compare colours using a distance weighted to match human perception
+
+        Args:
+            perceptual (bool): whether to use perceptual distance
+        """
+        if perceptual != self.perceptual:
+            self.perceptual = perceptual
+            self.clearCache()
+    
     def addColour(self, name, int_val, rgb):
         """Adds a colour to the list
 
@@ -31,6 +86,7 @@ class ColourContainer:
         """
         self.int_colours[name] = int_val
         self.rgb_colours[name] = rgb
+        self.clearCache()
         
     def getColourByName(self, name):
         """Returns details of colour
@@ -56,6 +112,57 @@ class ColourContainer:
         """
         return self.int_colours[key]
     
+    def findClosest(self, r, g, b):
+        """Searches every colour for the closest one to an RGB value
+
+        Args:
+            r (int): red (0-255)
+            g (int): green (0-255)
+            b (int): blue (0-255)
+
+        Returns:
+            int: index of colour in names
+        """
+        min_distance = math.inf
+        min_index = 0
+        perceptual = self.perceptual
+        for index, (r_check, g_check, b_check) in enumerate(self.rgb_values):
+            if perceptual:
+                # "Redmean" approximation of perceived colour difference
+                r_mean = (r + r_check) / 2
+                distance = (2 + r_mean / 256) * (r - r_check)**2 + 4 * (g - g_check)**2 \
+                    + (2 + (255 - r_mean) / 256) * (b - b_check)**2
+            else:
+                # Squared distance in RGB space (no need for the square root when comparing)
+                distance = (r - r_check)**2 + (g - g_check)**2 + (b - b_check)**2
+            
+            if distance < min_distance:
+                min_distance = distance
+                min_index = index
+        
+        return min_index
+    
+    def findCellClosest(self, r, g, b, size):
+        """Searches for the closest colour to every corner of a cell of the lookup table
+
+        Args:
+            r (int): red of the lowest corner (0-255)
+            g (int): green of the lowest corner (0-255)
+            b (int): blue of the lowest corner (0-255)
+            size (int): distance from the lowest corner to the highest corner in each component
+
+        Returns:
+            int: index of colour in names, or COLOUR_TABLE_MIXED if the corners are closest to
+                different colours
+        """
+        index = self.findClosest(r, g, b)
+        for r_corner in (r, r + size):
+            for g_corner in (g, g + size):
+                for b_corner in (b, b + size):
+                    if self.findClosest(r_corner, g_corner, b_corner) != index:
+                        return COLOUR_TABLE_MIXED
+        return index
+    
     def getClosestName(self, rgb):
         """Returns name of closest colour in colour set
 
@@ -68,30 +175,40 @@ class ColourContainer:
                 
         # Trim unnessesary data (bitwise and with 3-bytes of 1)
         rgb = rgb&((1 << 24) - 1)
-                
-        # Extract r, g, b values
-        r = rgb >> 16
-        g = (rgb >> 8) - (r << 8)
-        b = rgb - (g << 8) - (r << 16)
         
-        # Loop over each colour to get the closest one
-        min_distance = math.inf
-        min_distance_name= None
-        for name_check, rgb_check in self.rgb_colours.items():
-            
-            # Extract r, g, b values
-            r_check = rgb_check >> 16
-            g_check = (rgb_check >> 8) - (r_check << 8)
-            b_check = rgb_check - (g_check << 8) - (r_check << 16)
-            
-            # Use distance formula to get closest colour in RGB space
-            distance = math.sqrt( (r - r_check)**2 + (g - g_check)**2 + (b - b_check)**2 )
-            
-            if distance < min_distance:
-                min_distance = distance
-                min_distance_name = name_check
+        # Check recently requested colours, moving this one to the end of the cache
+        name = self.cache.pop(rgb, None)
+        if name is not None:
+            self.cache[rgb] = name
+            self.num_hits += 1
+            return name
+        self.num_misses += 1
         
-        return min_distance_name
+        r, g, b = splitRgb(rgb)
+        
+        if self.use_table:
+            shift = 8 - COLOUR_QUANTISE_BITS
+            r_q = r >> shift
+            g_q = g >> shift
+            b_q = b >> shift
+            table_index = (((r_q << COLOUR_QUANTISE_BITS) + g_q) << COLOUR_QUANTISE_BITS) + b_q
+            index = self.table[table_index]
+            if index == COLOUR_TABLE_EMPTY:
+                index = self.findCellClosest(r_q << shift, g_q << shift, b_q << shift, (1 << shift) - 1)
+                self.table[table_index] = index
+            if index == COLOUR_TABLE_MIXED:
+                index = self.findClosest(r, g, b)
+        else:
+            index = self.findClosest(r, g, b)
+        
+        name = self.names[index]
+        
+        # Remove least recently used colour
+        if len(self.cache) >= COLOUR_CACHE_SIZE:
+            del self.cache[next(iter(self.cache))]
+        self.cache[rgb] = name
+        
+        return name
     
     def getClosestInt(self, rgb):
         """Returns internal value of closest colour in colour set
@@ -114,7 +231,26 @@ class ColourContainer:
             int: colour rgb
         """
         return self.rgb_colours[self.getClosestName(rgb)]
+    
+    def getString(self):
+        """Returns a summary of nearest colour cache usage
+
+        Returns:
+            str: summary
+        """
+        return "Colour cache: " + str(self.num_hits) + " hits, " + str(self.num_misses) + " misses"
+
 
+def splitRgb(rgb):
+    """Returns the red, green and blue components of an RGB colour
+
+    Args:
+        rgb (int): RGB colour
+
+    Returns:
+        tuple: r, g, b (0-255)
+    """
+    return ((rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF)
 
 
 colours = ColourContainer()
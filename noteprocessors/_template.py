@@ -34,6 +34,12 @@ SILENT = False
 # You can modify this during execution to make it only forward notes sometimes.
 FORWARD_NOTES = False
 
+# Types of events your processor acts on (eg eventconsts.TYPE_NOTE), and IDs of any other events
+# it acts on (eg eventconsts.PEDAL). Other events won't be sent to your processor. 
+# Leave these commented out to receive all events (required if you use processInit()).
+# EVENT_TYPES = []
+# EVENT_IDS = []
+
 def process(command):
     """Called with an event to be processed by your note processor. Events aren't filtered so you'll want to make sure your processor checks that events are notes.
 
@@ -61,6 +67,14 @@ def processInit(command):
     """
     pass
 
+def getRedrawKey():
+    """Called before redrawing. Return a value describing everything that redraw() depends on 
+    (eg min(internal.window.getAnimationTick(), 4) for an animation lasting 4 ticks). If it is the 
+    same as last time, redraw() isn't called, and the previous lights are reused. 
+    Return None to redraw every time.
+    """
+    return None
+
 def redraw(lights):
     """Called when a redraw is taking place. Use this to draw menus to allow your users to choose options. Most of the time, you should leave this empty.
 
@@ -11,6 +11,9 @@ import internal
 import processorhelpers
 import lightingconsts
 
+# Types of events this processor acts on
+EVENT_TYPES = []
+
 NAME = internal.consts.NOTE_STATE_NORMAL
 
 COLOUR = lightingconsts.colours["WHITE"]
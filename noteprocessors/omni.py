@@ -15,6 +15,9 @@ import processorhelpers
 import lightingconsts
 import config
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_NOTE, eventconsts.TYPE_BASIC_PAD, eventconsts.TYPE_PAD]
+
 # The name of your mode
 NAME = "Omni Mode"
 
@@ -47,6 +47,20 @@ noteModeMenu = processorhelpers.UiModeSelector(len(customProcessors) // 16 + 1)
 note_menu_active = False
 
 
+def getNoteProcessors():
+    """Returns the note processor for the current note mode
+
+    Returns:
+        list: processor modules
+    """
+    return [
+        getattr(noteprocessors, x) for x in customProcessorsAll 
+        if getattr(noteprocessors, x).NAME == internal.noteMode.getState()
+    ]
+
+routes = processorhelpers.ProcessorRoutes(getNoteProcessors)
+
+
 def switchNoteModeMenu(newMode, quiet=False):
     global note_menu_active
     note_menu_active = newMode
@@ -70,16 +84,11 @@ def process(command):
     
     # Otherwise use note processors
     else:
-        for x in customProcessorsAll:
-            object_to_call = getattr(noteprocessors, x)
-            if object_to_call.NAME == internal.noteMode.getState():
-                
-                if object_to_call.FORWARD_NOTES and command.type == eventconsts.TYPE_NOTE and not internal.getPortExtended():
-                    internal.sendCompleteInternalMidiMessage(command.getDataMIDI())
-                
-                object_to_call.process(command)
-            
-                if command.ignored: break
+        for object_to_call in routes.getProcessors():
+            if object_to_call.FORWARD_NOTES and command.type == eventconsts.TYPE_NOTE and not internal.getPortExtended():
+                internal.sendCompleteInternalMidiMessage(command.getDataMIDI())
+        
+        routes.process(command)
                 
     # Then check the note mode menu button
     processNoteModeMenuOpener(command)
@@ -161,7 +170,7 @@ def redraw(lights):
     
     # Redraw menus for current note input
     if not note_menu_active:
-        getattr(noteprocessors, customProcessorsAll[note_mode_index]).redraw(lights)
+        processorhelpers.redrawCache.redraw(getattr(noteprocessors, customProcessorsAll[note_mode_index]), lights)
     
     else:
         redrawTo = min(len(customProcessors) - 16*noteModeMenu.getMode(), 16)
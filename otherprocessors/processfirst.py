@@ -20,6 +20,16 @@ import lighting
 import lightingconsts
 import noteprocessors
 
+def getRedrawKey():
+    """Returns a value describing everything that redraw() depends on (see 
+    processorhelpers.RedrawCache)
+    """
+    return (
+        internal.window.getInPopup(), 
+        internal.window.active_plugin == internal.consts.WINDOW_STR_SCRIPT_OUTPUT and internal.window.plugin_focused,
+        min(internal.window.getAnimationTick(), 4)
+    )
+
 def redraw(lights):
     # In Popup Menu
     if internal.window.getInPopup():
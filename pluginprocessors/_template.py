@@ -20,6 +20,12 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# Types of events your processor acts on (eg eventconsts.TYPE_BASIC_PAD), and IDs of any other 
+# events it acts on (eg eventconsts.PEDAL). Other events won't be sent to your processor. 
+# Leave these commented out to receive all events.
+# EVENT_TYPES = []
+# EVENT_IDS = []
+
 
 def topPluginStart():
     """Called when plugin is top plugin (not neccesarily focused)
@@ -57,6 +63,14 @@ def activeEnd():
     
     return
 
+def getRedrawKey():
+    """Called before redrawing. Return a value describing everything that redraw() depends on 
+    (eg min(internal.window.getAnimationTick(), 4) for an animation lasting 4 ticks). If it is the 
+    same as last time, redraw() isn't called, and the previous lights are reused. 
+    Return None to redraw every time.
+    """
+    return None
+
 def redraw(lights):
     """Called when redrawing UI on pads. Set colours of lights here.
 
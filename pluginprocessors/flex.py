@@ -20,6 +20,9 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_FADER, eventconsts.TYPE_BASIC_KNOB, eventconsts.TYPE_BASIC_PAD]
+
 CONTROL_START = 10
 
 KNOB_MAPPINGS = [
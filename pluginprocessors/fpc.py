@@ -29,6 +29,11 @@ import config
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_PAD]
+# IDs of other events this processor acts on
+EVENT_IDS = [eventconsts.PEDAL]
+
 COLOUR_MAP = [
     [lightingconsts.colours["BLUE"], lightingconsts.colours["BLUE"]],
     [lightingconsts.colours["BLUE"], lightingconsts.colours["RED"]],
@@ -44,6 +49,12 @@ COLOUR_MAP = [
 
 
 
+def getRedrawKey():
+    """Returns a value describing everything that redraw() depends on (see 
+    processorhelpers.RedrawCache)
+    """
+    return (internal.extendedMode.query(eventconsts.INCONTROL_PADS), min(internal.window.getAnimationTick(), 8))
+
 def redraw(lights):
     if not internal.extendedMode.query(eventconsts.INCONTROL_PADS):
         light_map = COLOUR_MAP.copy()
@@ -20,6 +20,11 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_FADER, eventconsts.TYPE_BASIC_KNOB]
+# IDs of other events this processor acts on
+EVENT_IDS = [eventconsts.MOD_WHEEL, eventconsts.PEDAL]
+
 
 def topPluginStart():
     """Called when plugin is top plugin (not neccesarily focused)
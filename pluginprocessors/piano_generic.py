@@ -21,6 +21,9 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# IDs of other events this processor acts on
+EVENT_IDS = [eventconsts.PEDAL]
+
 
 def topPluginStart():
     """Called when plugin is top plugin (not neccesarily focused)
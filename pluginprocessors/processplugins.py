@@ -29,12 +29,16 @@ import processorhelpers
 # Import custom processors specified in list above
 print("Importing Plguin Processors...")
 customProcessors = []
+# Plugin name -> list of processors that can handle it
+pluginIndex = dict()
 success = 0
 total_plugins = 0
 for x in range(len(imports)):
     try:
         customProcessors.append( __import__("pluginprocessors." + imports[x]) )
         plugin_count = len(getattr(pluginprocessors, imports[x]).PLUGINS)
+        for plugin_name in getattr(pluginprocessors, imports[x]).PLUGINS:
+            pluginIndex.setdefault(plugin_name, []).append(getattr(pluginprocessors, imports[x]))
         success += 1
         total_plugins += plugin_count
     except ImportError as e:
@@ -44,59 +48,79 @@ for x in range(len(imports)):
             raise e
 print("Successfully imported " + str(success) + "/" + str(len(imports)) + " modules (" + str(total_plugins) + " plugins)")
 
+def getPluginProcessors():
+    """Returns the processors that can handle the active plugin
+
+    Returns:
+        list: processor modules
+    """
+    return pluginIndex.get(internal.window.getPluginName(), [])
+
+# The active processors are resolved by updateActive() when the plugin changes
+routes = processorhelpers.ProcessorRoutes(getPluginProcessors)
+
+def updateActive():
+    """Find the processors for the active plugin. Called when the active plugin changes.
+    """
+    routes.build()
+
 # Called when plugin is top plugin
 def topPluginStart():
     # Only in extended mode:
     if internal.state.PORT == config.DEVICE_PORT_EXTENDED:
-        for x in imports:
-            object_to_call = getattr(pluginprocessors, x)
-            if canHandle(object_to_call):
-                object_to_call.topPluginStart()
+        for object_to_call in routes.getProcessors():
+            object_to_call.topPluginStart()
     return
 
 # Called when plugin is no longer top plugin
 def topPluginEnd():
     # Only in extended mode:
     if internal.state.PORT == config.DEVICE_PORT_EXTENDED:
-        for x in imports:
-            object_to_call = getattr(pluginprocessors, x)
-            if canHandle(object_to_call):
-                object_to_call.topPluginEnd()
+        for object_to_call in routes.getProcessors():
+            object_to_call.topPluginEnd()
     return
 
 # Called when plugin brought to foreground
 def activeStart():
-    for x in imports:
-        object_to_call = getattr(pluginprocessors, x)
-        if canHandle(object_to_call):
-            object_to_call.activeStart()
+    for object_to_call in routes.getProcessors():
+        object_to_call.activeStart()
     return
 
 # Called when plugin no longer in foreground
 def activeEnd():
-    for x in imports:
-        object_to_call = getattr(pluginprocessors, x)
-        if canHandle(object_to_call):
-            object_to_call.activeEnd()
+    for object_to_call in routes.getProcessors():
+        object_to_call.activeEnd()
     return
 
 def redraw(lights):
-    for x in imports:
-        object_to_call = getattr(pluginprocessors, x)
-        if canHandle(object_to_call):
-            object_to_call.redraw(lights)
+    for object_to_call in routes.getProcessors():
+        processorhelpers.redrawCache.redraw(object_to_call, lights)
 
 mute_toggle_channel = None
 previous_channel_volume = None
 
+def getChannelVolume(channel):
+    """Returns the volume of a channel, including changes that haven't been sent to FL Studio yet
+
+    Args:
+        channel (int): channel index
+
+    Returns:
+        float: volume
+    """
+    pending = internal.hostWrites.getPending(("channel volume", channel))
+    if pending is not None:
+        return pending[1]
+    return channels.getChannelVolume(channel)
+
 def process(command):
     
     # Process master fader changing selected channel volume.
     if command.id == eventconsts.BASIC_FADER_9:
         current_channel = channels.selectedChannel()
         volume = processorhelpers.snap(processorhelpers.toFloat(command.value), internal.consts.CHANNEL_VOLUME_SNAP_TO)
-        channels.setChannelVolume(current_channel, volume)
-        action = "Set " + channels.getChannelName(current_channel) + " volume to " + str(round(volume * 100)) + "%"
+        internal.hostWrites.write(("channel volume", current_channel), channels.setChannelVolume, current_channel, volume)
+        action = "Set " + internal.names.getChannelName(current_channel) + " volume to " + str(round(volume * 100)) + "%"
         if processorhelpers.didSnap(processorhelpers.toFloat(command.value), internal.consts.CHANNEL_VOLUME_SNAP_TO):
             action += " [Snapped]"
         command.handle(action)
@@ -106,23 +130,19 @@ def process(command):
         global mute_toggle_channel, previous_channel_volume
         if command.is_lift:
             if type(mute_toggle_channel) is int and type(previous_channel_volume) is float:
-                if 0 == channels.getChannelVolume(mute_toggle_channel):
-                    channels.setChannelVolume(mute_toggle_channel, previous_channel_volume)
-                    command.handle("Unmuted " + channels.getChannelName(mute_toggle_channel))
+                if 0 == getChannelVolume(mute_toggle_channel):
+                    internal.hostWrites.write(("channel volume", mute_toggle_channel), channels.setChannelVolume, mute_toggle_channel, previous_channel_volume)
+                    command.handle("Unmuted " + internal.names.getChannelName(mute_toggle_channel))
                 mute_toggle_channel = None
                 previous_channel_volume = None
         else:
             mute_toggle_channel = channels.selectedChannel()
-            previous_channel_volume = channels.getChannelVolume(mute_toggle_channel)
-            channels.setChannelVolume(mute_toggle_channel, 0)
-            command.handle("Muted " + channels.getChannelName(mute_toggle_channel))
+            previous_channel_volume = getChannelVolume(mute_toggle_channel)
+            internal.hostWrites.write(("channel volume", mute_toggle_channel), channels.setChannelVolume, mute_toggle_channel, 0)
+            command.handle("Muted " + internal.names.getChannelName(mute_toggle_channel))
     
-    for x in imports:
-        object_to_call = getattr(pluginprocessors, x)
-        if canHandle(object_to_call):
-            object_to_call.process(command)
-        
-        if command.ignored: return
+    routes.process(command)
+    if command.ignored: return
     
     # Only process mod-wheel and pitch-bend if they weren't already handled by plugin processors
     
@@ -143,11 +163,3 @@ def beatChange(beat):
     for x in imports:
         object_to_call = getattr(pluginprocessors, x)
         object_to_call.beatChange(beat)
-
-def canHandle(object_to_call):
-    for x in range(len(object_to_call.PLUGINS)):
-        if object_to_call.PLUGINS[x] == internal.window.getPluginName():
-            return True
-
-    return False
-
@@ -21,6 +21,9 @@ import lightingconsts
 import processorhelpers
 import lighting
 
+# Types of events this processor acts on
+EVENT_TYPES = []
+
 
 def topPluginStart():
     """Called when plugin is top plugin (not neccesarily focused)
@@ -19,6 +19,9 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_PAD]
+
 
 def topPluginStart():
     """Called when plugin is top plugin (not neccesarily focused)
@@ -18,6 +18,9 @@ import lightingconsts
 import eventconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_PAD, eventconsts.TYPE_BASIC_FADER, eventconsts.TYPE_BASIC_KNOB]
+
 # Constants for event remapping
 NEAR_FAR = 6
 VARIATION = 14
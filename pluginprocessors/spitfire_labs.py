@@ -21,6 +21,11 @@ import processorhelpers
 
 from . import spitfire_generic
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_KNOB, eventconsts.TYPE_BASIC_FADER]
+# IDs of other events this processor acts on
+EVENT_IDS = [eventconsts.PEDAL]
+
 # Constants for event remapping
 ADSR_START = 8
 
@@ -19,6 +19,9 @@ import eventprocessor
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_BASIC_PAD, eventconsts.TYPE_BASIC_FADER, eventconsts.TYPE_BASIC_KNOB]
+
 # Previous param index: should speed things up
 prev_param_index = -1
 
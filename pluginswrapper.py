@@ -28,6 +28,17 @@ def _getPluginIndexTuple(plugin_index):
     
     return (track_index, plugin_index)
 
+def _getParamValue(param_index, plugin_index):
+    """Returns the value of a parameter, including changes that haven't been sent to FL Studio yet
+    
+    plugin_index must be in tuple form
+    """
+    
+    pending = internal.hostWrites.getPending(("param", param_index, plugin_index[1], plugin_index[0]))
+    if pending is not None:
+        return pending[0]
+    return plugins.getParamValue(param_index, plugin_index[1], plugin_index[0])
+
 def getParamIndexByName(name, plugin_index=-1, expected_param_index=-1):
     """Returns the index of a parameter in a plugin given the name of the parameter.
 
@@ -49,11 +60,11 @@ def getParamIndexByName(name, plugin_index=-1, expected_param_index=-1):
 
     plugin_index = _getPluginIndexTuple(plugin_index)
     
-    if plugins.getParamName(expected_param_index, plugin_index[1], plugin_index[0]) == name:
+    if internal.names.getParamName(expected_param_index, plugin_index[1], plugin_index[0]) == name:
         return expected_param_index
 
     for i in range(plugins.getParamCount(plugin_index[1], plugin_index[0])):
-        if plugins.getParamName(i, plugin_index[1], plugin_index[0]) == name:
+        if internal.names.getParamName(i, plugin_index[1], plugin_index[0]) == name:
             return i
     
     return -1
@@ -119,17 +130,20 @@ def setParamByIndex(param_index, value,  plugin_index=-1, command=None):
     if plugin_index[1] == -1:
         return
     
-    plugins.setParamValue(value, param_index, plugin_index[1], plugin_index[0])
+    internal.hostWrites.write(
+        ("param", param_index, plugin_index[1], plugin_index[0]),
+        plugins.setParamValue, value, param_index, plugin_index[1], plugin_index[0]
+    )
     
     if command is not None:
         # For generators, use name on channel rack
         if plugin_index[0] == -1:
-            plug_name = channels.getChannelName(plugin_index[1])
+            plug_name = internal.names.getChannelName(plugin_index[1])
         else:
-            plug_name = plugins.getPluginName(plugin_index[1], plugin_index[0])
+            plug_name = internal.names.getPluginName(plugin_index[1], plugin_index[0])
         command.handle(plug_name
                        + ": Set "
-                       + plugins.getParamName(param_index, plugin_index[1], plugin_index[0])
+                       + internal.names.getParamName(param_index, plugin_index[1], plugin_index[0])
                        + " to " + str(round(value * 100)) + "%"
                     )
 
@@ -183,7 +197,7 @@ def getParamByName(name,  plugin_index=-1, expected_param_index=-1):
     if plugin_index[1] == -1:
         return expected_param_index
     
-    return plugins.getParamValue(param_index, plugin_index[1], plugin_index[0])
+    return _getParamValue(param_index, plugin_index)
 
 def getParamByIndex(param_index,  plugin_index=-1):
     """Gets a parameter in a plugin given the index of the parameter.
@@ -206,7 +220,7 @@ def getParamByIndex(param_index,  plugin_index=-1):
     if plugin_index[1] == -1:
         return
     
-    return plugins.getParamValue(param_index, plugin_index[1], plugin_index[0])
+    return _getParamValue(param_index, plugin_index)
 
 
 def getCCParam(ccNum, plugin_index=-1):
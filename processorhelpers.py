@@ -9,6 +9,8 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 """
 
 import time
+import math
+import array
 
 import utils
 import ui
@@ -18,6 +20,7 @@ import config
 import eventconsts
 import internal
 import internal.consts
+import internal.flags
 import lightingconsts
 
 class UIMode:
@@ -257,6 +260,87 @@ class ExtensibleNote():
         self.extended_notes = extended_notes
 
 
+class PadMap:
+    """Index of pad note numbers and coordinates, built from eventconsts.Pads and
+    eventconsts.BasicPads, so that pads can be looked up in either direction without searching.
+    """
+    def __init__(self):
+        """Create instance of PadMap and build the index
+        """
+        # note -> (x, y, extended)
+        self.pads = dict()
+        # (x, y) -> (extended note, basic note)
+        self.notes = dict()
+
+        for x in range(len(eventconsts.Pads)):
+            for y in range(len(eventconsts.Pads[x])):
+                extended_note = eventconsts.Pads[x][y]
+                basic_note = eventconsts.BasicPads[x][y]
+                self.notes[(x, y)] = (extended_note, basic_note)
+
+                # Where a note is used by more than one pad, the first pad found wins
+                if extended_note not in self.pads:
+                    self.pads[extended_note] = (x, y, True)
+                if basic_note not in self.pads:
+                    self.pads[basic_note] = (x, y, False)
+
+    def getPad(self, note):
+        """Returns details of the pad that uses a note number
+
+        Args:
+            note (int): note number
+
+        Returns:
+            tuple: x, y, and whether the note is the extended mode note for the pad.
+                None if the note isn't a pad.
+        """
+        return self.pads.get(note)
+
+    def getCoord(self, note):
+        """Returns the coordinates of the pad that uses a note number
+
+        Args:
+            note (int): note number
+
+        Returns:
+            int: X (-1 if the note isn't a pad)
+            int: Y (-1 if the note isn't a pad)
+        """
+        pad = self.pads.get(note)
+        if pad is None:
+            return -1, -1
+        return pad[0], pad[1]
+
+    def getNotes(self, x, y):
+        """Returns the note numbers used by a pad
+
+        Args:
+            x (int): X coordinate
+            y (int): Y coordinate
+
+        Returns:
+            int: note number in extended mode
+            int: note number in basic mode
+        """
+        return self.notes[(x, y)]
+
+    def toBasic(self, note):
+        """Converts an extended mode pad note number to its basic mode note number
+
+        Args:
+            note (int): note number for extended pad
+
+        Returns:
+            int: note number for basic pad (None if the note isn't an extended pad)
+        """
+        pad = self.pads.get(note)
+        if pad is None or not pad[2]:
+            return None
+        return self.notes[(pad[0], pad[1])][1]
+
+padMap = PadMap()
+
+
 def convertPadMapping(padNumber):
     """Converts between basic mode pad mapping and extended mode mapping
 
@@ -266,76 +350,176 @@ def convertPadMapping(padNumber):
     Returns:
         int: note number for basic pad
     """
-    for y in range(len(eventconsts.Pads)):
-        for x in range(len(eventconsts.Pads[y])):
-            if padNumber == eventconsts.Pads[y][x]:
-                return eventconsts.BasicPads[y][x]
+    return padMap.toBasic(padNumber)
 
 
-lastPressID = -1
-lastPressTime = -1
-def isDoubleClickPress(id_val):
-    """Returns whether a press event was a double click
+class GestureTracker:
+    """Tracks presses and lifts of each control separately, to detect double clicks, triple clicks
+    and long presses. Timestamps and click counts are stored in arrays indexed by event ID, so 
+    gestures on different controls don't interfere with each other.
+    
+    Long presses are detected on idle while the control is still held (see tick()), and passed to
+    long press listeners. A long press that has been passed to listeners isn't reported again when
+    the control is lifted.
+    """
 
-    Args:
-        id_val (int): Event ID
+    # Status bytes are always at least 0x80, so the top bit is dropped to halve the array size
+    SIZE = 0x4000
 
-    Returns:
-        bool: whether the event was a double click
-    """
-    global lastPressID
-    global lastPressTime
-    ret = False
-    currentTime = time.perf_counter()
-    if id_val == lastPressID and (currentTime - lastPressTime < config.DOUBLE_PRESS_TIME):
-        ret = True
-    lastPressID = id_val
-    lastPressTime = currentTime
-    return ret
-
-
-lastLiftID = -1
-lastLiftTime = -1
-def isDoubleClickLift(id_val):
-    """Returns whether a lift event was a double click
+    def __init__(self):
+        """Create instance of GestureTracker
+        """
+        self.press_times = array.array('d', [-math.inf]) * self.SIZE
+        self.lift_times = array.array('d', [-math.inf]) * self.SIZE
+        self.press_counts = bytearray(self.SIZE)
+        self.lift_counts = bytearray(self.SIZE)
 
-    Args:
-        id_val (int): Event ID
+        # index -> event ID of controls currently held down
+        self.held = dict()
+        # indexes of held controls that have already triggered a long press
+        self.long_pressed = set()
 
-    Returns:
-        bool: whether the event was a double click
-    """
-    global lastLiftID
-    global lastLiftTime
-    ret = False
-    currentTime = time.perf_counter()
-    if id_val == lastLiftID and (currentTime - lastLiftTime < config.DOUBLE_PRESS_TIME):
-        ret = True
-    lastLiftID = id_val
-    lastLiftTime = currentTime
-    return ret
-
-def isLongPressLift(id_val):
-    """Returns whether a lift event was held down for a long time
-    
-    Args:
-        id_val (int): Event ID
-    
-    Returns:
-        bool: whether the event was a long press
-    """
-    global lastPressID, lastPressTime
-    
-    currentTime = time.perf_counter()
+        self.long_press_listeners = []
 
-    return (id_val == lastPressID) and (currentTime - lastPressTime >= config.LONG_PRESS_TIME)
-    
-    
+    def getIndex(self, id_val):
+        """Returns the array index used for a control. Note off events use the same index
+        as note on events, so that pads and keys are tracked as a single control.
+
+        Args:
+            id_val (int): Event ID
+
+        Returns:
+            int: array index, or -1 if the ID isn't valid
+        """
+        if not 0 <= id_val < 0x8000:
+            return -1
+        # Note off -> note on
+        if id_val & 0xF0 == 0x80:
+            id_val |= 0x10
+        return (id_val & 0x7F) + ((id_val >> 8) << 7)
+
+    def press(self, id_val):
+        """Register a control being pressed
+
+        Args:
+            id_val (int): Event ID
+
+        Returns:
+            int: number of presses in quick succession (1 for single, 2 for double click, etc)
+        """
+        index = self.getIndex(id_val)
+        if index == -1:
+            return 1
+        now = time.perf_counter()
+
+        if now - self.press_times[index] < config.DOUBLE_PRESS_TIME:
+            count = min(self.press_counts[index] + 1, 255)
+        else:
+            count = 1
+        self.press_times[index] = now
+        self.press_counts[index] = count
+
+        self.held[index] = id_val
+        self.long_pressed.discard(index)
+        return count
+
+    def lift(self, id_val):
+        """Register a control being lifted
+
+        Args:
+            id_val (int): Event ID
+
+        Returns:
+            int: number of lifts in quick succession (1 for single, 2 for double click, etc)
+        """
+        index = self.getIndex(id_val)
+        if index == -1:
+            return 1
+        now = time.perf_counter()
+
+        if now - self.lift_times[index] < config.DOUBLE_PRESS_TIME:
+            count = min(self.lift_counts[index] + 1, 255)
+        else:
+            count = 1
+        self.lift_times[index] = now
+        self.lift_counts[index] = count
+
+        self.held.pop(index, None)
+        self.long_pressed.discard(index)
+        return count
+
+    def isLongPress(self, id_val):
+        """Returns whether a control is currently being held down, and has been held for long 
+        enough to be a long press
+
+        Args:
+            id_val (int): Event ID
+
+        Returns:
+            bool: whether the control is being long pressed
+        """
+        index = self.getIndex(id_val)
+        return (
+            index in self.held 
+            and time.perf_counter() - self.press_times[index] >= config.LONG_PRESS_TIME
+        )
+
+    def process(self, command):
+        """Set the gesture flags (is_double_click, is_triple_click and is_long_press) of an event,
+        and register the press or lift
+
+        Args:
+            command (ParsedEvent): event to process
+        """
+        if not command.isBinary:
+            command.is_double_click = False
+            command.is_triple_click = False
+            command.is_long_press = False
+            return
+
+        if command.is_lift:
+            # Long presses that already fired while the control was held aren't reported again
+            command.is_long_press = self.isLongPress(command.id) \
+                and self.getIndex(command.id) not in self.long_pressed
+            count = self.lift(command.id)
+        else:
+            command.is_long_press = False
+            count = self.press(command.id)
+
+        command.is_double_click = count >= 2
+        command.is_triple_click = count >= 3
+
+    def addLongPressListener(self, listener):
+        """Add a function to be called when a control has been held down for a long press, 
+        while it is still held
+
+        Args:
+            listener (function): called with the event ID of the control (as it was pressed)
+        """
+        self.long_press_listeners.append(listener)
+
+    def tick(self):
+        """Checks held controls for long presses, and calls listeners once for each one. Called on
+        idle.
+        """
+        if not len(self.held):
+            return
+
+        now = time.perf_counter()
+        for index, id_val in list(self.held.items()):
+            if index not in self.long_pressed and now - self.press_times[index] >= config.LONG_PRESS_TIME:
+                self.long_pressed.add(index)
+                for listener in self.long_press_listeners:
+                    listener(id_val)
+
+gestures = GestureTracker()
 
 
 class Action:
     """Stores an action as a string
     """
+    __slots__ = ["act", "silent"]
+
     def __init__(self, act, silent):
         """Create an event action
 
@@ -349,6 +533,8 @@ class Action:
 class ActionList:
     """Stores a list of actions taken by a single processor
     """
+    __slots__ = ["name", "list", "handle_type"]
+
     def __init__(self, name):
         """Create an action list
 
@@ -359,6 +545,15 @@ class ActionList:
         self.list = []
         self.handle_type = False
 
+    def reset(self, name):
+        """Clear the action list so it can be reused for another processor
+
+        Args:
+            name (str): Name of the processor
+        """
+        self.name = name
+        self.list.clear()
+        self.handle_type = False
     
     def appendAction(self, action, silent, handle):
         """Append action to list of actions
@@ -385,13 +580,13 @@ class ActionList:
 
         # No indentation required if there was only one action
         elif len(self.list) == 1:
-            ret = internal.getTab(self.name + ":", 2) + self.list[0].act
+            ret = internal.getTab(self.name + ":", 2) + str(self.list[0].act)
 
         # If there are multiple actions, indent them
         else:
             ret = self.name + ":"
             for i in range(len(self.list)):
-                ret += '\n' + internal.getTab("") + self.list[i].act
+                ret += '\n' + internal.getTab("") + str(self.list[i].act)
 
         if self.handle_type == internal.consts.EVENT_HANDLE:
             ret += '\n' + internal.getTab("") + "[Handled]"
@@ -414,13 +609,24 @@ class ActionList:
 
 
 class ActionPrinter:
-    """Object containing actions taken by all processor modules
+    """Object containing actions taken by all processor modules.
+    
+    Actions are only recorded in full when event actions are being logged (tracing mode). 
+    Otherwise, only the hint message that would be set is kept, so that processing an event
+    doesn't need to allocate or format anything for its actions.
     """
 
+    __slots__ = ["eventProcessors", "spare_lists", "tracing", "hint_msg", "processor_hint_msg"]
+
     def __init__(self):
         # String that is output after each event is processed
         self.eventProcessors = []
 
+        # Action lists from previous events, kept so that they can be reused
+        self.spare_lists = []
+
+        self.clear()
+
     
     def addProcessor(self, name):
         """Add an event processor
@@ -428,7 +634,27 @@ class ActionPrinter:
         Args:
             name (str): Name of the processor
         """
-        self.eventProcessors.append(ActionList(name))
+        if not self.tracing:
+            self.commitHintMsg()
+            return
+
+        if len(self.spare_lists):
+            action_list = self.spare_lists.pop()
+            action_list.reset(name)
+        else:
+            action_list = ActionList(name)
+        self.eventProcessors.append(action_list)
+
+    def clear(self):
+        """Remove all event processors, keeping their action lists for reuse. This also
+        determines whether actions for the next event should be traced.
+        """
+        self.spare_lists.extend(self.eventProcessors)
+        self.eventProcessors.clear()
+
+        self.tracing = internal.logger.isEnabled(internal.consts.DEBUG.EVENT_ACTIONS)
+        self.hint_msg = ""
+        self.processor_hint_msg = ""
 
     
     def appendAction(self, act, silent=False, handle_type=internal.consts.EVENT_NO_HANDLE):
@@ -439,6 +665,10 @@ class ActionPrinter:
             silent (bool, optional): Whether the action should be set as a hint message. Defaults to False.
             handled (int, optional): How the action handled/ignored the event. Defaults to internal.consts.EVENT_NO_HANDLE.
         """
+        if not self.tracing:
+            if not silent:
+                self.processor_hint_msg = act
+            return
 
         # Add some random processor if a processor doesn't exist for some reason
         if len(self.eventProcessors) == 0:
@@ -447,21 +677,44 @@ class ActionPrinter:
         # Append the action
         self.eventProcessors[len(self.eventProcessors) - 1].appendAction(act, silent, handle_type)
 
+    def commitHintMsg(self):
+        """When not tracing, use the latest hint message of the current processor as the hint 
+        message for the event, if it is valid.
+        """
+        # Might want to fix this some time, some handler modules append this manually
+        if self.processor_hint_msg != "" and self.processor_hint_msg != "[Did not handle]":
+            self.hint_msg = self.processor_hint_msg
+        self.processor_hint_msg = ""
+
+    def getHintMsg(self):
+        """Returns the hint message that would be set for the actions taken (ignores silent
+        messages)
+
+        Returns:
+            str: hint message, or an empty string if there isn't one
+        """
+        if self.tracing:
+            hint_msg = ""
+            for x in range(len(self.eventProcessors)):
+                cur_msg = self.eventProcessors[x].getHintMsg()
+
+                # Might want to fix this some time, some handler modules append this manually
+                if cur_msg != "" and cur_msg != "[Did not handle]":
+                    hint_msg = cur_msg
+            return hint_msg
+        else:
+            self.commitHintMsg()
+            return self.hint_msg
+
     def flush(self):
         """Log all actions taken, and set a hint message if applicable
         """
-        # Log all actions taken
-        for x in range(len(self.eventProcessors)):
-            internal.debugLog(self.eventProcessors[x].getString(), internal.consts.DEBUG.EVENT_ACTIONS)
+        if self.tracing:
+            # Log all actions taken
+            for x in range(len(self.eventProcessors)):
+                internal.debugLog(self.eventProcessors[x].getString(), internal.consts.DEBUG.EVENT_ACTIONS)
 
-        # Get hint message to set (ignores silent messages)
-        hint_msg = ""
-        for x in range(len(self.eventProcessors)):
-            cur_msg = self.eventProcessors[x].getHintMsg()
-
-            # Might want to fix this some time, some handler modules append this manually
-            if cur_msg != "" and cur_msg != "[Did not handle]":
-                hint_msg = cur_msg
+        hint_msg = self.getHintMsg()
 
         if hint_msg != "":
             # Sometimes this fails...
@@ -469,12 +722,14 @@ class ActionPrinter:
                 ui.setHintMsg(hint_msg)
             except:
                 pass
-        self.eventProcessors.clear()
+        self.clear()
 
 
 class RawEvent:
     """Stores event in raw form. A quick way to generate events for editing.
     """
+    __slots__ = ["status", "data1", "data2"]
+
     def __init__(self, status, data1, data2):
         """Create a RawEvent object
 
@@ -488,18 +743,490 @@ class RawEvent:
         self.data2 = data2
 
 
+class BatchEvent:
+    """Event used when processing a batch of events. Has the same attributes as the FL Studio
+    events that ParsedEvent objects are created from.
+    """
+    __slots__ = ["status", "data1", "data2", "sysex", "pmeFlags", "handled"]
+
+    def __init__(self):
+        """Create a BatchEvent object. Its data is set using set()
+        """
+        self.set(0, 0, 0, None, 0)
+
+    def set(self, status, data1, data2, sysex, pmeFlags):
+        """Set the data of the event
+
+        Args:
+            status (int): Status byte
+            data1 (int): First data byte
+            data2 (int): 2nd data byte
+            sysex (bytes): SysEx data, or None
+            pmeFlags (int): PME flags
+        """
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.sysex = sysex
+        self.pmeFlags = pmeFlags
+        self.handled = False
+
+
+class BatchSummary:
+    """Aggregated results of processing a batch of events
+    """
+    def __init__(self):
+        """Create an empty BatchSummary
+        """
+        self.num_events = 0
+        self.num_handled = 0
+        self.num_ignored = 0
+        self.num_edited = 0
+        self.total_time = 0.0
+        
+        # Event type -> number of events
+        self.types = dict()
+        # Hint message -> number of events
+        self.actions = dict()
+
+    def addEvent(self, command):
+        """Add the results of a processed event to the summary
+
+        Args:
+            command (ParsedEvent): event that has been processed
+        """
+        self.num_events += 1
+        if command.handled:
+            self.num_handled += 1
+        if command.ignored:
+            self.num_ignored += 1
+        if command.edited:
+            self.num_edited += 1
+        
+        self.types[command.type] = self.types.get(command.type, 0) + 1
+        
+        hint_msg = command.actions.getHintMsg()
+        if hint_msg != "":
+            self.actions[hint_msg] = self.actions.get(hint_msg, 0) + 1
+
+    def getEventsPerSecond(self):
+        """Returns the rate that events were processed at
+
+        Returns:
+            float: events per second
+        """
+        if self.total_time == 0:
+            return 0.0
+        return self.num_events / self.total_time
+
+    def getString(self, num_actions=10):
+        """Returns a string summarising the batch
+
+        Args:
+            num_actions (int, optional): Number of most common actions to include. Defaults to 10.
+
+        Returns:
+            str: summary
+        """
+        out = internal.getLineBreak() + "\n"
+        out += "Batch of " + str(self.num_events) + " events\n"
+        out += internal.getTab("Processed in:") + str(round(self.total_time, 4)) + " seconds ("
+        out += str(round(self.getEventsPerSecond())) + " events/s)\n"
+        out += internal.getTab("Handled:") + str(self.num_handled) + "\n"
+        out += internal.getTab("Ignored:") + str(self.num_ignored) + "\n"
+        out += internal.getTab("Edited:") + str(self.num_edited) + "\n"
+        
+        out += "Event types:\n"
+        for event_type, num in sorted(self.types.items(), key=lambda x: -x[1]):
+            out += internal.getTab("  " + eventconsts.TYPE_NAMES.get(event_type, str(event_type)) + ":", 2) + str(num) + "\n"
+        
+        out += "Actions:\n"
+        for action, num in sorted(self.actions.items(), key=lambda x: -x[1])[:num_actions]:
+            out += internal.getTab("  " + str(num)) + action + "\n"
+        
+        out += internal.getLineBreak()
+        return out
+
+    def print(self):
+        """Print the summary
+        """
+        internal.debugLog(self.getString(), internal.consts.DEBUG.PROCESSOR_PERFORMANCE)
+
+
+class RedrawCacheEntry:
+    """Inputs and output of a processor's last redraw. Buffers are allocated once, and overwritten
+    when the processor is redrawn.
+    """
+    __slots__ = [
+        "key", "solid_in", "frozen_in", "colours_in", "states_in",
+        "solid_out", "frozen_out", "colours_out", "states_out"
+    ]
+
+    def __init__(self, lights):
+        """Create an entry with buffers the same size as a LightMap
+
+        Args:
+            lights (LightMap): lights to size buffers from
+        """
+        self.key = None
+        self.solid_in = False
+        self.frozen_in = bytearray(lights.frozen)
+        self.colours_in = array.array('b', lights.colours)
+        self.states_in = array.array('b', lights.states)
+        self.solid_out = False
+        self.frozen_out = bytearray(lights.frozen)
+        self.colours_out = array.array('b', lights.colours)
+        self.states_out = array.array('b', lights.states)
+
+
+class RedrawCache:
+    """Stores what processors drew during previous redraws, so that processors whose output 
+    wouldn't change aren't redrawn.
+    
+    Processors opt in by defining a getRedrawKey() function, which returns a cheap value describing
+    everything that their redraw() depends on (eg the animation tick and active mode), or None to
+    always redraw. If the key and the lights drawn before the processor are the same as last time,
+    the processor's previous output is reused instead of calling redraw().
+    
+    Lights are compared with and copied into buffers stored for each processor, so no new buffers
+    are created during redraws.
+    
+    The cache is cleared when the animation tick is reset.
+    """
+    def __init__(self):
+        """Create instance of RedrawCache
+        """
+        # Processor -> RedrawCacheEntry
+        self.entries = dict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def invalidate(self):
+        """Forget all stored redraws
+        """
+        for entry in self.entries.values():
+            entry.key = None
+
+    def redraw(self, processor, lights):
+        """Redraw a processor, reusing its previous output if nothing has changed
+
+        Args:
+            processor (module): processor to redraw
+            lights (LightMap): lights to draw to
+        """
+        getRedrawKey = getattr(processor, "getRedrawKey", None)
+        key = None if getRedrawKey is None else getRedrawKey()
+        if key is None:
+            processor.redraw(lights)
+            return
+        
+        entry = self.entries.get(processor)
+        if entry is None:
+            entry = RedrawCacheEntry(lights)
+            self.entries[processor] = entry
+        elif (entry.key is not None and entry.key == key and entry.solid_in == lights.is_solid
+              and entry.frozen_in == lights.frozen and entry.colours_in == lights.colours 
+              and entry.states_in == lights.states):
+            lights.frozen[:] = entry.frozen_out
+            lights.colours[:] = entry.colours_out
+            lights.states[:] = entry.states_out
+            lights.is_solid = entry.solid_out
+            self.num_hits += 1
+            return
+        
+        # Not reused until the redraw has finished
+        entry.key = None
+        entry.solid_in = lights.is_solid
+        entry.frozen_in[:] = lights.frozen
+        entry.colours_in[:] = lights.colours
+        entry.states_in[:] = lights.states
+        
+        processor.redraw(lights)
+        
+        entry.solid_out = lights.is_solid
+        entry.frozen_out[:] = lights.frozen
+        entry.colours_out[:] = lights.colours
+        entry.states_out[:] = lights.states
+        entry.key = key
+        self.num_misses += 1
+
+    def getHitRate(self):
+        """Returns the proportion of cached redraws that reused previous output
+
+        Returns:
+            float: hit rate (0-1)
+        """
+        total = self.num_hits + self.num_misses
+        if total == 0:
+            return 0.0
+        return self.num_hits / total
+
+    def getString(self):
+        """Returns a summary of cache usage
+
+        Returns:
+            str: summary
+        """
+        return "Redraw cache: " + str(self.num_hits) + " hits, " + str(self.num_misses) + " misses (" \
+            + str(round(self.getHitRate() * 100)) + "% hit rate)"
+
+redrawCache = RedrawCache()
+
+
+class EventTable:
+    """Lookup table used to classify events. It is indexed by event ID (status + (data1 << 8)),
+    and each entry contains the event type, X and Y coordinates and whether the event is binary,
+    so that events can be parsed without searching through each list of IDs in eventconsts.
+    """
+
+    # Event IDs of valid MIDI messages are always less than this
+    SIZE = 0x8000
+
+    # Entry for events that aren't recognised
+    UNRECOGNISED = (eventconsts.TYPE_UNRECOGNISED, None, None, False)
+
+    def __init__(self):
+        """Create instance of EventTable, and build the table
+        """
+        self.entries = []
+        self.build()
+
+    def build(self):
+        """Builds the lookup table. This is called when the script is imported, and again
+        whenever the device type changes.
+        """
+        table = [self.UNRECOGNISED] * self.SIZE
+
+        # Entries are added from lowest to highest priority, so that IDs which appear in multiple
+        # places are classified the same way as they were by the old chain of checks
+
+        # Notes on any channel
+        note_entry = (eventconsts.TYPE_NOTE, None, None, True)
+        for status in range(0x80, 0xA0):
+            for data1 in range(128):
+                table[status + (data1 << 8)] = note_entry
+
+        # Pads are actually note events: remove other notes from the pad channels
+        pad_statuses = [0x9F, 0x8F, 0x99, 0x89]
+        for status in pad_statuses:
+            for data1 in range(128):
+                table[status + (data1 << 8)] = self.UNRECOGNISED
+
+        # Then add the pads themselves
+        for note, (x, y, extended) in padMap.pads.items():
+            if extended:
+                pad_type = eventconsts.TYPE_PAD
+            else:
+                pad_type = eventconsts.TYPE_BASIC_PAD
+            for status in pad_statuses:
+                table[status + (note << 8)] = (pad_type, x, y, True)
+
+        # Basic circular pads
+        for y in range(len(eventconsts.BasicPads[8])):
+            table[0xB0 + (eventconsts.BasicPads[8][y] << 8)] = (eventconsts.TYPE_BASIC_PAD, 8, y, True)
+
+        # Basic events
+        for id_val in eventconsts.BasicEvents:
+            table[id_val] = (eventconsts.TYPE_BASIC_EVENT, None, None, id_val == eventconsts.PEDAL)
+
+        # Controls with an X coordinate
+        for id_list, event_type, is_binary in [
+            (eventconsts.BasicFaderButtons, eventconsts.TYPE_BASIC_FADER_BUTTON, True),
+            (eventconsts.FaderButtons, eventconsts.TYPE_FADER_BUTTON, True),
+            (eventconsts.BasicFaders, eventconsts.TYPE_BASIC_FADER, False),
+            (eventconsts.Faders, eventconsts.TYPE_FADER, False),
+            (eventconsts.BasicKnobs, eventconsts.TYPE_BASIC_KNOB, False),
+            (eventconsts.Knobs, eventconsts.TYPE_KNOB, False)
+        ]:
+            for x in range(len(id_list)):
+                table[id_list[x]] = (event_type, x, None, is_binary)
+
+        # Buttons
+        for id_list, event_type in [
+            (eventconsts.TransportControls, eventconsts.TYPE_TRANSPORT),
+            (eventconsts.SystemMessages, eventconsts.TYPE_SYSTEM_MSG),
+            (eventconsts.InControlButtons, eventconsts.TYPE_INCONTROL)
+        ]:
+            for id_val in id_list:
+                table[id_val] = (event_type, None, None, True)
+
+        self.entries = table
+
+    def get(self, id_val):
+        """Returns the table entry for an event
+
+        Args:
+            id_val (int): Event ID
+
+        Returns:
+            tuple: type, coord_X, coord_Y, isBinary. Coordinates are None if they don't apply.
+        """
+        if 0 <= id_val < self.SIZE:
+            return self.entries[id_val]
+        return self.UNRECOGNISED
+
+eventTable = EventTable()
+
+
+# PME flag bitmasks
+PME_SYSTEM = internal.flags.PME.System
+PME_SYSTEM_SAFE = internal.flags.PME.System_Safe
+PME_PREVIEW_NOTE = internal.flags.PME.PreviewNote
+PME_FROM_HOST = internal.flags.PME.FromHost
+PME_FROM_MIDI = internal.flags.PME.FromMIDI
+
+# "Event:" label padded to a tab, at the start of event info
+EVENT_INFO_LABEL = "Event:".ljust(internal.consts.LOG_TAB_LENGTH)
+
+class ProcessorRoutes:
+    """Sends events to the processor modules that can act on them.
+    
+    Processor modules can declare the events they act on using EVENT_TYPES (a list of event types)
+    and EVENT_IDS (a list of event IDs). Processors that don't declare either of these receive all
+    events. A route of processors is compiled for each event type, and routes are rebuilt whenever
+    the active processors might change (see invalidateRoutes()).
+    """
+    def __init__(self, findProcessors):
+        """Create instance of ProcessorRoutes
+
+        Args:
+            findProcessors (function): returns a list of the processor modules that are currently
+                active, in the order they should be called
+        """
+        self.findProcessors = findProcessors
+        self.processors = []
+        self.routes = dict()
+        self.valid = False
+        
+        processor_routes.append(self)
+
+    def build(self):
+        """Compile the route for each event type
+        """
+        self.processors = list(self.findProcessors())
+        self.routes = {event_type: [] for event_type in eventconsts.TYPE_NAMES}
+        
+        for index, processor in enumerate(self.processors):
+            types = getProcessorTypes(processor)
+            for event_type, route in self.routes.items():
+                if types is None or event_type in types:
+                    route.append((index, processor.process))
+        
+        self.valid = True
+
+    def invalidate(self):
+        """Rebuild routes before the next event is processed
+        """
+        self.valid = False
+
+    def getProcessors(self):
+        """Returns the processor modules that are currently active
+
+        Returns:
+            list: processor modules
+        """
+        if not self.valid:
+            self.build()
+        return self.processors
+
+    def process(self, command):
+        """Send an event to each processor that can act on it, stopping if the event is ignored
+
+        Args:
+            command (ParsedEvent): event to process
+        """
+        if not self.valid:
+            self.build()
+        
+        event_type = command.type
+        route = self.routes[event_type]
+        i = 0
+        while i < len(route):
+            index, process = route[i]
+            process(command)
+            if command.ignored: return
+            i += 1
+            
+            # If the event was edited to a different type, continue along the route for that type
+            if command.type != event_type:
+                event_type = command.type
+                route = self.routes[event_type]
+                i = 0
+                while i < len(route) and route[i][0] <= index:
+                    i += 1
+
+# List of all ProcessorRoutes objects
+processor_routes = []
+
+def getProcessorTypes(processor):
+    """Returns the event types that a processor module acts on
+
+    Args:
+        processor (module): processor module
+
+    Returns:
+        set: event types, or None if the processor acts on all events
+    """
+    event_types = getattr(processor, "EVENT_TYPES", None)
+    event_ids = getattr(processor, "EVENT_IDS", None)
+    if event_types is None and event_ids is None:
+        return None
+    
+    types = set()
+    if event_types is not None:
+        types.update(event_types)
+    if event_ids is not None:
+        for id_val in event_ids:
+            types.add(eventTable.get(id_val)[0])
+    return types
+
+def invalidateRoutes():
+    """Rebuild all processor routes. Called when the active window, plugin, note mode or device
+    type changes.
+    """
+    for routes in processor_routes:
+        routes.invalidate()
+
+
 class ParsedEvent:
     """Stores data about an event, including useful parsed data
     """
+    __slots__ = [
+        "recieved_internal", "edited", "actions", "handled", "ignored",
+        "status", "note", "data1", "value", "data2", "status_nibble", "channel", "id", "sysex",
+        "pme_flags",
+        "type", "isBinary", "coord_X", "coord_Y", "is_lift", "is_long_press", "is_double_click",
+        "is_triple_click"
+    ]
+    
+    # Attributes copied by copy(), which are needed to describe the event
+    COPIED_ATTRS = [
+        "recieved_internal", "edited", "handled", "ignored",
+        "status", "note", "data1", "value", "data2", "status_nibble", "channel", "id", "sysex",
+        "pme_flags",
+        "type", "isBinary", "coord_X", "coord_Y", "is_lift", "is_long_press", "is_double_click",
+        "is_triple_click"
+    ]
+
     def __init__(self, event):
         """Create ParsedEvent from event object
 
+        Args:
+            event (MIDI Event): FL Studio MIDI Event
+        """
+        self.actions = ActionPrinter()
+        self.reset(event)
+
+    def reset(self, event):
+        """Set this object's data from a new event, clearing all data about the previous event.
+        Used to reuse ParsedEvent objects (see ParsedEventPool).
+
         Args:
             event (MIDI Event): FL Studio MIDI Event
         """
         self.recieved_internal = False
         self.edited = False
-        self.actions = ActionPrinter()
+        self.actions.clear()
 
         self.handled = False
         self.ignored = False
@@ -513,13 +1240,17 @@ class ParsedEvent:
         self.data2 = event.data2
         
         self.status_nibble = event.status >> 4              # Get first half of status byte
-        self.channel = event.status & int('00001111', 2)    # Get 2nd half of status byte
+        self.channel = event.status & 0x0F                  # Get 2nd half of status byte
+        
+        # Coordinates are set when parsing, if they apply to the event
+        self.coord_X = -1
+        self.coord_Y = -1
         
         if self.channel == internal.consts.INTERNAL_CHANNEL_STATUS:
             self.recieved_internal = True
 
-        # PME Flags to make sure errors don't happen or something
-        self.processPmeFlags(event.pmeFlags)
+        # PME Flags to make sure errors don't happen or something. These are decoded when accessed
+        self.pme_flags = event.pmeFlags
 
         # Add sysex information
         self.sysex = event.sysex
@@ -537,88 +1268,18 @@ class ParsedEvent:
         """Parses information about the event
         """
         
-        # Indicates whether to consider as a value or as an on/off
-        self.isBinary = False
-
-        
-
-        # Determine type of event | unrecognised by default
-        self.type = eventconsts.TYPE_UNRECOGNISED
-
-        # If using basic port, check for notes
-
+        # Determine type of event, as well as whether to consider it as a value or as an on/off
         if self.status == eventconsts.SYSEX:
             self.type = eventconsts.TYPE_SYSEX_EVENT
+            self.isBinary = False
+
+        else:
+            self.type, coord_X, coord_Y, self.isBinary = eventTable.get(self.id)
+            if coord_X is not None:
+                self.coord_X = coord_X
+            if coord_Y is not None:
+                self.coord_Y = coord_Y
 
-        elif self.id in eventconsts.InControlButtons: 
-            self.type = eventconsts.TYPE_INCONTROL
-            self.isBinary = True
-
-        elif self.id in eventconsts.SystemMessages: 
-            self.type = eventconsts.TYPE_SYSTEM_MSG
-            self.isBinary = True
-
-        elif self.id in eventconsts.TransportControls: 
-            self.type = eventconsts.TYPE_TRANSPORT
-            self.isBinary = True
-
-        elif self.id in eventconsts.Knobs: 
-            self.type = eventconsts.TYPE_KNOB
-            self.coord_X = self.note - 0x15
-
-        elif self.id in eventconsts.BasicKnobs: 
-            self.type = eventconsts.TYPE_BASIC_KNOB
-            self.coord_X = self.note - 0x15
-
-        elif self.id in eventconsts.Faders: 
-            self.type = eventconsts.TYPE_FADER
-            self.coord_X = self.note - 0x29
-            if self.note == 0x07: self.coord_X = 8
-
-        elif self.id in eventconsts.BasicFaders: 
-            self.type = eventconsts.TYPE_BASIC_FADER
-            self.coord_X = self.note - 0x29
-            if self.note == 0x07: self.coord_X = 8
-
-        elif self.id in eventconsts.FaderButtons: 
-            self.type = eventconsts.TYPE_FADER_BUTTON
-            self.coord_X = self.note - 0x33
-            self.isBinary = True
-
-        elif self.id in eventconsts.BasicFaderButtons: 
-            self.type = eventconsts.TYPE_BASIC_FADER_BUTTON
-            self.coord_X = self.note - 0x33
-            self.isBinary = True
-        
-        elif self.id in eventconsts.BasicEvents:
-            self.type = eventconsts.TYPE_BASIC_EVENT
-            if self.id == eventconsts.PEDAL:
-                self.isBinary = True
-
-        elif self.status_nibble == eventconsts.NOTE_ON or self.status_nibble == eventconsts.NOTE_OFF:
-            # Pads are actually note events
-            if (self.status == 0x9F or self.status == 0x8F) or ((self.status == 0x99 or self.status == 0x89)):
-                x, y = self.getPadCoord()
-                if x != -1 and y != -1:
-                    # Is a pad
-                    self.coord_X = x
-                    self.coord_Y = y
-                    self.isBinary = True
-                    if self.isPadExtendedMode():
-                        self.type = eventconsts.TYPE_PAD
-                    else:
-                        self.type = eventconsts.TYPE_BASIC_PAD
-            else:
-                self.type = eventconsts.TYPE_NOTE
-                self.isBinary = True
-
-        # Detect basic circular pads
-        elif self.status == 0xB0 and self.note in eventconsts.BasicPads[8]:
-            self.type = eventconsts.TYPE_BASIC_PAD
-            self.coord_X = 8
-            self.coord_Y = eventconsts.BasicPads[8].index(self.note)
-            self.isBinary = True
-        
         if self.recieved_internal:
             self.type = eventconsts.TYPE_INTERNAL_EVENT
         
@@ -630,26 +1291,28 @@ class ParsedEvent:
         
         # Don't process these for internal events
         if self.type != eventconsts.TYPE_INTERNAL_EVENT:
-            
-        
-            # Process long presses
-            if self.is_lift:
-                self.is_long_press = isLongPressLift(self.id)
-            else:
-                self.is_long_press = False
-
-            # Process double presses (seperate for lifted and pressed buttons)
-            self.is_double_click = False
-            if self.isBinary is True: 
-                if self.is_lift is True:
-                    self.is_double_click = isDoubleClickLift(self.id)
-                elif self.is_lift is False and self.isBinary is True: 
-                    self.is_double_click = isDoubleClickPress(self.id)
+            # Edited events keep the gesture flags of the original event, so that remapping an
+            # event doesn't register a second press
+            if not self.edited:
+                gestures.process(self)
         
         else:
             self.is_double_click = False
+            self.is_triple_click = False
             self.is_long_press = False
         
+    def copy(self):
+        """Returns a copy of the event's data, which can be used to describe the event after it
+        has been changed. The copy doesn't have any actions.
+
+        Returns:
+            ParsedEvent: copy of event
+        """
+        other = ParsedEvent.__new__(ParsedEvent)
+        for attr in self.COPIED_ATTRS:
+            setattr(other, attr, getattr(self, attr))
+        return other
+
     def edit(self, event, reason):
         """Edit the event to change data
 
@@ -667,17 +1330,16 @@ class ParsedEvent:
         self.data2 = event.data2
         
         self.status_nibble = event.status >> 4              # Get first half of status byte
-        self.channel = event.status & int('00001111', 2)    # Get 2nd half of status byte
+        self.channel = event.status & 0x0F                  # Get 2nd half of status byte
 
         # Bit-shift status and data bytes to get event ID
         self.id = (self.status + (self.note << 8))
 
         self.parse()
-        newEventStr = "Changed event: " + reason
-        if internal.consts.DEBUG.EVENT_DATA in config.CONSOLE_DEBUG_MODE:
-            newEventStr += "\n" + self.getInfo()
-
-        self.act(newEventStr)
+        
+        # Silent actions are only kept when tracing, so don't bother describing the event otherwise
+        if self.actions.tracing:
+            self.act(EventDescription(self, "Changed event: " + reason))
     
     def handle(self, action, silent=False):
         """Handles the event and prevents further processing, both in the script and in FL Studio.
@@ -717,41 +1379,36 @@ class ParsedEvent:
         """
         self.actions.addProcessor(name)
     
-    def getInfo(self):
+    def getInfo(self, shift=None):
         """Returns info about event
 
+        Args:
+            shift (str, optional): Name of the shift button that was held down when the event was
+                processed, or an empty string if there wasn't one. Defaults to the current shift.
+
         Returns:
             str: Details about the event
         """
-        out = "Event:"
-        out = internal.getTab(out)
+        if shift is None:
+            shift = internal.shifts.current_down if internal.shifts.query() else ""
 
-        # Event type and ID
-        temp = self.getType()
-        out += temp
-        out = internal.getTab(out)
-
-        # Event value
-        temp = self.getValue()
-        out += temp
-        out = internal.getTab(out)
+        # Event type, ID and value, after "Event:" padded to a tab
+        out = internal.getTab(internal.getTab(EVENT_INFO_LABEL + self.getType()) + self.getValue())
 
         # Event full data
-        temp = self.getDataString()
-        out += temp
-        out = internal.getTab(out)
+        out = internal.getTab(out + self.getDataString())
 
-        if self.is_double_click:
-            out += "[Double Click]"
-            out = internal.getTab(out)
+        if self.is_triple_click:
+            out = internal.getTab(out + "[Triple Click]")
+        
+        elif self.is_double_click:
+            out = internal.getTab(out + "[Double Click]")
         
         if self.is_long_press:
-            out += "[Long Press]"
-            out = internal.getTab(out)
+            out = internal.getTab(out + "[Long Press]")
         
-        if internal.shifts.query():
-            out += "[Shifted | " + internal.shifts.current_down + "]"
-            out = internal.getTab(out)
+        if shift != "":
+            out = internal.getTab(out + "[Shifted | " + shift + "]")
         
         """ # Add this back soon hopefully
         if self.id == config.SHIFT_BUTTON:
@@ -761,7 +1418,7 @@ class ParsedEvent:
         
         # For internal events, have a different printing  flag
         if self.type == eventconsts.TYPE_INTERNAL_EVENT:
-            if not internal.consts.DEBUG.PRINT_INTERNAL_EVENTS in config.CONSOLE_DEBUG_MODE:
+            if not internal.logger.isEnabled(internal.consts.DEBUG.PRINT_INTERNAL_EVENTS):
                 out = ""
         
         return out
@@ -770,13 +1427,13 @@ class ParsedEvent:
     def printInfo(self):
         """Prints string info about event
         """
-        internal.debugLog(self.getInfo(), internal.consts.DEBUG.EVENT_DATA)
+        internal.debugLog(EventDescription(self, copy=False), internal.consts.DEBUG.EVENT_DATA)
     
     
     def printOutput(self):
         """Prints actions taken whilst handling event
         """
-        if internal.consts.DEBUG.PRINT_INTERNAL_EVENTS in config.CONSOLE_DEBUG_MODE or self.type != eventconsts.TYPE_INTERNAL_EVENT:
+        if internal.logger.isEnabled(internal.consts.DEBUG.PRINT_INTERNAL_EVENTS) or self.type != eventconsts.TYPE_INTERNAL_EVENT:
             internal.debugLog("", internal.consts.DEBUG.EVENT_ACTIONS)
             self.actions.flush()
             if self.handled:
@@ -835,26 +1492,36 @@ class ParsedEvent:
         a = internal.getTab(a)
         return a + b
 
-    def processPmeFlags(self, flags):
-        """Processes PME flags on event (Currently very broken)
+    @property
+    def pme_system(self):
+        """Whether the PME_System flag is set (system operations are allowed)
+        """
+        return self.pme_flags & PME_SYSTEM != 0
 
-        Args:
-            flags (int): PME flags
+    @property
+    def pme_system_safe(self):
+        """Whether the PME_System_Safe flag is set (critical operations are allowed)
         """
-        #print(flags)
-        bin_string = format(flags, '8b')[:5]
-        #print(bin_string)
-        flags_list = [x == '1' for x in bin_string]
-        self.pme_system = flags_list[0]
-        
-        self.pme_system_safe = flags_list[1]
-        
-        self.pme_preview_note = flags_list[2]
-        
-        self.pme_from_host = flags_list[3]
-        
-        self.pme_from_midi = flags_list[4]
-        
+        return self.pme_flags & PME_SYSTEM_SAFE != 0
+
+    @property
+    def pme_preview_note(self):
+        """Whether the PME_PreviewNote flag is set (note events will trigger a preview note)
+        """
+        return self.pme_flags & PME_PREVIEW_NOTE != 0
+
+    @property
+    def pme_from_host(self):
+        """Whether the PME_FromHost flag is set (event came from the host)
+        """
+        return self.pme_flags & PME_FROM_HOST != 0
+
+    @property
+    def pme_from_midi(self):
+        """Whether the PME_FromMIDI flag is set (event came from a MIDI device)
+        """
+        return self.pme_flags & PME_FROM_MIDI != 0
+
 
     def getID_System(self):
         """Returns string event ID for system events
@@ -962,18 +1629,7 @@ class ParsedEvent:
             int: X
             int: Y
         """
-        y_map = -1
-        x_map = -1
-        done_flag = False
-        for x in range(len(eventconsts.Pads)):
-            for y in range(len(eventconsts.Pads[x])):
-                if self.note == eventconsts.Pads[x][y] or self.note == eventconsts.BasicPads[x][y]:
-                    y_map = y
-                    x_map = x
-                    done_flag = True
-                    break
-            if done_flag: break
-        return x_map, y_map
+        return padMap.getCoord(self.note)
 
     
     def isPadExtendedMode(self):
@@ -982,8 +1638,8 @@ class ParsedEvent:
         Returns:
             bool: whether pad is extended
         """
-        if self.note == eventconsts.Pads[self.coord_X][self.coord_Y]: return True
-        elif self.note == eventconsts.BasicPads[self.coord_X][self.coord_Y]: return False
+        pad = padMap.getPad(self.note)
+        if pad is not None: return pad[2]
         else: print("ERROR!!?")
 
     
@@ -1012,20 +1668,9 @@ class ParsedEvent:
         if self.type is eventconsts.TYPE_SYSEX_EVENT:
             return str(self.sysex)
 
-        # Append hex value of ID
-        a = str(hex(self.id + (self.value << 16)))
-        # If string requires leading zeros
-        if len(a) == 7: a = "0x0" + a[2:].upper()
-        elif len(a) == 6: a = "0x00" + a[2:].upper()
-        elif len(a) == 5: a = "0x000" + a[2:].upper()
-        elif len(a) == 4: a = "0x0000" + a[2:].upper()
-        elif len(a) == 3: a = "0x00000" + a[2:].upper()
-        elif len(a) == 2: a = "0x000000" + a[2:].upper()
-        else: a = "0x" + a[2:].upper()
-
-        a = a[:2] + " " + a[2:4] + " " + a[4:6] + " " + a[6:8]
-        
-        return a
+        # Hex value of ID, with leading zeros
+        a = "%06X" % (self.id + (self.value << 16))
+        return "0x " + a[:2] + " " + a[2:4] + " " + a[4:6]
 
     
     def getDataMIDI(self):
@@ -1036,6 +1681,186 @@ class ParsedEvent:
         """
         return internal.toMidiMessage(self.status, self.note, self.value)
 
+
+class EventDescription:
+    """Description of an event that is only formatted when it is converted to a string, so that
+    events don't need to be formatted unless a debug message will actually be printed.
+    """
+    __slots__ = ["event", "prefix", "shift"]
+
+    def __init__(self, event, prefix="", copy=True):
+        """Create an EventDescription
+
+        Args:
+            event (ParsedEvent): event to describe
+            prefix (str, optional): String to print before the event info. Defaults to "".
+            copy (bool, optional): Whether to copy the event data, so that the description doesn't
+                change if the event is edited or reused. If False, the description must be used
+                straight away. Defaults to True.
+        """
+        self.prefix = prefix
+        if copy:
+            self.event = event.copy()
+            self.shift = internal.shifts.current_down if internal.shifts.query() else ""
+        else:
+            self.event = event
+            self.shift = None
+
+    def __str__(self):
+        """Formats the description. The event info is only included when event data is being
+        logged.
+
+        Returns:
+            str: description of the event
+        """
+        if not internal.logger.isEnabled(internal.consts.DEBUG.EVENT_DATA):
+            return self.prefix
+        if self.prefix == "":
+            return self.event.getInfo(self.shift)
+        return self.prefix + "\n" + self.event.getInfo(self.shift)
+
+
+class ParsedEventPool:
+    """Keeps ParsedEvent objects once they have been processed so that they can be reused for new
+    events, rather than allocating a new object for every MIDI message.
+    
+    Events from the pool are only valid until they are released: processors that need to keep 
+    event data for longer should copy it into a RawEvent.
+    """
+    def __init__(self, size):
+        """Create instance of ParsedEventPool
+
+        Args:
+            size (int): Maximum number of unused events to keep
+        """
+        self.size = size
+        self.free = []
+        self.num_created = 0
+        self.num_reused = 0
+
+    def acquire(self, event):
+        """Returns a ParsedEvent for an FL Studio event, reusing an old object if one is available
+
+        Args:
+            event (MIDI Event): FL Studio MIDI Event
+
+        Returns:
+            ParsedEvent: parsed event
+        """
+        if len(self.free):
+            command = self.free.pop()
+            command.reset(event)
+            self.num_reused += 1
+        else:
+            command = ParsedEvent(event)
+            self.num_created += 1
+        return command
+
+    def release(self, command):
+        """Return a ParsedEvent to the pool once it has been fully processed
+
+        Args:
+            command (ParsedEvent): event that is no longer in use
+        """
+        if len(self.free) < self.size:
+            self.free.append(command)
+
+eventPool = ParsedEventPool(internal.consts.EVENT_POOL_SIZE)
+
+
+class ControlCoalescer:
+    """Holds back changes to continuous controls (faders and knobs) so that a flood of changes is
+    processed once, using the latest value of each control, rather than once per MIDI message.
+    Pending changes are processed on idle, or when the oldest one has waited for longer than
+    config.COALESCE_LATENCY. Buttons and notes are never held back.
+    
+    Only used if config.COALESCE_CONTROLS is enabled.
+    """
+
+    # Event types that are coalesced
+    TYPES = (
+        eventconsts.TYPE_FADER, eventconsts.TYPE_KNOB, 
+        eventconsts.TYPE_BASIC_FADER, eventconsts.TYPE_BASIC_KNOB
+    )
+
+    def __init__(self):
+        """Create instance of ControlCoalescer
+        """
+        # Event ID -> (status, data1, data2, pmeFlags) of latest change
+        self.pending = dict()
+        self.first_time = 0.0
+        self.flushing = False
+        self.event = BatchEvent()
+        
+        self.num_deferred = 0
+        self.num_applied = 0
+
+    def defer(self, command):
+        """Hold back an event if it is a change to a continuous control. The event is handled, 
+        and its data is processed later by flush().
+
+        Args:
+            command (ParsedEvent): event to check
+
+        Returns:
+            bool: whether the event was held back (in which case it shouldn't be processed)
+        """
+        if not config.COALESCE_CONTROLS or self.flushing or command.edited \
+            or command.type not in self.TYPES:
+            return False
+        
+        if not len(self.pending):
+            self.first_time = time.perf_counter()
+        self.pending[command.id] = (command.status, command.data1, command.data2, command.pme_flags)
+        self.num_deferred += 1
+        command.handle("Coalesce control change", True)
+        return True
+
+    def isDue(self):
+        """Returns whether pending changes have been held back for longer than the latency budget
+
+        Returns:
+            bool: whether flush() should be called
+        """
+        return len(self.pending) != 0 and time.perf_counter() - self.first_time >= config.COALESCE_LATENCY
+
+    def flush(self, process):
+        """Process the latest change to each control that has been held back
+
+        Args:
+            process (function): event processor to call for each change (eg 
+                eventprocessor.processExtended)
+        """
+        if not len(self.pending):
+            return
+        
+        pending = self.pending
+        self.pending = dict()
+        self.flushing = True
+        try:
+            event = self.event
+            for status, data1, data2, pme_flags in pending.values():
+                event.set(status, data1, data2, None, pme_flags)
+                command = eventPool.acquire(event)
+                internal.printCommand(command)
+                if not event.handled:
+                    process(command)
+                internal.printCommandOutput(command)
+                eventPool.release(command)
+                self.num_applied += 1
+        finally:
+            self.flushing = False
+
+    def getString(self):
+        """Returns a summary of control changes received and processed
+
+        Returns:
+            str: summary
+        """
+        return "Control changes: " + str(self.num_deferred) + " received, " + str(self.num_applied) + " processed"
+
+controlCoalescer = ControlCoalescer()
+
 #-------------------------
 # KEYSWITCH FUNCTIONS
 #-------------------------
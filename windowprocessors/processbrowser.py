@@ -16,6 +16,9 @@ import internal
 import config
 import lightingconsts
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_PAD]
+
 def activeStart():
     
     return
@@ -32,6 +35,12 @@ def topWindowEnd():
     internal.extendedMode.revert(eventconsts.INCONTROL_PADS)
     return
 
+def getRedrawKey():
+    """Returns a value describing everything that redraw() depends on (see 
+    processorhelpers.RedrawCache)
+    """
+    return (internal.extendedMode.query(eventconsts.INCONTROL_PADS), min(internal.window.getAnimationTick(), 4))
+
 def redraw(lights):
     if internal.extendedMode.query(eventconsts.INCONTROL_PADS):
         if internal.window.getAnimationTick() >= 0:
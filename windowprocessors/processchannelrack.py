@@ -19,6 +19,9 @@ import internal
 import eventconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_PAD, eventconsts.TYPE_FADER, eventconsts.TYPE_KNOB, eventconsts.TYPE_FADER_BUTTON]
+
 MENU_MODE_COLOUR = lightingconsts.UI_CHOOSE
 BIT_MODE_COLOUR = lightingconsts.colours["RED"]
 
@@ -343,8 +346,8 @@ def setVolume(command, channel, value):
         return
 
     volume = getVolumeSend(value)
-    channels.setChannelVolume(channel, volume)
-    action = "Set " + channels.getChannelName(channel) + " volume to " + getVolumeValue(value)
+    internal.hostWrites.write(("channel volume", channel), channels.setChannelVolume, channel, volume)
+    action = "Set " + internal.names.getChannelName(channel) + " volume to " + getVolumeValue(value)
     if processorhelpers.didSnap(processorhelpers.toFloat(value), internal.consts.CHANNEL_VOLUME_SNAP_TO):
         action += " [Snapped]"
     command.handle(action)
@@ -355,8 +358,8 @@ def setPan(command, channel, value):
         return
 
     volume = getPanSend(value)
-    channels.setChannelPan(channel, volume)
-    action = "Set " + channels.getChannelName(channel) + " pan to " + getPanValue(value)
+    internal.hostWrites.write(("channel pan", channel), channels.setChannelPan, channel, volume)
+    action = "Set " + internal.names.getChannelName(channel) + " pan to " + getPanValue(value)
     if processorhelpers.didSnap(processorhelpers.toFloat(value, -1), internal.consts.CHANNEL_PAN_SNAP_TO):
         action = "[Snapped]"
     command.handle(action)
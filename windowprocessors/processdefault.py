@@ -6,6 +6,10 @@ This script can be used as a template for window scripts.
 Author: Miguel Guthridge [hdsq@outlook.com.au]
 """
 
+# Types of events this processor acts on (eg eventconsts.TYPE_PAD). Other events won't be sent to
+# the processor. You can also list event IDs in EVENT_IDS. Remove both to receive all events.
+EVENT_TYPES = []
+
 
 
 
@@ -17,6 +17,11 @@ import config
 import lightingconsts
 import processorhelpers
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_FADER, eventconsts.TYPE_KNOB, eventconsts.TYPE_FADER_BUTTON]
+# IDs of other events this processor acts on
+EVENT_IDS = [eventconsts.TRANSPORT_RECORD]
+
 
 # Process is called to handle events
 def process(command):
@@ -172,8 +177,8 @@ def processMuteSolo(track, command):
 
 def setVolume(command, track, value):
     volume = getVolumeSend(value)
-    mixer.setTrackVolume(track, volume)
-    action = "Set " + mixer.getTrackName(track) + " volume to " + getVolumeValue(value)
+    internal.hostWrites.write(("mixer volume", track), mixer.setTrackVolume, track, volume)
+    action = "Set " + internal.names.getTrackName(track) + " volume to " + getVolumeValue(value)
     if processorhelpers.didSnap(processorhelpers.toFloat(value), internal.consts.MIXER_VOLUME_SNAP_TO):
         action += " [Snapped]"
     command.handle(action)
@@ -191,8 +196,8 @@ def getVolumeValue(inVal):
 
 def setPan(command, track, value):
     volume = getPanSend(value)
-    mixer.setTrackPan(track, volume)
-    action = "Set " + mixer.getTrackName(track) + " pan to " + getPanValue(value)
+    internal.hostWrites.write(("mixer pan", track), mixer.setTrackPan, track, volume)
+    action = "Set " + internal.names.getTrackName(track) + " pan to " + getPanValue(value)
     if processorhelpers.didSnap(processorhelpers.toFloat(value, -1), internal.consts.MIXER_PAN_SNAP_TO):
         action += " [Snapped]"
     command.handle(action)
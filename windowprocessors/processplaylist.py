@@ -15,6 +15,9 @@ import transport
 import internal
 import arrangement
 
+# Types of events this processor acts on
+EVENT_TYPES = [eventconsts.TYPE_TRANSPORT]
+
 
 def activeStart():
     return
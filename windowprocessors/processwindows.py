@@ -10,6 +10,7 @@ Author: Miguel Guthridge [hdsq@outlook.com.au]
 import config
 import internal
 import internal.consts
+import processorhelpers
 
 import windowprocessors.processmixer
 import windowprocessors.processbrowser
@@ -38,17 +39,32 @@ def getWindowObject():
 
     else: return windowprocessors.processdefault
 
+def getWindowProcessors():
+    """Returns the processor for the active window
+
+    Returns:
+        list: processor modules
+    """
+    return [getWindowObject()]
+
+# The active processor is resolved by updateActive() when the window changes
+routes = processorhelpers.ProcessorRoutes(getWindowProcessors)
+
+def updateActive():
+    """Find the processor for the active window. Called when the active window changes.
+    """
+    routes.build()
+
 def process(command):
 
-    current_window = getWindowObject()
-    current_window.process(command)
+    routes.process(command)
 
     return
 
 def redraw(lights):
 
     current_window = getWindowObject()
-    current_window.redraw(lights)
+    processorhelpers.redrawCache.redraw(current_window, lights)
 
     return
 